@@ -1,8 +1,16 @@
 import pytest
+from survivors.infection_index import infection_index
 from survivors.models import Survivor
 from resources.models import InventoryItem
 
 
+@pytest.fixture(autouse=True)
+def reset_infection_index():
+    # Survivor ids are reused once a test's transaction is rolled back,
+    # so the worker-local bitmap must not leak between tests.
+    infection_index.bitmap.clear()
+
+
 @pytest.fixture
 def create_survivor(db):
     def _create_survivor(**kwargs):
@@ -0,0 +1,87 @@
+"""
+Routes read-only work to the read replica.
+
+Reads go to `settings.REPLICA_DATABASE` only inside a `replica_reads`
+block (or view) and only outside transactions, so locking queries and
+everything inside `atomic` stay on the primary. Only aggregate and
+listing views use the replica; reads that must see a survivor's own
+writes, such as profiles, stay on the primary.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import QuerySet
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_database() -> str:
+    """
+    The alias reads may use right now: the replica inside a
+    `replica_reads` block outside of any transaction, else the primary.
+    """
+    replica = settings.REPLICA_DATABASE
+    if (
+        replica
+        and _replica_reads.get()
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return replica
+    return DEFAULT_DB_ALIAS
+
+
+def read_only(queryset: QuerySet) -> QuerySet:
+    """
+    Marks a QuerySet as safe to serve from the replica.
+    """
+    return queryset.using(replica_database())
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_view(view):
+    """
+    Runs a read-only view against the replica.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def _wrapped_view(request, *args, **kwargs):
+            with replica_reads():
+                return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def _wrapped_view(request, *args, **kwargs):
+            with replica_reads():
+                return view(request, *args, **kwargs)
+    return _wrapped_view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # DatabaseCache entries (infection flags, versions) must
+        # always be read where they were just written.
+        if model._meta.app_label == 'django_cache':
+            return DEFAULT_DB_ALIAS
+        database = replica_database()
+        return database if database != DEFAULT_DB_ALIAS else None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica and the batch pool point at the primary's schema.
+        return db == DEFAULT_DB_ALIAS
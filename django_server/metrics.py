@@ -0,0 +1,264 @@
+"""
+Per-request SQL and latency metrics, exported in the Prometheus text format.
+
+`RequestMetricsMiddleware` times every request and tags it with the name
+of the URL pattern it matched. Queries are timed by an execute wrapper
+installed on every database connection; it adds to the statistics of the
+request found in a context variable, which asgiref copies into the
+threads that run sync code for async views. Queries that lock rows
+(`SELECT ... FOR UPDATE`) also count as lock-wait time.
+
+Histograms are kept per worker process, so every worker has to be scraped
+or the series summed in Prometheus.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, HttpResponse
+
+METRICS_PREFIX = 'zssn'
+UNMATCHED_VIEW = 'unmatched'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+    lock_wait_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+
+class Histogram:
+    """
+    Prometheus histogram with fixed upper bounds, one series per label
+    value. Counts are stored per bucket and made cumulative on export.
+    """
+    def __init__(self, name: str, help_text: str, buckets: tuple, label: str = 'view') -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label = label
+        self._lock = threading.Lock()
+        self._series: dict[str, list] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+        for label_value, (counts, total) in sorted(series.items()):
+            label = f'{self.label}="{_escape(label_value)}"'
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {total}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return lines
+
+
+class Counter:
+    """
+    Prometheus counter with one series per combination of label values.
+    """
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = ','.join(
+                f'{label}="{_escape(str(label_value))}"'
+                for label, label_value in zip(self.labels, label_values)
+            )
+            lines.append(f'{self.name}{{{labels}}} {value}')
+        return lines
+
+
+REQUESTS = Counter(
+    f'{METRICS_PREFIX}_requests_total', 'Requests by URL name and status code.', ('view', 'status'))
+REQUEST_LATENCY = Histogram(
+    f'{METRICS_PREFIX}_request_duration_seconds', 'Time to produce the response.', LATENCY_BUCKETS)
+REQUEST_SQL_TIME = Histogram(
+    f'{METRICS_PREFIX}_request_sql_seconds', 'Time spent running SQL per request.', LATENCY_BUCKETS)
+REQUEST_LOCK_WAIT = Histogram(
+    f'{METRICS_PREFIX}_request_lock_wait_seconds',
+    'Time spent in row-locking queries per request.',
+    LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    f'{METRICS_PREFIX}_request_queries', 'SQL queries per request.', QUERY_COUNT_BUCKETS)
+REQUEST_METRICS = (REQUESTS, REQUEST_LATENCY, REQUEST_SQL_TIME, REQUEST_LOCK_WAIT, REQUEST_QUERIES)
+# Metrics defined elsewhere, e.g. the trade stage timers, add themselves
+# here to be served by /metrics.
+REGISTRY: list = list(REQUEST_METRICS)
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper adding the query to the current request's statistics.
+    """
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.sql_seconds += elapsed
+        if 'FOR UPDATE' in sql:
+            stats.lock_wait_seconds += elapsed
+
+
+def install_query_recorder(connection, **kwargs) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(install_query_recorder)
+# Connections already open in this thread missed the signal.
+for _connection in connections.all(initialized_only=True):
+    install_query_recorder(_connection)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL count, SQL time and lock-wait time per request,
+    tagged with the URL name. Works for sync and async views.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if self.is_async:
+            return self.__acall__(request)
+        install_query_recorder(connection)
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        self._record(request, response, stats, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _record(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: RequestStats,
+        elapsed: float,
+    ) -> None:
+        match = getattr(request, 'resolver_match', None)
+        view = (match and match.url_name) or UNMATCHED_VIEW
+        REQUESTS.inc(view, str(response.status_code))
+        REQUEST_LATENCY.observe(view, elapsed)
+        REQUEST_SQL_TIME.observe(view, stats.sql_seconds)
+        REQUEST_LOCK_WAIT.observe(view, stats.lock_wait_seconds)
+        REQUEST_QUERIES.observe(view, stats.queries)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    lines.extend(_render_contention())
+    return '\n'.join(lines) + '\n'
+
+
+def _render_contention() -> list[str]:
+    # Imported lazily: the trade engine imports models, this module is
+    # loaded with the middleware.
+    from resources.interface.service.contention import contention_metrics
+
+    snapshot = contention_metrics.snapshot()
+    prefix = f'{METRICS_PREFIX}_trade'
+    lines = [
+        f'# HELP {prefix}_transactions_total Trade transactions started, retries included.',
+        f'# TYPE {prefix}_transactions_total counter',
+        f'{prefix}_transactions_total {snapshot["transactions"]}',
+        f'# HELP {prefix}_retries_total Trade transactions retried after a conflict.',
+        f'# TYPE {prefix}_retries_total counter',
+        *(f'{prefix}_retries_total{{kind="{kind}"}} {count}'
+          for kind, count in sorted(snapshot['retries'].items())),
+        f'# HELP {prefix}_exhausted_total Trades given up after repeated conflicts.',
+        f'# TYPE {prefix}_exhausted_total counter',
+        *(f'{prefix}_exhausted_total{{kind="{kind}"}} {count}'
+          for kind, count in sorted(snapshot['exhausted'].items())),
+        f'# HELP {prefix}_lock_wait_seconds_total Time spent acquiring inventory row locks.',
+        f'# TYPE {prefix}_lock_wait_seconds_total counter',
+        f'{prefix}_lock_wait_seconds_total {snapshot["lock_wait_seconds"]}',
+        f'# HELP {prefix}_lock_waits_total Inventory row lock acquisitions.',
+        f'# TYPE {prefix}_lock_waits_total counter',
+        f'{prefix}_lock_waits_total {snapshot["lock_waits"]}',
+    ]
+    return lines
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -10,22 +10,36 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Deployment profile, selected with the DJANGO_ENV environment variable.
+# 'development' keeps the quick-start settings below, 'production' turns off
+# DEBUG (which otherwise keeps every SQL query in memory) and expects the
+# secret key and allowed hosts from the environment.
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+ENVIRONMENT = os.environ.get('DJANGO_ENV', 'development')
+PRODUCTION = ENVIRONMENT == 'production'
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-)10!ipqg(n@cf7ib@$m3vuyu*_n538*zf^=g9$u!ir%ko$kh0-'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured('DJANGO_SECRET_KEY must be set when DJANGO_ENV=production.')
+    SECRET_KEY = 'django-insecure-)10!ipqg(n@cf7ib@$m3vuyu*_n538*zf^=g9$u!ir%ko$kh0-'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', '0' if PRODUCTION else '1') == '1'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [
+    host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host
+]
 
 
 # Application definition
@@ -44,6 +58,7 @@ INSTALLED_APPS += THIRD_PARTY_APPS
 
 # Contains custom projects app
 ZSSN_APPS = [
+    'reports',
     'resources',
     'survivors',
 ]
@@ -51,6 +66,8 @@ ZSSN_APPS = [
 INSTALLED_APPS += ZSSN_APPS
 
 MIDDLEWARE = [
+    # First, so that its latency covers the whole middleware stack.
+    'django_server.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -83,13 +100,80 @@ WSGI_APPLICATION = 'django_server.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+#
+# DJANGO_DB_ENGINE selects the backend: 'sqlite' (default, for local runs)
+# or 'postgres'. Postgres uses psycopg's native connection pool with one
+# pool for web requests ('default') and a separate one for bulk ingest and
+# other batch work ('batch'). On SQLite both paths share 'default'.
+
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgres':
+    _postgres = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('POSTGRES_DB', 'zssn_db'),
+        'USER': os.environ.get('POSTGRES_USER', 'zssn'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'zssn'),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Pooled connections are returned to the pool after each request,
+        # so persistent connections must stay off.
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': True,
+    }
+    DATABASES = {
+        'default': {
+            **_postgres,
+            'OPTIONS': {'pool': {
+                'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+                'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            }},
+        },
+        'batch': {
+            **_postgres,
+            'OPTIONS': {'pool': {
+                'min_size': 0,
+                'max_size': int(os.environ.get('DB_BATCH_POOL_MAX_SIZE', 4)),
+                'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            }},
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+    BATCH_DATABASE = 'batch'
+    # Read replica for read-only views, see django_server.db_router.
+    if replica_host := os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': replica_host,
+            'PORT': os.environ.get('DB_REPLICA_PORT', _postgres['PORT']),
+            'TEST': {'MIRROR': 'default'},
+        }
+    REPLICA_DATABASE = 'replica' if replica_host else None
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DJANGO_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            # Production runs under ASGI workers, where Django advises against
+            # persistent connections, so they are opt-in. Reused connections
+            # are checked first.
+            'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 0)),
+            'CONN_HEALTH_CHECKS': PRODUCTION,
+            'OPTIONS': {
+                # WAL lets readers run alongside the single writer, and
+                # IMMEDIATE transactions take the write lock up front, which
+                # is what select_for_update would do on Postgres.
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
     }
-}
+    BATCH_DATABASE = 'default'
+    REPLICA_DATABASE = None
+
+DATABASE_ROUTERS = ['django_server.db_router.ReplicaRouter']
 
 
 # Password validation
@@ -134,15 +218,41 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-# Caching configuration. Should be replaced with a more robust solution in
-# production such as Redis or Memcached.
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'zombie_cache_table',
+# Caching configuration. Set REDIS_URL in production so that infection
+# flags, profile versions and other shared state are served from Redis;
+# without it every cache lookup is a query on the cache table.
+if REDIS_URL := os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'zombie_cache_table',
+        }
+    }
+
 
+# Opt-in profiling of TradeService, see
+# resources.interface.service.trade_profiler. TRADE_PROFILE_STAGES times
+# every trade stage and counts its queries (served by /metrics). A
+# TRADE_PROFILE_SAMPLE_RATE share of trades also runs under cProfile; the
+# ones slower than TRADE_PROFILE_SLOW_MS are written to TRADE_PROFILE_DIR,
+# which keeps the newest TRADE_PROFILE_MAX_FILES captures.
+TRADE_PROFILE_STAGES = os.environ.get('TRADE_PROFILE_STAGES', '0') == '1'
+TRADE_PROFILE_SAMPLE_RATE = float(os.environ.get('TRADE_PROFILE_SAMPLE_RATE', 0))
+TRADE_PROFILE_SLOW_MS = float(os.environ.get('TRADE_PROFILE_SLOW_MS', 100))
+TRADE_PROFILE_DIR = Path(os.environ.get('TRADE_PROFILE_DIR', BASE_DIR / 'trade_profiles'))
+TRADE_PROFILE_MAX_FILES = int(os.environ.get('TRADE_PROFILE_MAX_FILES', 50))
+
+# JSON library used by the views, see django_server.serialization: 'auto'
+# picks orjson or msgspec when installed and falls back to the standard
+# library.
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # React dev server
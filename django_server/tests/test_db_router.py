@@ -0,0 +1,52 @@
+from django.db.transaction import atomic
+import pytest
+from django_server.db_router import (
+    ReplicaRouter,
+    replica_reads,
+    replica_view,
+)
+from resources.models import InventoryItem
+from survivors.interface.crud.read_survivors import survivor_profile_rows
+from survivors.models import Survivor
+
+
+# Transactional, since the router keeps everything inside `atomic` on the
+# primary and regular tests run inside a transaction.
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouter:
+
+    router = ReplicaRouter()
+
+    @pytest.fixture(autouse=True)
+    def replica(self, settings):
+        settings.REPLICA_DATABASE = 'replica'
+
+    def test_reads_stay_on_primary_outside_replica_block(self):
+        assert self.router.db_for_read(Survivor) is None
+
+    def test_replica_block_routes_reads_to_replica(self):
+        with replica_reads():
+            assert self.router.db_for_read(Survivor) == 'replica'
+
+    def test_transactions_stay_on_primary(self):
+        with replica_reads(), atomic():
+            assert self.router.db_for_read(InventoryItem) is None
+
+    def test_writes_and_migrations_use_primary(self):
+        assert self.router.db_for_write(Survivor) is None
+        assert self.router.allow_migrate('default', 'survivors')
+        assert not self.router.allow_migrate('replica', 'survivors')
+
+    def test_replica_view_reads_from_replica(self, rf):
+        seen = []
+
+        @replica_view
+        def view(request):
+            seen.append(self.router.db_for_read(Survivor))
+
+        view(rf.get('/'))
+        assert seen == ['replica']
+
+    def test_cached_profiles_are_built_on_primary(self):
+        with replica_reads():
+            assert survivor_profile_rows(1).db == 'default'
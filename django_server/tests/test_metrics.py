@@ -0,0 +1,61 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+from django_server.metrics import REQUEST_METRICS, Histogram
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    for metric in REQUEST_METRICS:
+        metric.reset()
+
+
+def sample(body: str, line_start: str) -> float:
+    for line in body.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not in metrics")
+
+
+class TestHistogram:
+
+    def test_render_is_cumulative(self):
+        histogram = Histogram("latency", "Latency.", (0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe("trade", value)
+        lines = histogram.render()
+        assert 'latency_bucket{view="trade",le="0.1"} 1' in lines
+        assert 'latency_bucket{view="trade",le="1.0"} 3' in lines
+        assert 'latency_bucket{view="trade",le="+Inf"} 4' in lines
+        assert 'latency_count{view="trade"} 4' in lines
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+
+    def test_sync_view_queries_are_counted(self, client, create_survivor):
+        create_survivor(name="Near", latitude=1.0, longitude=1.0)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse("nearby-survivors"), {"lat": 1, "lon": 1, "radius": 5})
+        # The next request clears the captured query log.
+        query_count = len(queries)
+
+        body = client.get(reverse("metrics")).content.decode()
+        assert sample(body, 'zssn_requests_total{view="nearby-survivors",status="200"}') == 1
+        assert sample(body, 'zssn_request_queries_sum{view="nearby-survivors"}') == query_count
+        assert sample(body, 'zssn_request_duration_seconds_count{view="nearby-survivors"}') == 1
+        assert "zssn_trade_transactions_total" in body
+
+    def test_async_view_queries_are_counted(self, client, create_survivor):
+        survivor = create_survivor(name="Alice")
+        client.get(reverse("profile", args=[survivor.id]))
+
+        body = client.get(reverse("metrics")).content.decode()
+        assert sample(body, 'zssn_request_queries_sum{view="profile"}') > 0
+        assert sample(body, 'zssn_request_sql_seconds_sum{view="profile"}') > 0
+
+    def test_unmatched_urls_share_a_label(self, client):
+        client.get("/no/such/page/")
+        body = client.get(reverse("metrics")).content.decode()
+        assert sample(body, 'zssn_requests_total{view="unmatched",status="404"}') == 1
@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+from typing import Any
+from django import forms
+from django.urls import reverse
+import pytest
+from django_server import serialization
+from django_server.serialization import (
+    BACKENDS,
+    OrjsonBackend,
+    SchemaError,
+    StdlibBackend,
+    convert,
+    decode,
+)
+from survivors.schemas import InfectionReportRequest, RegisterSurvivorRequest
+
+
+@dataclass(slots=True)
+class Entry:
+    name: str
+    value: float
+    tags: list[str] | None = None
+    extra: Any = None
+
+
+class NameForm(forms.Form):
+    name = forms.CharField()
+
+
+@pytest.fixture(params=list(BACKENDS))
+def backend(request):
+    try:
+        return BACKENDS[request.param]()
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+
+
+class TestBackends:
+
+    def test_round_trip_matches_stdlib(self, backend):
+        payload = {"id": 1, "name": "Ålice", "latitude": 52.52, "inventory": [{"q": 2}], "none": None}
+        assert backend.loads(backend.dumps(payload)) == payload
+        assert backend.loads(StdlibBackend().dumps(payload)) == payload
+
+    def test_form_errors_keep_their_messages(self, backend):
+        form = NameForm({})
+        assert not form.is_valid()
+        errors = backend.loads(backend.dumps({"errors": form.errors}))["errors"]
+        assert errors["name"] == ["This field is required."]
+
+    def test_invalid_json_is_a_value_error(self, backend):
+        with pytest.raises(ValueError):
+            backend.loads(b"{nope")
+
+
+class TestDecode:
+
+    def test_decodes_typed_struct(self):
+        entry = decode(b'{"name": "a", "value": 1, "tags": ["x"]}', Entry)
+        assert entry == Entry(name="a", value=1.0, tags=["x"])
+        assert isinstance(entry.value, float)
+        assert convert({"name": "a", "value": 2.5, "extra": {"k": 1}}, Entry).extra == {"k": 1}
+
+    @pytest.mark.parametrize("body, message", [
+        (b'[1]', "body must be an object"),
+        (b'{"value": 1}', "Missing field: 'name'"),
+        (b'{"name": 1, "value": 1}', "'name' must be a string"),
+        (b'{"name": "a", "value": true}', "'value' must be a number"),
+        (b'{"name": "a", "value": "nan"}', "'value' must be a number"),
+        (b'{"name": "a", "value": 1, "tags": ["x", 2]}', "'tags[1]' must be a string"),
+    ])
+    def test_reports_where_the_body_is_invalid(self, body, message):
+        with pytest.raises(SchemaError) as error:
+            decode(body, Entry)
+        assert str(error.value) == message
+
+    def test_numeric_strings_are_coerced(self):
+        entry = convert({"name": "a", "value": "2.5"}, Entry)
+        assert entry.value == 2.5
+        report = convert({"reporter_id": "3", "infected_id": 4}, InfectionReportRequest)
+        assert (report.reporter_id, report.infected_id) == (3, 4)
+        with pytest.raises(SchemaError, match="'reporter_id' must be an integer"):
+            convert({"reporter_id": "3.5", "infected_id": 4}, InfectionReportRequest)
+
+    def test_reports_nested_paths(self):
+        body = {"name": "a", "age": 1, "gender": "F", "latitude": 0, "longitude": 0,
+                "inventory": [{"item": "Water", "quantity": 1}, {"item": "Food"}]}
+        with pytest.raises(SchemaError, match=r"Missing field: 'inventory\[1\]\.quantity'"):
+            convert(body, RegisterSurvivorRequest)
+
+    def test_orjson_is_preferred_when_installed(self):
+        pytest.importorskip("orjson")
+        assert isinstance(serialization.backend, OrjsonBackend)
+
+
+@pytest.mark.django_db
+class TestViews:
+
+    def test_schema_errors_are_bad_requests(self, client):
+        payload = {"name": "Bob", "age": "old", "gender": "M", "latitude": 0, "longitude": 0}
+        response = client.post(reverse("register-survivor"), data=payload,
+                               content_type="application/json")
+        assert response.status_code == 400
+        assert response.json() == {"error": "'age' must be an integer"}
+
+    def test_errors_after_decoding_are_not_reported_as_invalid_json(
+            self, client, create_survivor, monkeypatch):
+        async def failing_move(*args):
+            raise ValueError("boom")
+
+        monkeypatch.setattr("survivors.views.amove_survivor", failing_move)
+        response = client.patch(reverse("update-location", args=[create_survivor().pk]),
+                                data={"latitude": 1, "longitude": 2},
+                                content_type="application/json")
+        assert response.status_code == 500
+        assert response.json() == {"error": "boom"}
+
+    def test_invalid_json_is_a_bad_request(self, client, create_survivor):
+        survivor = create_survivor()
+        response = client.patch(reverse("update-location", args=[survivor.pk]), data=b"{",
+                                content_type="application/json")
+        assert response.status_code == 400
+        assert response.json()["error"].startswith("Invalid JSON")
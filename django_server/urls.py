@@ -17,8 +17,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from django_server.metrics import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics', metrics, name='metrics'),
+    path('reports/', include('reports.urls')),
     path('resources/', include("resources.urls")),
     path('survivors/', include('survivors.urls')),
 ]
@@ -1,10 +1,27 @@
 #!/bin/sh
+set -e
 
-echo "Running migrations..."
-python manage.py migrate --noinput
-
-echo "Creating cache table if needed..."
-python manage.py createcachetable --database=default
-
-echo "Starting server..."
-exec python manage.py runserver 0.0.0.0:8000
+# Usage: entrypoint.sh [serve|migrate|<command>]
+#   serve    Start the web server (default). DJANGO_ENV=production starts
+#            gunicorn with uvicorn workers, anything else runserver.
+#   migrate  Apply migrations and create the cache table, then exit. Run it
+#            once per deploy instead of on every container start.
+case "${1:-serve}" in
+    migrate)
+        echo "Running migrations..."
+        python manage.py migrate --noinput
+        echo "Creating cache table if needed..."
+        exec python manage.py createcachetable --database=default
+        ;;
+    serve)
+        if [ "$DJANGO_ENV" = "production" ]; then
+            echo "Starting gunicorn..."
+            exec gunicorn -c gunicorn.conf.py django_server.asgi:application
+        fi
+        echo "Starting development server..."
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    *)
+        exec "$@"
+        ;;
+esac
@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for the production profile, see entrypoint.sh.
+
+Workers run the ASGI application with uvicorn so the async views can
+serve many slow clients per process.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+# Recycle workers now and then to bound memory growth.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+# Import Django once in the master so forked workers share its memory.
+preload_app = True
+accesslog = '-'
+
+
+def when_ready(server):
+    # Load the item catalog before forking so every worker starts with it.
+    from django.db import connections
+    from resources.interface.service.item_catalog import item_catalog
+
+    item_catalog.load()
+    # Connections must not be shared across forked workers.
+    connections.close_all()
+
+
+def worker_exit(server, worker):
+    # Write the location pings still buffered by this worker.
+    from survivors.interface.service.location_service import location_coalescer
+
+    location_coalescer.flush()
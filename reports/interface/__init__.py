@@ -0,0 +1,15 @@
+from .crud.update_statistics import (
+    record_infections,
+    record_registrations,
+    record_removals,
+    recompute_statistics,
+)
+from .service.statistics_service import statistics_report
+
+__all__ = [
+    'record_infections',
+    'record_registrations',
+    'record_removals',
+    'recompute_statistics',
+    'statistics_report',
+]
@@ -0,0 +1,30 @@
+from collections.abc import Iterator
+
+from django_server.db_router import read_only
+from resources.models import InventoryItem, Item
+from survivors.models import Survivor
+
+SURVIVOR_FIELDS = ('id', 'age', 'gender', 'latitude', 'longitude', 'is_infected')
+INVENTORY_FIELDS = ('survivor_id', 'item_id', 'quantity')
+ITEM_FIELDS = ('id', 'point_value', 'name')
+
+
+def survivor_rows(chunk_size: int) -> Iterator[tuple]:
+    """
+    Streams (id, age, gender, latitude, longitude, is_infected) tuples
+    in no particular order.
+    """
+    return read_only(Survivor.objects.order_by().values_list(*SURVIVOR_FIELDS)).iterator(
+        chunk_size=chunk_size)
+
+
+def inventory_rows(chunk_size: int) -> Iterator[tuple]:
+    """
+    Streams (survivor_id, item_id, quantity) tuples in no particular order.
+    """
+    return read_only(InventoryItem.objects.order_by().values_list(*INVENTORY_FIELDS)).iterator(
+        chunk_size=chunk_size)
+
+
+def item_rows() -> list[tuple]:
+    return list(read_only(Item.objects.order_by('pk').values_list(*ITEM_FIELDS)))
@@ -0,0 +1,21 @@
+from django_server.db_router import read_only
+from reports.models import SURVIVOR_STATISTICS_ID, ItemStatistics, SurvivorStatistics
+
+
+def survivor_counts() -> tuple[int, int]:
+    """
+    Returns (survivors, infected) from the running counters.
+    """
+    counts = read_only(SurvivorStatistics.objects.filter(
+        pk=SURVIVOR_STATISTICS_ID,
+    ).values_list('survivors', 'infected')).first()
+    return counts or (0, 0)
+
+
+def item_totals() -> list[tuple[int, int, int]]:
+    """
+    Returns (item_id, healthy_quantity, infected_quantity) per item.
+    """
+    return list(read_only(ItemStatistics.objects.values_list(
+        'item_id', 'healthy_quantity', 'infected_quantity',
+    )))
@@ -0,0 +1,180 @@
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.transaction import atomic
+
+from reports.models import SURVIVOR_STATISTICS_ID, ItemStatistics, SurvivorStatistics
+from resources.models import InventoryItem, Item
+from survivors.models import Survivor
+
+# The counters are updated inside the caller's transaction, so they commit
+# or roll back together with the change they describe. Trades only move
+# items between healthy survivors and leave every total unchanged, which
+# keeps the hot trade path away from these rows.
+
+
+def record_registrations(
+    survivors: int,
+    quantities: dict[int, int],
+    using: str = 'default',
+) -> None:
+    """
+    Counts newly registered (healthy) survivors and the {item_id: quantity}
+    they brought with them.
+    """
+    _add_survivors(using, survivors=survivors)
+    _add_quantities(using, quantities, {})
+
+
+def record_infections(survivor_ids, using: str = 'default') -> None:
+    """
+    Counts survivors that just became infected and moves their inventory
+    from the healthy to the infected totals. Call it once per survivor,
+    when the survivor is flagged.
+    """
+    survivor_ids = list(survivor_ids)
+    if not survivor_ids:
+        return
+    quantities = dict(
+        InventoryItem.objects.using(using).filter(
+            survivor_id__in=survivor_ids,
+        ).order_by().values('item_id').annotate(total=Sum('quantity')).values_list(
+            'item_id', 'total',
+        )
+    )
+    _add_survivors(using, infected=len(survivor_ids))
+    _add_quantities(
+        using,
+        {item_id: -quantity for item_id, quantity in quantities.items()},
+        quantities,
+    )
+
+
+def record_removals(survivor_ids, using: str = 'default') -> None:
+    """
+    Takes survivors that are about to be deleted, and their inventory, out
+    of the totals. Call it in the deleting transaction, before the delete.
+    """
+    survivor_ids = list(survivor_ids)
+    if not survivor_ids:
+        return
+    counts = Survivor.objects.using(using).filter(pk__in=survivor_ids).aggregate(
+        survivors=Count('pk'),
+        infected=Count('pk', filter=Q(is_infected=True)),
+    )
+    healthy, infected = {}, {}
+    for item_id, is_infected, total in InventoryItem.objects.using(using).filter(
+        survivor_id__in=survivor_ids,
+    ).order_by().values('item_id', 'survivor__is_infected').annotate(total=Sum('quantity')).values_list(
+        'item_id', 'survivor__is_infected', 'total',
+    ):
+        (infected if is_infected else healthy)[item_id] = -total
+    _add_survivors(using, survivors=-counts['survivors'], infected=-counts['infected'])
+    _add_quantities(using, healthy, infected)
+
+
+def recompute_statistics(using: str = 'default', dry_run: bool = False) -> dict[str, int]:
+    """
+    Recomputes every counter from the survivor and inventory tables and
+    returns the drift, {counter: recomputed - stored}, of the counters
+    that were off. The counters are only written when not `dry_run`.
+    """
+    with atomic(using=using):
+        # Locking the survivor counters holds back registrations and
+        # infections until the recount is written.
+        SurvivorStatistics.objects.using(using).get_or_create(pk=SURVIVOR_STATISTICS_ID)
+        stored = SurvivorStatistics.objects.using(using).select_for_update().get(
+            pk=SURVIVOR_STATISTICS_ID,
+        )
+        counts = Survivor.objects.using(using).aggregate(
+            survivors=Count('pk'),
+            infected=Count('pk', filter=Q(is_infected=True)),
+        )
+        totals = {
+            item_id: (healthy or 0, infected or 0)
+            for item_id, healthy, infected in InventoryItem.objects.using(using).order_by().values(
+                'item_id',
+            ).annotate(
+                healthy=Sum('quantity', filter=Q(survivor__is_infected=False)),
+                infected=Sum('quantity', filter=Q(survivor__is_infected=True)),
+            ).values_list('item_id', 'healthy', 'infected')
+        }
+        stored_totals = {
+            item_id: (healthy, infected)
+            for item_id, healthy, infected in ItemStatistics.objects.using(using).values_list(
+                'item_id', 'healthy_quantity', 'infected_quantity',
+            )
+        }
+
+        drift = {}
+        for name in ('survivors', 'infected'):
+            if counts[name] != getattr(stored, name):
+                drift[name] = counts[name] - getattr(stored, name)
+        item_ids = Item.objects.using(using).values_list('pk', flat=True)
+        for item_id in item_ids:
+            healthy, infected = totals.get(item_id, (0, 0))
+            stored_healthy, stored_infected = stored_totals.get(item_id, (0, 0))
+            if healthy != stored_healthy:
+                drift[f'healthy_quantity_{item_id}'] = healthy - stored_healthy
+            if infected != stored_infected:
+                drift[f'infected_quantity_{item_id}'] = infected - stored_infected
+
+        if not dry_run:
+            SurvivorStatistics.objects.using(using).filter(pk=SURVIVOR_STATISTICS_ID).update(**counts)
+            ItemStatistics.objects.using(using).bulk_create(
+                [
+                    ItemStatistics(
+                        item_id=item_id,
+                        healthy_quantity=totals.get(item_id, (0, 0))[0],
+                        infected_quantity=totals.get(item_id, (0, 0))[1],
+                    )
+                    for item_id in item_ids
+                ],
+                update_conflicts=True,
+                unique_fields=['item'],
+                update_fields=['healthy_quantity', 'infected_quantity'],
+            )
+    return drift
+
+
+def _add_survivors(using: str, survivors: int = 0, infected: int = 0) -> None:
+    queryset = SurvivorStatistics.objects.using(using).filter(pk=SURVIVOR_STATISTICS_ID)
+    changes = {
+        'survivors': F('survivors') + survivors,
+        'infected': F('infected') + infected,
+    }
+    if not queryset.update(**changes):
+        # The row is created by the initial migration; this only happens
+        # after the table was emptied, e.g. by a test flush.
+        SurvivorStatistics.objects.using(using).bulk_create(
+            [SurvivorStatistics(pk=SURVIVOR_STATISTICS_ID)], ignore_conflicts=True)
+        queryset.update(**changes)
+
+
+def _add_quantities(using: str, healthy: dict[int, int], infected: dict[int, int]) -> None:
+    """
+    Adds signed deltas to the item totals with one UPDATE.
+    """
+    item_ids = sorted({*healthy, *infected})
+    if not item_ids:
+        return
+    queryset = ItemStatistics.objects.using(using).filter(item_id__in=item_ids)
+    changes = {
+        'healthy_quantity': F('healthy_quantity') + Case(
+            *(When(item_id=item_id, then=Value(delta)) for item_id, delta in healthy.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        'infected_quantity': F('infected_quantity') + Case(
+            *(When(item_id=item_id, then=Value(delta)) for item_id, delta in infected.items()),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+    }
+    if queryset.update(**changes) < len(item_ids):
+        # Items added after the initial migration get their row lazily.
+        # Rows that already existed have been updated above, so only the
+        # new ones are updated again.
+        existing = set(queryset.values_list('item_id', flat=True))
+        missing = [item_id for item_id in item_ids if item_id not in existing]
+        ItemStatistics.objects.using(using).bulk_create(
+            [ItemStatistics(item_id=item_id) for item_id in missing], ignore_conflicts=True)
+        ItemStatistics.objects.using(using).filter(item_id__in=missing).update(**changes)
@@ -0,0 +1,325 @@
+import multiprocessing
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import django
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.db.transaction import atomic
+
+from reports.interface.crud.update_statistics import record_removals
+from resources.exceptions import TradeConflictError, TradeError
+from resources.interface import TradeService
+from resources.interface.service.contention import contention_metrics
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import InventoryItem
+from survivors.interface import create_survivors, move_survivor, record_infection_report
+from survivors.interface.service.profile_service import aprofile
+from survivors.models import Survivor
+
+BENCHMARK_NAME_PREFIX = 'benchmark-'
+BENCHMARK_SURVIVORS = 200
+BENCHMARK_OPERATIONS = 2000
+BENCHMARK_CONCURRENCY = 8
+BENCHMARK_STARTING_QUANTITY = 1000
+# Relative weight of each operation in the mixed workload.
+BENCHMARK_MIX = {'trade': 4, 'location': 4, 'profile': 4, 'report': 1}
+OPERATIONS = tuple(BENCHMARK_MIX)
+# Expected failures of an operation, e.g. trades of survivors that were
+# reported as infected during the run, are counted but not raised.
+EXPECTED_ERRORS = (TradeError, TradeConflictError, Survivor.DoesNotExist)
+
+
+class BenchmarkService:
+    """
+    Seeds benchmark survivors and drives a mixed workload of trades,
+    location updates, profile reads and infection reports through the
+    service layer from a pool of threads or processes, each with its own
+    database connection. The seeded survivors and their share of the
+    running statistics are removed afterwards; nothing else is touched.
+    Attributes:
+        survivors (int): Number of survivors seeded for the run.
+        operations (int): Number of operations in the workload.
+        concurrency (int): Number of workers; 1 runs in the calling thread.
+        processes (bool): Run the workers in processes instead of threads,
+            so they do not share one interpreter lock.
+        mix (dict): Relative weight of each operation.
+        hot_survivors (int | None): Only this many survivors trade, which
+            raises lock contention.
+        seed (int): Seed of the random workload, for reproducible runs.
+    Methods:
+        run():
+            Seeds, runs the workload, cleans up and returns the results.
+    """
+    def __init__(
+        self,
+        survivors: int = BENCHMARK_SURVIVORS,
+        operations: int = BENCHMARK_OPERATIONS,
+        concurrency: int = BENCHMARK_CONCURRENCY,
+        mix: dict[str, int] | None = None,
+        hot_survivors: int | None = None,
+        seed: int = 0,
+        processes: bool = False,
+    ) -> None:
+        self.survivors = survivors
+        self.operations = operations
+        self.concurrency = concurrency
+        self.processes = processes
+        self.mix = mix or BENCHMARK_MIX
+        self.hot_survivors = hot_survivors
+        self.seed = seed
+        self.survivor_ids: list[int] = []
+        self.samples: dict[str, list[tuple[float, int]]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.contention = {'lock_waits': 0, 'lock_wait_seconds': 0.0, 'retries': defaultdict(int)}
+        self._lock = threading.Lock()
+
+    def run(self) -> dict:
+        self._seed()
+        try:
+            workload = self._workload()
+            shares = [workload[index::self.concurrency] for index in range(self.concurrency)]
+            contention_before = contention_metrics.snapshot()
+            started = time.perf_counter()
+            if self.concurrency > 1 and self.processes:
+                # Spawned rather than forked, so no worker inherits the
+                # parent's connections or connection pool.
+                with ProcessPoolExecutor(
+                    self.concurrency,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=django.setup,
+                ) as executor:
+                    for result in executor.map(_measure_in_process, shares):
+                        self._merge(*result)
+            else:
+                if self.concurrency == 1:
+                    self._merge(*self._measure(workload))
+                else:
+                    threads = [threading.Thread(target=self._work, args=(share,)) for share in shares]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+                self._merge({}, {}, _contention_change(contention_before, contention_metrics.snapshot()))
+            elapsed = time.perf_counter() - started
+        finally:
+            self._clean_up()
+        return self._results(elapsed)
+
+    def _seed(self) -> None:
+        quantities = [
+            InventoryItem(item_id=item.pk, quantity=BENCHMARK_STARTING_QUANTITY)
+            for item in item_catalog.by_name.values()
+        ]
+        rng = random.Random(self.seed)
+        survivors = [
+            Survivor(
+                name=f'{BENCHMARK_NAME_PREFIX}{index}',
+                age=rng.randint(18, 80),
+                gender=rng.choice(Survivor.GenderChoices.values),
+                latitude=rng.uniform(-60, 60),
+                longitude=rng.uniform(-180, 180),
+            )
+            for index in range(self.survivors)
+        ]
+        inventories = [
+            [InventoryItem(item_id=row.item_id, quantity=row.quantity) for row in quantities]
+            for _ in survivors
+        ]
+        created = create_survivors(survivors, inventories)
+        self.survivor_ids = [survivor.pk for survivor in created]
+
+    def _clean_up(self) -> None:
+        with atomic():
+            record_removals(self.survivor_ids)
+            Survivor.objects.filter(pk__in=self.survivor_ids).delete()
+
+    def _workload(self) -> list[tuple]:
+        rng = random.Random(self.seed)
+        names = list(self.mix)
+        operations = rng.choices(names, weights=[self.mix[name] for name in names], k=self.operations)
+        traders = self.survivor_ids[:self.hot_survivors or len(self.survivor_ids)]
+        workload = []
+        for operation in operations:
+            if operation == 'trade':
+                args = tuple(rng.sample(traders, 2))
+            elif operation == 'report':
+                args = tuple(rng.sample(self.survivor_ids, 2))
+            elif operation == 'location':
+                args = (rng.choice(self.survivor_ids), rng.uniform(-60, 60), rng.uniform(-180, 180))
+            else:
+                args = (rng.choice(self.survivor_ids),)
+            workload.append((operation, args))
+        return workload
+
+    def _work(self, workload: list[tuple]) -> None:
+        try:
+            self._merge(*self._measure(workload))
+        finally:
+            connection.close()
+
+    def _merge(self, samples: dict, errors: dict, contention: dict | None = None) -> None:
+        with self._lock:
+            for operation, operation_samples in samples.items():
+                self.samples[operation].extend(operation_samples)
+            for operation, count in errors.items():
+                self.errors[operation] += count
+            if contention is not None:
+                self.contention['lock_waits'] += contention['lock_waits']
+                self.contention['lock_wait_seconds'] += contention['lock_wait_seconds']
+                for kind, count in contention['retries'].items():
+                    self.contention['retries'][kind] += count
+
+    @classmethod
+    def _measure(cls, workload: list[tuple]) -> tuple[dict, dict]:
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        samples = defaultdict(list)
+        errors = defaultdict(int)
+        with connection.execute_wrapper(count_queries):
+            for operation, args in workload:
+                queries[0] = 0
+                started = time.perf_counter()
+                try:
+                    getattr(cls, f'_{operation}')(*args)
+                except EXPECTED_ERRORS:
+                    errors[operation] += 1
+                samples[operation].append((time.perf_counter() - started, queries[0]))
+        return dict(samples), dict(errors)
+
+    @staticmethod
+    def _trade(survivor_a_id: int, survivor_b_id: int) -> None:
+        # A gives 1 Medication (2 points) for 2 Ammunition (1 point each).
+        TradeService(
+            survivor_a_id, survivor_b_id,
+            items_a=[{'item': 'Ammunition', 'quantity': 2}],
+            items_b=[{'item': 'Medication', 'quantity': 1}],
+        ).execute()
+
+    @staticmethod
+    def _location(survivor_id: int, latitude: float, longitude: float) -> None:
+        move_survivor(survivor_id, latitude, longitude)
+
+    @staticmethod
+    def _profile(survivor_id: int) -> None:
+        async_to_sync(aprofile)(survivor_id, None)
+
+    @staticmethod
+    def _report(reporter_id: int, reported_id: int) -> None:
+        record_infection_report(reporter_id, reported_id)
+
+    def _results(self, elapsed: float) -> dict:
+        operations = {}
+        for operation in OPERATIONS:
+            samples = self.samples.get(operation)
+            if not samples:
+                continue
+            latencies = np.array([latency for latency, _ in samples]) * 1000
+            query_counts = np.array([count for _, count in samples])
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            operations[operation] = {
+                'count': len(samples),
+                'errors': self.errors.get(operation, 0),
+                'throughput_per_second': round(len(samples) / elapsed, 1),
+                'latency_ms': {
+                    'mean': round(float(latencies.mean()), 3),
+                    'p50': round(float(p50), 3),
+                    'p95': round(float(p95), 3),
+                    'p99': round(float(p99), 3),
+                    'max': round(float(latencies.max()), 3),
+                },
+                'queries': {
+                    'mean': round(float(query_counts.mean()), 2),
+                    'max': int(query_counts.max()),
+                },
+            }
+
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'database': connection.vendor,
+            'parameters': {
+                'survivors': self.survivors,
+                'operations': self.operations,
+                'concurrency': self.concurrency,
+                'mix': self.mix,
+                'hot_survivors': self.hot_survivors,
+                'seed': self.seed,
+                'processes': self.processes,
+            },
+            'elapsed_seconds': round(elapsed, 3),
+            'throughput_per_second': round(self.operations / elapsed, 1),
+            'operations': operations,
+            'contention': {
+                'lock_waits': self.contention['lock_waits'],
+                'lock_wait_seconds': round(self.contention['lock_wait_seconds'], 6),
+                'retries': dict(self.contention['retries']),
+            },
+        }
+
+
+def _measure_in_process(workload: list[tuple]) -> tuple[dict, dict, dict]:
+    # Contention counters are process-local, so each worker reports its own.
+    before = contention_metrics.snapshot()
+    try:
+        samples, errors = BenchmarkService._measure(workload)
+    finally:
+        connection.close()
+    return samples, errors, _contention_change(before, contention_metrics.snapshot())
+
+
+def _contention_change(before: dict, after: dict) -> dict:
+    return {
+        'lock_waits': after['lock_waits'] - before['lock_waits'],
+        'lock_wait_seconds': after['lock_wait_seconds'] - before['lock_wait_seconds'],
+        'retries': {
+            kind: count - before['retries'].get(kind, 0)
+            for kind, count in after['retries'].items()
+        },
+    }
+
+
+def compare_results(baseline: dict, current: dict) -> dict:
+    """
+    Relative change, in percent, of throughput and latency percentiles
+    per operation between two benchmark results.
+    """
+    changes = {}
+    for operation, result in current['operations'].items():
+        before = baseline.get('operations', {}).get(operation)
+        if not before:
+            continue
+        changes[operation] = {
+            'throughput_per_second': _change(
+                before['throughput_per_second'], result['throughput_per_second']),
+            **{
+                f'{percentile}_ms': _change(
+                    before['latency_ms'][percentile], result['latency_ms'][percentile])
+                for percentile in ('p50', 'p95', 'p99')
+            },
+        }
+    return changes
+
+
+def _change(before: float, after: float) -> float | None:
+    return round(100 * (after - before) / before, 1) if before else None
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,184 @@
+import json
+import time
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from reports.interface.crud.read_dataset import inventory_rows, item_rows, survivor_rows
+
+EXPORT_CHUNK_SIZE = 100_000
+EXPORT_HISTOGRAM_BINS = 20
+MANIFEST_NAME = 'manifest.json'
+
+# Column dtypes of the exported tables. Every column is written to its own
+# raw little-endian file, `<table>.<column>.bin`, so a single column can be
+# memory-mapped without touching the others.
+SURVIVOR_COLUMNS = (
+    ('id', '<i8'),
+    ('age', '<i4'),
+    ('gender', 'S1'),
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('is_infected', '?'),
+)
+INVENTORY_COLUMNS = (
+    ('survivor_id', '<i8'),
+    ('item_id', '<i8'),
+    ('quantity', '<i8'),
+)
+ITEM_COLUMNS = (
+    ('id', '<i8'),
+    ('point_value', '<i8'),
+)
+
+
+def export_dataset(directory, chunk_size: int = EXPORT_CHUNK_SIZE) -> dict:
+    """
+    Streams the survivor, inventory and item tables into columnar binary
+    files under `directory` and writes a manifest describing them. Rows
+    are read `chunk_size` at a time and converted to NumPy arrays per
+    chunk, so memory use does not grow with the size of the tables.
+    Returns the manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    items = item_rows()
+    manifest = {
+        'survivors': _write_table(
+            directory, 'survivors', SURVIVOR_COLUMNS, survivor_rows(chunk_size), chunk_size),
+        'inventory': _write_table(
+            directory, 'inventory', INVENTORY_COLUMNS, inventory_rows(chunk_size), chunk_size),
+        'items': _write_table(
+            directory, 'items', ITEM_COLUMNS, (row[:2] for row in items), chunk_size),
+        'item_names': {str(item_id): name for item_id, _, name in items},
+    }
+    manifest['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def load_dataset(directory) -> dict[str, dict[str, np.ndarray]]:
+    """
+    Memory-maps an export written by `export_dataset`:
+    {table: {column: array}}. Columns are read-only and only paged in
+    when used.
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    dataset = {}
+    for table in ('survivors', 'inventory', 'items'):
+        rows = manifest[table]['rows']
+        dataset[table] = {
+            column: (
+                np.memmap(directory / f'{table}.{column}.bin', dtype=dtype, mode='r', shape=(rows,))
+                if rows else np.empty(0, dtype=dtype)
+            )
+            for column, dtype in manifest[table]['columns'].items()
+        }
+    return dataset
+
+
+def dataset_analytics(
+    directory,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    bins: int = EXPORT_HISTOGRAM_BINS,
+) -> dict:
+    """
+    Computes per-item totals split by infection, a histogram of survivor
+    wealth in points and the points held by infected survivors from an
+    export. Inventory columns are processed `chunk_size` rows at a time;
+    the per-survivor arrays are indexed by survivor id.
+    """
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    dataset = load_dataset(directory)
+    survivors = dataset['survivors']
+    inventory = dataset['inventory']
+    items = dataset['items']
+
+    survivor_count = len(survivors['id'])
+    item_count = int(items['id'].max()) + 1 if len(items['id']) else 0
+    points_by_item = np.zeros(item_count, dtype=np.int64)
+    points_by_item[items['id']] = items['point_value']
+    survivor_span = int(survivors['id'].max()) + 1 if survivor_count else 0
+    known = np.zeros(survivor_span, dtype=bool)
+    known[survivors['id']] = True
+    infected_by_id = np.zeros(survivor_span, dtype=bool)
+    infected_by_id[survivors['id']] = survivors['is_infected']
+
+    wealth = np.zeros(survivor_span, dtype=np.int64)
+    healthy_totals = np.zeros(item_count, dtype=np.int64)
+    infected_totals = np.zeros(item_count, dtype=np.int64)
+    for start in range(0, len(inventory['quantity']), chunk_size):
+        survivor_ids = np.asarray(inventory['survivor_id'][start:start + chunk_size])
+        item_ids = np.asarray(inventory['item_id'][start:start + chunk_size])
+        quantities = np.asarray(inventory['quantity'][start:start + chunk_size])
+        # Rows written after the survivor or item tables were exported
+        # can reference ids that are not part of the export.
+        valid = (survivor_ids < survivor_span) & (item_ids < item_count)
+        valid[valid] = known[survivor_ids[valid]]
+        survivor_ids, item_ids, quantities = survivor_ids[valid], item_ids[valid], quantities[valid]
+
+        infected = infected_by_id[survivor_ids]
+        wealth += np.bincount(
+            survivor_ids, weights=quantities * points_by_item[item_ids], minlength=survivor_span,
+        ).astype(np.int64)
+        healthy_totals += np.bincount(
+            item_ids[~infected], weights=quantities[~infected], minlength=item_count,
+        ).astype(np.int64)
+        infected_totals += np.bincount(
+            item_ids[infected], weights=quantities[infected], minlength=item_count,
+        ).astype(np.int64)
+
+    survivor_wealth = wealth[survivors['id']]
+    is_infected = np.asarray(survivors['is_infected'])
+    bin_edges = np.histogram_bin_edges(survivor_wealth, bins=bins) if survivor_count else np.zeros(0)
+    lost_by_item = infected_totals * points_by_item
+    return {
+        'survivors': survivor_count,
+        'infected': int(is_infected.sum()),
+        'inventory_rows': manifest['inventory']['rows'],
+        'items': {
+            manifest['item_names'][str(item_id)]: {
+                'healthy_quantity': int(healthy_totals[item_id]),
+                'infected_quantity': int(infected_totals[item_id]),
+                'points_lost': int(lost_by_item[item_id]),
+            }
+            for item_id in items['id'].tolist()
+        },
+        'points_lost_to_infected': int(lost_by_item.sum()),
+        'wealth_histogram': {
+            'bin_edges': bin_edges.tolist(),
+            'healthy': np.histogram(survivor_wealth[~is_infected], bins=bin_edges)[0].tolist()
+            if survivor_count else [],
+            'infected': np.histogram(survivor_wealth[is_infected], bins=bin_edges)[0].tolist()
+            if survivor_count else [],
+        },
+    }
+
+
+def _write_table(
+    directory: Path,
+    table: str,
+    columns: tuple[tuple[str, str], ...],
+    rows: Iterator[tuple],
+    chunk_size: int,
+) -> dict:
+    dtype = np.dtype(list(columns))
+    files = {column: open(directory / f'{table}.{column}.bin', 'wb') for column, _ in columns}
+    count = 0
+    try:
+        rows = iter(rows)
+        while chunk := list(islice(rows, chunk_size)):
+            records = np.array(chunk, dtype=dtype)
+            for column, file in files.items():
+                records[column].tofile(file)
+            count += len(records)
+    finally:
+        for file in files.values():
+            file.close()
+    return {'rows': count, 'columns': dict(columns)}
@@ -0,0 +1,139 @@
+import json
+import timeit
+from collections.abc import Callable
+
+from django.http import HttpResponse, JsonResponse
+
+from django_server.serialization import BACKENDS, JSON_CONTENT_TYPE, convert
+from survivors.schemas import InfectionReportBatchRequest, InfectionReportRequest, RegisterSurvivorRequest
+
+JSON_BENCHMARK_ITERATIONS = 2000
+JSON_BENCHMARK_REPEAT = 3
+# Number of entries in the batch and listing payloads.
+JSON_BENCHMARK_BATCH = 100
+
+REGISTRATION = {
+    'name': 'Alice',
+    'age': 30,
+    'gender': 'F',
+    'latitude': 52.52,
+    'longitude': 13.405,
+    'inventory': [
+        {'item': 'Water', 'quantity': 2},
+        {'item': 'Food', 'quantity': 5},
+        {'item': 'Medication', 'quantity': 1},
+        {'item': 'Ammunition', 'quantity': 20},
+    ],
+}
+PROFILE = {
+    'id': 1,
+    **{key: value for key, value in REGISTRATION.items() if key != 'inventory'},
+    'inventory': REGISTRATION['inventory'],
+    'infected': False,
+}
+
+
+def _legacy_registration(body: bytes) -> None:
+    # What register_survivor read from the body before the typed structs.
+    data = json.loads(body)
+    [(entry['item'], entry['quantity']) for entry in data.get('inventory', [])]
+    (data['name'], data['age'], data['gender'], data['latitude'], data['longitude'])
+
+
+def _legacy_report_batch(body: bytes) -> None:
+    data = json.loads(body)
+    [
+        (entry.get('reporter_id'), entry.get('infected_id')) if isinstance(entry, dict) else None
+        for entry in data['reports']
+    ]
+
+
+def _typed_report_batch(backend, body: bytes) -> None:
+    data = convert(backend.loads(body), InfectionReportBatchRequest)
+    [convert(entry, InfectionReportRequest) for entry in data.reports]
+
+
+def _time(function: Callable[[], object], iterations: int) -> float:
+    """
+    Best of JSON_BENCHMARK_REPEAT runs, in microseconds per call.
+    """
+    timer = timeit.Timer(function)
+    return min(timer.repeat(JSON_BENCHMARK_REPEAT, iterations)) / iterations * 1e6
+
+
+def json_benchmark(iterations: int = JSON_BENCHMARK_ITERATIONS) -> dict:
+    """
+    Times decoding request bodies and encoding responses of the busiest
+    views, in microseconds per request, with every installed JSON backend
+    and with the previous code path ('legacy': json.loads with dict
+    lookups, JsonResponse and json.dumps). The database is not used.
+    """
+    backends = {}
+    for name, backend in BACKENDS.items():
+        try:
+            backends[name] = backend()
+        except ImportError:
+            continue
+
+    registration = json.dumps(REGISTRATION).encode()
+    report_batch = json.dumps({'reports': [
+        {'reporter_id': index, 'infected_id': index + 1} for index in range(JSON_BENCHMARK_BATCH)
+    ]}).encode()
+    report_results = {'results': [
+        {'reporter_id': index, 'infected_id': index + 1, 'status': 'submitted'}
+        for index in range(JSON_BENCHMARK_BATCH)
+    ]}
+    page = [dict(PROFILE, id=index) for index in range(JSON_BENCHMARK_BATCH)]
+
+    cases = {
+        'decode_registration': {
+            'legacy': lambda: _legacy_registration(registration),
+            **{
+                name: (lambda backend=backend: convert(backend.loads(registration), RegisterSurvivorRequest))
+                for name, backend in backends.items()
+            },
+        },
+        'decode_report_batch': {
+            'legacy': lambda: _legacy_report_batch(report_batch),
+            **{
+                name: (lambda backend=backend: _typed_report_batch(backend, report_batch))
+                for name, backend in backends.items()
+            },
+        },
+        'encode_profile': {
+            'legacy': lambda: json.dumps(PROFILE).encode(),
+            **{name: (lambda backend=backend: backend.dumps(PROFILE)) for name, backend in backends.items()},
+        },
+        'encode_listing_page': {
+            'legacy': lambda: [json.dumps(entry).encode() for entry in page],
+            **{
+                name: (lambda backend=backend: [backend.dumps(entry) for entry in page])
+                for name, backend in backends.items()
+            },
+        },
+        'respond_report_batch': {
+            'legacy': lambda: JsonResponse(report_results),
+            **{
+                name: (lambda backend=backend: HttpResponse(
+                    backend.dumps(report_results), content_type=JSON_CONTENT_TYPE))
+                for name, backend in backends.items()
+            },
+        },
+    }
+
+    results = {}
+    for case, functions in cases.items():
+        timings = {name: round(_time(function, iterations), 2) for name, function in functions.items()}
+        legacy = timings['legacy']
+        results[case] = {
+            'microseconds': timings,
+            'saved_percent': {
+                name: round(100 * (legacy - timing) / legacy, 1)
+                for name, timing in timings.items() if name != 'legacy'
+            },
+        }
+    return {
+        'iterations': iterations,
+        'backends': list(backends),
+        'cases': results,
+    }
@@ -0,0 +1,29 @@
+from resources.interface.service.item_catalog import item_catalog
+from reports.interface.crud.read_statistics import item_totals, survivor_counts
+
+
+def statistics_report() -> dict:
+    """
+    Builds the ZSSN reports from the running counters: the share of
+    infected survivors, the average quantity of each item per healthy
+    survivor and the points held by infected survivors. The cost depends
+    on the number of items, not on the number of survivors.
+    """
+    survivors, infected = survivor_counts()
+    healthy = survivors - infected
+    averages = {item.name: 0.0 for item in item_catalog.by_id.values()}
+    points_lost = 0
+    for item_id, healthy_quantity, infected_quantity in item_totals():
+        item = item_catalog.by_id.get(item_id)
+        if item is None:
+            continue
+        averages[item.name] = round(healthy_quantity / healthy, 2) if healthy else 0.0
+        points_lost += infected_quantity * item.point_value
+    return {
+        'survivors': survivors,
+        'infected': infected,
+        'infected_percentage': round(100 * infected / survivors, 2) if survivors else 0.0,
+        'non_infected_percentage': round(100 * healthy / survivors, 2) if survivors else 0.0,
+        'average_items_per_healthy_survivor': averages,
+        'points_lost_to_infected': points_lost,
+    }
@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.interface.service.benchmark_service import (
+    BENCHMARK_CONCURRENCY,
+    BENCHMARK_OPERATIONS,
+    BENCHMARK_SURVIVORS,
+    OPERATIONS,
+    BenchmarkService,
+    compare_results,
+)
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for entry in value.split(','):
+        operation, _, weight = entry.partition('=')
+        if operation not in OPERATIONS or not weight.isdigit():
+            raise ValueError(entry)
+        mix[operation] = int(weight)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds survivors and runs a concurrent mix of trades, location updates, '
+        'profile reads and infection reports against the configured database. '
+        'The seeded survivors are removed afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--survivors', type=int, default=BENCHMARK_SURVIVORS)
+        parser.add_argument('--operations', type=int, default=BENCHMARK_OPERATIONS)
+        parser.add_argument('--concurrency', type=int, default=BENCHMARK_CONCURRENCY)
+        parser.add_argument(
+            '--mix',
+            help=f"Operation weights, e.g. 'trade=4,profile=1'. Operations: {', '.join(OPERATIONS)}.",
+        )
+        parser.add_argument(
+            '--hot-survivors',
+            type=int,
+            help='Only let this many survivors trade, to increase lock contention.',
+        )
+        parser.add_argument(
+            '--processes',
+            action='store_true',
+            help='Run the workers in processes instead of threads.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Print the change against an earlier results file.')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else None
+        except ValueError as e:
+            raise CommandError(f'Invalid --mix entry: {e}')
+        if options['survivors'] < 2:
+            raise CommandError('At least 2 survivors are needed.')
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = json.loads(Path(options['compare']).read_text())
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {options["compare"]}: {e}')
+
+        results = BenchmarkService(
+            survivors=options['survivors'],
+            operations=options['operations'],
+            concurrency=options['concurrency'],
+            mix=mix,
+            hot_survivors=options['hot_survivors'],
+            seed=options['seed'],
+            processes=options['processes'],
+        ).run()
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+        for operation, result in results['operations'].items():
+            latency = result['latency_ms']
+            self.stdout.write(
+                f"{operation:<10} {result['count']:>7} ops {result['throughput_per_second']:>9}/s "
+                f"p50 {latency['p50']:>8}ms p95 {latency['p95']:>8}ms p99 {latency['p99']:>8}ms "
+                f"{result['queries']['mean']:>5} queries {result['errors']:>5} errors"
+            )
+        contention = results['contention']
+        self.stdout.write(
+            f"lock wait {contention['lock_wait_seconds']}s over {contention['lock_waits']} locks, "
+            f"retries {contention['retries']}"
+        )
+        if baseline is not None:
+            for operation, changes in compare_results(baseline, results).items():
+                self.stdout.write(f'{operation:<10} ' + ' '.join(
+                    f'{name} {change:+}%' for name, change in changes.items() if change is not None
+                ))
+        self.stdout.write(self.style.SUCCESS(
+            f"{results['parameters']['operations']} operations in {results['elapsed_seconds']}s "
+            f"({results['throughput_per_second']}/s) on {results['database']}"
+        ))
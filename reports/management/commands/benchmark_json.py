@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reports.interface.service.json_benchmark_service import JSON_BENCHMARK_ITERATIONS, json_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Times request decoding and response encoding of the busiest views with '
+        'every installed JSON backend against the previous code path.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=JSON_BENCHMARK_ITERATIONS)
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+
+    def handle(self, *args, **options):
+        results = json_benchmark(options['iterations'])
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=2))
+
+        columns = ['legacy', *results['backends']]
+        self.stdout.write(f"{'case':<22}" + ''.join(f'{column:>12}' for column in columns))
+        for case, result in results['cases'].items():
+            self.stdout.write(f'{case:<22}' + ''.join(
+                f"{result['microseconds'][column]:>10}us" for column in columns
+            ))
+            self.stdout.write(f"{'  saved':<22}{'':>12}" + ''.join(
+                f"{result['saved_percent'][column]:>11}%" for column in results['backends']
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"{results['iterations']} iterations per case, best of 3"
+        ))
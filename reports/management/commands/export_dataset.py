@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_server.db_router import replica_reads
+from reports.interface.service.export_service import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_HISTOGRAM_BINS,
+    dataset_analytics,
+    export_dataset,
+)
+
+ANALYTICS_NAME = 'analytics.json'
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports survivors, inventory and items as columnar binary files '
+        'and computes inventory analytics from them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Output directory, created if missing.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Number of rows read and converted at a time.',
+        )
+        parser.add_argument(
+            '--bins',
+            type=int,
+            default=EXPORT_HISTOGRAM_BINS,
+            help='Number of bins of the wealth histogram.',
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        try:
+            with replica_reads():
+                manifest = export_dataset(directory, options['chunk_size'])
+            analytics = dataset_analytics(directory, options['chunk_size'], options['bins'])
+            (directory / ANALYTICS_NAME).write_text(json.dumps(analytics, indent=2))
+        except OSError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {manifest['survivors']['rows']} survivors and "
+            f"{manifest['inventory']['rows']} inventory rows in {manifest['elapsed_seconds']}s "
+            f"to {directory}; {analytics['points_lost_to_infected']} points lost to infected"
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.interface import recompute_statistics
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the running statistics from the survivor and inventory tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report drift, do not write the counters; fails if any counter is off.',
+        )
+
+    def handle(self, *args, **options):
+        drift = recompute_statistics(dry_run=options['check'])
+        for counter, difference in sorted(drift.items()):
+            self.stderr.write(f'{counter}: off by {difference:+d}')
+        if options['check'] and drift:
+            raise CommandError(f'{len(drift)} counters drifted')
+        self.stdout.write(self.style.SUCCESS(
+            'Statistics are consistent' if not drift else f'Corrected {len(drift)} counters'
+        ))
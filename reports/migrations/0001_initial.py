@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_statistics(apps, schema_editor):
+    Survivor = apps.get_model('survivors', 'Survivor')
+    InventoryItem = apps.get_model('resources', 'InventoryItem')
+    Item = apps.get_model('resources', 'Item')
+    SurvivorStatistics = apps.get_model('reports', 'SurvivorStatistics')
+    ItemStatistics = apps.get_model('reports', 'ItemStatistics')
+    counts = Survivor.objects.aggregate(
+        survivors=Count('pk'),
+        infected=Count('pk', filter=Q(is_infected=True)),
+    )
+    SurvivorStatistics.objects.create(pk=1, **counts)
+    totals = {
+        row['item']: row
+        for row in InventoryItem.objects.order_by().values('item').annotate(
+            healthy=Sum('quantity', filter=Q(survivor__is_infected=False)),
+            infected=Sum('quantity', filter=Q(survivor__is_infected=True)),
+        )
+    }
+    ItemStatistics.objects.bulk_create([
+        ItemStatistics(
+            item_id=item_id,
+            healthy_quantity=totals.get(item_id, {}).get('healthy') or 0,
+            infected_quantity=totals.get(item_id, {}).get('infected') or 0,
+        )
+        for item_id in Item.objects.values_list('pk', flat=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('resources', '0002_seed_default_items'),
+        ('survivors', '0003_survivor_geo_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemStatistics',
+            fields=[
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='resources.item')),
+                ('healthy_quantity', models.BigIntegerField(default=0)),
+                ('infected_quantity', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SurvivorStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('survivors', models.BigIntegerField(default=0)),
+                ('infected', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_statistics, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import models
+
+from resources.models import Item
+
+SURVIVOR_STATISTICS_ID = 1
+
+
+class SurvivorStatistics(models.Model):
+    """
+    Running survivor counters, a single row with id SURVIVOR_STATISTICS_ID.
+    See `reports.interface.crud.update_statistics`.
+    """
+    survivors = models.BigIntegerField(default=0)
+    infected = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.infected} of {self.survivors} survivors infected'
+
+
+class ItemStatistics(models.Model):
+    """
+    Running totals of an item held by healthy and by infected survivors.
+    """
+    item = models.OneToOneField(Item, primary_key=True, on_delete=models.CASCADE)
+    healthy_quantity = models.BigIntegerField(default=0)
+    infected_quantity = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.item_id}: {self.healthy_quantity} healthy, {self.infected_quantity} infected'
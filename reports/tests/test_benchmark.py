@@ -0,0 +1,59 @@
+from django.core.management import call_command
+import json
+import pytest
+from reports.interface import recompute_statistics
+from reports.interface.service.benchmark_service import BenchmarkService, compare_results
+from reports.interface.service.json_benchmark_service import json_benchmark
+from reports.models import SurvivorStatistics
+from resources.models import Item
+from survivors.models import Survivor
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmark:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        # Transactional tests flush the items seeded by the migrations.
+        for name, points in [("Water", 4), ("Food", 3), ("Medication", 2), ("Ammunition", 1)]:
+            Item.objects.get_or_create(name=name, defaults={"point_value": points})
+
+    def test_reports_every_operation_and_cleans_up(self):
+        results = BenchmarkService(survivors=5, operations=60, concurrency=1).run()
+
+        assert set(results["operations"]) == {"trade", "location", "profile", "report"}
+        assert sum(result["count"] for result in results["operations"].values()) == 60
+        trade = results["operations"]["trade"]
+        assert trade["latency_ms"]["p50"] <= trade["latency_ms"]["p99"]
+        assert trade["queries"]["mean"] > 0
+        assert results["contention"]["lock_waits"] > 0
+        assert not Survivor.objects.exists()
+        assert compare_results(results, results)["trade"]["p95_ms"] == 0.0
+
+    def test_clean_up_only_removes_the_seeded_survivors(self, create_survivor):
+        create_survivor(name="Resident")
+        recompute_statistics()
+        # Drift that a full recount would repair must survive the run.
+        SurvivorStatistics.objects.update(survivors=10)
+
+        BenchmarkService(survivors=5, operations=60, concurrency=1).run()
+
+        assert list(Survivor.objects.values_list("name", flat=True)) == ["Resident"]
+        assert recompute_statistics(dry_run=True) == {"survivors": -9}
+
+    def test_command_writes_json(self, tmp_path):
+        output = tmp_path / "results.json"
+        call_command("benchmark", "--survivors", "3", "--operations", "10",
+                     "--concurrency", "1", "--mix", "trade=1,location=1",
+                     "--output", str(output))
+        results = json.loads(output.read_text())
+        assert set(results["operations"]) <= {"trade", "location"}
+        assert results["parameters"]["mix"] == {"trade": 1, "location": 1}
+
+
+def test_json_benchmark_compares_backends_with_legacy_path():
+    results = json_benchmark(iterations=5)
+    assert "stdlib" in results["backends"]
+    for result in results["cases"].values():
+        assert set(result["microseconds"]) == {"legacy", *results["backends"]}
+        assert set(result["saved_percent"]) == set(results["backends"])
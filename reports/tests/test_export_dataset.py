@@ -0,0 +1,56 @@
+import json
+
+from django.core.management import call_command
+import numpy as np
+import pytest
+from resources.models import Item
+from reports.interface.service.export_service import dataset_analytics, export_dataset, load_dataset
+
+
+@pytest.mark.django_db
+class TestExportDataset:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        water = Item.objects.get(name="Water")
+        food = Item.objects.get(name="Food")
+        self.alice = create_survivor(name="Alice", gender="F")
+        self.bob = create_survivor(name="Bob", gender="M", is_infected=True)
+        self.carol = create_survivor(name="Carol", gender="O")
+        create_inventory_item(survivor=self.alice, item=water, quantity=3)
+        create_inventory_item(survivor=self.alice, item=food, quantity=1)
+        create_inventory_item(survivor=self.bob, item=water, quantity=2)
+        create_inventory_item(survivor=self.bob, item=food, quantity=5)
+
+    def test_export_round_trips_columns(self, tmp_path):
+        # A chunk size smaller than the tables exercises chunked writes.
+        manifest = export_dataset(tmp_path, chunk_size=3)
+        assert manifest["survivors"]["rows"] == 3
+        assert manifest["inventory"]["rows"] == 4
+
+        dataset = load_dataset(tmp_path)
+        survivors = dataset["survivors"]
+        order = np.argsort(survivors["id"])
+        assert survivors["gender"][order].tolist() == [b"F", b"M", b"O"]
+        assert survivors["is_infected"][order].tolist() == [False, True, False]
+        assert int(dataset["inventory"]["quantity"].sum()) == 11
+
+    def test_analytics(self, tmp_path):
+        export_dataset(tmp_path, chunk_size=3)
+        analytics = dataset_analytics(tmp_path, chunk_size=3, bins=2)
+        assert analytics["items"]["Water"] == {
+            "healthy_quantity": 3, "infected_quantity": 2, "points_lost": 8,
+        }
+        assert analytics["items"]["Food"]["points_lost"] == 15
+        assert analytics["points_lost_to_infected"] == 23
+        # Wealth: Carol 0, Alice 15 healthy; Bob 23 infected.
+        histogram = analytics["wealth_histogram"]
+        assert histogram["bin_edges"] == [0.0, 11.5, 23.0]
+        assert histogram["healthy"] == [1, 1]
+        assert histogram["infected"] == [0, 1]
+
+    def test_command_writes_analytics(self, tmp_path):
+        call_command("export_dataset", str(tmp_path), "--bins", "4")
+        analytics = json.loads((tmp_path / "analytics.json").read_text())
+        assert analytics["survivors"] == 3
+        assert len(analytics["wealth_histogram"]["healthy"]) == 4
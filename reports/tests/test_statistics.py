@@ -0,0 +1,99 @@
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+import pytest
+from reports.interface import record_infections, recompute_statistics, statistics_report
+from resources.interface import TradeService
+from resources.interface.service.item_catalog import item_catalog
+from survivors.interface import record_infection_report
+from survivors.models import Survivor
+
+
+def register(client, name, inventory):
+    response = client.post(reverse("register-survivor"), data={
+        "name": name, "age": 30, "gender": "F", "latitude": 1.0, "longitude": 1.0,
+        "inventory": inventory,
+    }, content_type="application/json")
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def report(client, reporter_id, infected_id):
+    return client.post(reverse("report-infection"),
+                       data={"reporter_id": reporter_id, "infected_id": infected_id},
+                       content_type="application/json")
+
+
+@pytest.mark.django_db
+class TestStatistics:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.alice = register(client, "Alice", [{"item": "Water", "quantity": 4},
+                                                {"item": "Food", "quantity": 2}])
+        self.bob = register(client, "Bob", [{"item": "Water", "quantity": 2},
+                                            {"item": "Food", "quantity": 4}])
+        self.witnesses = [register(client, f"Witness {i}", []) for i in range(3)]
+
+    def test_registrations_are_counted(self):
+        stats = statistics_report()
+        assert stats["survivors"] == 5
+        assert stats["infected"] == 0
+        assert stats["average_items_per_healthy_survivor"]["Water"] == 1.2
+        assert stats["average_items_per_healthy_survivor"]["Food"] == 1.2
+        assert stats["points_lost_to_infected"] == 0
+
+    def test_infection_moves_inventory_to_lost_points(self, client):
+        for witness in self.witnesses:
+            report(client, witness, self.alice)
+        # A report after the threshold must not count Alice twice.
+        report(client, self.bob, self.alice)
+
+        stats = statistics_report()
+        assert stats["infected"] == 1
+        assert stats["infected_percentage"] == 20.0
+        assert stats["average_items_per_healthy_survivor"]["Water"] == 0.5
+        assert stats["average_items_per_healthy_survivor"]["Food"] == 1.0
+        # 4 Water x 4 points + 2 Food x 3 points.
+        assert stats["points_lost_to_infected"] == 22
+        assert recompute_statistics(dry_run=True) == {}
+
+    def test_reports_against_an_infected_survivor_are_not_counted_again(self):
+        Survivor.objects.filter(pk=self.alice).update(is_infected=True)
+        record_infections([self.alice])
+        for witness in self.witnesses:
+            assert record_infection_report(witness, self.alice)
+
+        assert statistics_report()["infected"] == 1
+        assert recompute_statistics(dry_run=True) == {}
+
+    def test_batch_infection_reports_are_counted(self, client):
+        response = client.post(reverse("report-infection-batch"), data={"reports": [
+            {"reporter_id": witness, "infected_id": self.bob} for witness in self.witnesses
+        ]}, content_type="application/json")
+        assert response.status_code == 200
+        assert statistics_report()["points_lost_to_infected"] == 20
+        assert recompute_statistics(dry_run=True) == {}
+
+    def test_trades_leave_totals_unchanged(self):
+        before = statistics_report()
+        # Alice gives 3 Water for Bob's 4 Food.
+        TradeService(self.alice, self.bob,
+                     [{"item": "Food", "quantity": 4}],
+                     [{"item": "Water", "quantity": 3}]).execute()
+        assert statistics_report() == before
+        assert recompute_statistics(dry_run=True) == {}
+
+    def test_endpoint_reads_counters_only(self, client, django_assert_num_queries):
+        item_catalog.load()
+        with django_assert_num_queries(2):
+            response = client.get(reverse("statistics"))
+        assert response.status_code == 200
+        assert response.json()["survivors"] == 5
+
+    def test_recompute_command_repairs_drift(self, create_survivor):
+        create_survivor(name="Unregistered", is_infected=True)
+        with pytest.raises(CommandError):
+            call_command("recompute_statistics", "--check")
+        call_command("recompute_statistics")
+        assert statistics_report()["infected"] == 1
+        call_command("recompute_statistics", "--check")
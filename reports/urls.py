@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import statistics
+
+urlpatterns = [
+    path('', statistics, name='statistics'),
+]
@@ -0,0 +1,18 @@
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from django_server.db_router import replica_view
+from django_server.serialization import json_response
+from reports.interface import statistics_report
+
+
+@csrf_exempt
+@require_http_methods(['GET'])
+@replica_view
+def statistics(request: HttpRequest) -> HttpResponse:
+    try:
+        report = statistics_report()
+    except Exception as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response(report, status=200)
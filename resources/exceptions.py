@@ -1,2 +1,9 @@
 class TradeError(Exception):
     pass
+
+
+class TradeConflictError(Exception):
+    """
+    A trade kept being aborted by concurrent trades (deadlocks or
+    serialization failures) and was given up. Retrying later may succeed.
+    """
@@ -1,69 +1,101 @@
-from django import forms
-from survivors.models import Survivor
-from resources.models import Item
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 
+from django_server.serialization import SchemaError, convert
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import Item
+from resources.schemas import TradeEntry, TradeRequest
+from survivors.models import Survivor
 
-class TradeForm(forms.Form):
-    survivor_a = forms.IntegerField()
-    survivor_b = forms.IntegerField()
-    items_a = forms.JSONField()
-    items_b = forms.JSONField()
 
-    def clean(self) -> dict:
-        cleaned_data = super().clean()
-        survivor_a_id = cleaned_data.get('survivor_a')
-        survivor_b_id = cleaned_data.get('survivor_b')
+class TradeForm:
+    """
+    Validates a decoded trade payload. The payload is checked against
+    `TradeRequest` by the converter of `django_server.serialization`
+    instead of Django form fields (ids may still be numeric strings), both
+    survivors are loaded with one query and item names are resolved
+    through the item catalog. The loaded survivors and items are kept in
+    `cleaned_data`, see `TradeService.from_cleaned_data`.
+    Attributes:
+        data (dict): The decoded payload.
+        survivors (dict | None): Survivors preloaded by the caller, by id,
+            e.g. for a whole batch of trades. When given, survivors are
+            only looked up there.
+        errors (dict): {field: [messages]} once validated, NON_FIELD_ERRORS
+            for errors about the whole trade.
+        cleaned_data (dict): survivor_a, survivor_b (ids), items_a,
+            items_b ([{'item': name, 'quantity': n}]), survivor_a_obj,
+            survivor_b_obj (Survivor), items_a_obj, items_b_obj
+            ([{'item': Item, 'quantity': n}]) and items ({name: Item}).
+    Methods:
+        is_valid():
+            Validates the payload once and tells whether it is valid.
+    """
+    def __init__(self, data, survivors: dict[int, Survivor] | None = None) -> None:
+        self.data = data
+        self.survivors = survivors
+        self.errors: dict[str, list[str]] = {}
+        self.cleaned_data: dict = {}
+        self._validated = False
 
-        if survivor_a_id == survivor_b_id:
-            raise forms.ValidationError('Survivors must be different.')
+    def is_valid(self) -> bool:
+        if not self._validated:
+            self._validated = True
+            try:
+                self.cleaned_data = self.clean()
+            except SchemaError as e:
+                field = e.path[0] if e.path else NON_FIELD_ERRORS
+                self.errors = {field: [str(e)]}
+            except ValidationError as e:
+                self.errors = {NON_FIELD_ERRORS: e.messages}
+        return not self.errors
 
-        try:
-            cleaned_data['survivor_a_obj'] = Survivor.objects.get(
-                id=survivor_a_id)
-        except Survivor.DoesNotExist:
-            raise forms.ValidationError('Survivor A does not exist.')
+    def clean(self) -> dict:
+        trade = convert(self.data, TradeRequest)
+        if trade.survivor_a == trade.survivor_b:
+            raise ValidationError('Survivors must be different.')
 
-        try:
-            cleaned_data['survivor_b_obj'] = Survivor.objects.get(
-                id=survivor_b_id)
-        except Survivor.DoesNotExist:
-            raise forms.ValidationError('Survivor B does not exist.')
+        survivors = self._survivors([trade.survivor_a, trade.survivor_b])
+        if trade.survivor_a not in survivors:
+            raise ValidationError('Survivor A does not exist.')
+        if trade.survivor_b not in survivors:
+            raise ValidationError('Survivor B does not exist.')
 
-        cleaned_data['items_a_obj'] = self._validate_items(
-            cleaned_data.get('items_a', []), 'A')
-        cleaned_data['items_b_obj'] = self._validate_items(
-            cleaned_data.get('items_b', []), 'B')
+        items = item_catalog.resolve(
+            {entry.item for entry in trade.items_a} | {entry.item for entry in trade.items_b})
+        return {
+            'survivor_a': trade.survivor_a,
+            'survivor_b': trade.survivor_b,
+            'survivor_a_obj': survivors[trade.survivor_a],
+            'survivor_b_obj': survivors[trade.survivor_b],
+            'items_a': self._validate_items(trade.items_a, items, 'A'),
+            'items_b': self._validate_items(trade.items_b, items, 'B'),
+            'items_a_obj': [
+                {'item': items[entry.item], 'quantity': entry.quantity} for entry in trade.items_a],
+            'items_b_obj': [
+                {'item': items[entry.item], 'quantity': entry.quantity} for entry in trade.items_b],
+            'items': items,
+        }
 
-        return cleaned_data
+    def _survivors(self, survivor_ids: list[int]) -> dict[int, Survivor]:
+        if self.survivors is not None:
+            return self.survivors
+        return Survivor.objects.in_bulk(survivor_ids)
 
     @staticmethod
-    def _validate_items(item_list, label):
-        if not isinstance(item_list, list):
-            raise forms.ValidationError(f'items_{label} must be a list of objects')
-
-        item_names = {entry.get('item') for entry in item_list}
-        if None in item_names:
-            raise forms.ValidationError(
-                f'All entries in items_{label} must have an "item" key')
-
-        items_lookup = {item.name: item for item in
-                        Item.objects.filter(name__in=item_names)}
-
-        unknown_items = item_names - items_lookup.keys()
+    def _validate_items(
+        entries: list[TradeEntry],
+        items: dict[str, Item],
+        label: str,
+    ) -> list[dict]:
+        unknown_items = {entry.item for entry in entries} - items.keys()
         if unknown_items:
-            raise forms.ValidationError(
-                f'Invalid items in items_{label}: {", ".join(unknown_items)}')
+            raise ValidationError(
+                f'Invalid items in items_{label}: {", ".join(sorted(unknown_items))}')
 
         valid_items = []
-        for entry in item_list:
-            item_name = entry['item']
-            quantity = entry.get('quantity')
-
-            if not isinstance(quantity, int) or quantity < 1:
-                raise forms.ValidationError(
-                    f'Quantity for item "{item_name}" in items_{label} must be a positive integer.')
-            valid_items.append({
-                "item": items_lookup[item_name],
-                "quantity": quantity
-            })
+        for entry in entries:
+            if entry.quantity < 1:
+                raise ValidationError(
+                    f'Quantity for item "{entry.item}" in items_{label} must be a positive integer.')
+            valid_items.append({'item': entry.item, 'quantity': entry.quantity})
         return valid_items
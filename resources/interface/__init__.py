@@ -1,4 +1,4 @@
-from .crud.update_intentory import transfer_items
+from .crud.update_intentory import save_inventory_items
 from .crud.read_survivors import infected_survivors
 from .crud.read_inventory import fetch_and_lock_inventory_items
 from .service.trade_service import TradeService
@@ -6,6 +6,6 @@ from .service.trade_service import TradeService
 __all__ = [
     'fetch_and_lock_inventory_items',
     'infected_survivors',
-    'transfer_items',
+    'save_inventory_items',
     'TradeService',
 ]
@@ -1,15 +1,47 @@
 from django.db.models import QuerySet
 
-from resources.models import InventoryItem
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import InventoryItem, Item
 
 
 def fetch_and_lock_inventory_items(
     survivor_ids: list[int],
     items: list[str],
+    resolved: dict[str, Item] | None = None,
 ) -> QuerySet[InventoryItem]:
+    """
+    Lock the non-empty inventory rows of healthy survivors for the given
+    item names. Names are resolved through the item catalog, or taken
+    from `resolved` when the caller already did, so rows are filtered by
+    item_id without joining `Item`.
+    Rows are locked in (survivor_id, item_id) order, the same order as
+    `fetch_and_lock_inventory_rows`, so two trades between the same
+    survivors can not each hold a lock the other one waits for.
+    Locking always runs inside a transaction, which keeps it on the
+    primary database.
+    """
+    if resolved is None:
+        resolved = item_catalog.resolve(items)
+    item_ids = [resolved[name].pk for name in set(items) if name in resolved]
     return InventoryItem.objects.select_for_update().filter(
         survivor_id__in=survivor_ids,
         survivor__is_infected=False,
-        item__name__in=items,
+        item_id__in=item_ids,
         quantity__gt=0,
-    ).select_related('item')
+    ).order_by('survivor_id', 'item_id')
+
+
+def fetch_and_lock_inventory_rows(
+    survivor_ids: list[int],
+    item_ids: list[int],
+) -> QuerySet[InventoryItem]:
+    """
+    Lock every inventory row of the given survivors for the given items,
+    including empty ones, in (survivor_id, item_id) order so concurrent
+    batches always acquire the row locks in the same sequence.
+    """
+    return InventoryItem.objects.select_for_update().filter(
+        survivor_id__in=survivor_ids,
+        item_id__in=item_ids,
+    ).order_by('survivor_id', 'item_id')
+
@@ -1,44 +1,49 @@
-from functools import cache
+from functools import reduce
+from operator import or_
 
-from django.db import IntegrityError
-from django.db.models import F
+from django.db.models import Case, F, IntegerField, Q, When
 
-from resources.exceptions import TradeError
+from resources.interface.service.item_catalog import item_catalog
 from resources.models import InventoryItem, Item
 
 
-def transfer_items(
-    giver_id: int,
-    receiver_id: int,
-    shopping_list: list[dict[str, int | str]],
+def save_inventory_items(
+    updated: list[InventoryItem],
+    created: list[InventoryItem],
 ) -> None:
     """
-    Transfers specified items from one survivor to another.
+    Flushes inventory rows whose quantity was changed in memory.
+    `created` holds credits to rows that were not locked: the receiver
+    had no row for the item or an empty one. They are inserted empty if
+    missing and then incremented, so concurrent credits to the same row
+    add up instead of overwriting each other.
     """
-    try:
-        for shopping_item in shopping_list:
-            item_name = shopping_item["item"]
-            quantity = shopping_item["quantity"]
-            # Remove from giver
-            InventoryItem.objects.filter(
-                survivor_id=giver_id,
-                item__name=item_name
-            ).update(quantity=F('quantity') - quantity)
+    if updated:
+        InventoryItem.objects.bulk_update(updated, ['quantity'])
+    if created:
+        InventoryItem.objects.bulk_create(
+            [
+                InventoryItem(survivor_id=row.survivor_id, item_id=row.item_id, quantity=0)
+                for row in created
+            ],
+            ignore_conflicts=True,
+        )
+        InventoryItem.objects.filter(reduce(or_, (
+            Q(survivor_id=row.survivor_id, item_id=row.item_id) for row in created
+        ))).update(quantity=Case(
+            *(
+                When(survivor_id=row.survivor_id, item_id=row.item_id,
+                     then=F('quantity') + row.quantity)
+                for row in created
+            ),
+            default=F('quantity'),
+            output_field=IntegerField(),
+        ))
 
-            # Add to receiver
-            inventory, _ = InventoryItem.objects.get_or_create(
-                survivor_id=receiver_id,
-                item=items_map()[item_name]
-            )
-            inventory.quantity += quantity
-            inventory.save()
-    except IntegrityError:
-        raise TradeError("Not enough resource to trade.")
 
-
-@cache
 def items_map() -> dict[str, Item]:
     """
-    Returns a list of all items.
+    Returns all items keyed by name, served from the process-local
+    item catalog.
     """
-    return {item.name: item for item in Item.objects.all()}
+    return item_catalog.by_name
@@ -0,0 +1,154 @@
+from collections import defaultdict
+
+import numpy as np
+from django.db.transaction import atomic
+
+from resources.exceptions import TradeError
+from resources.interface.crud.read_inventory import fetch_and_lock_inventory_rows
+from resources.interface.crud.read_survivors import infected_survivors
+from resources.interface.crud.update_intentory import items_map, save_inventory_items
+from resources.interface.service.contention import retry_on_conflict, timed_lock_wait
+from resources.interface.service.inventory_matrix import InventoryMatrix, load_inventory_matrix
+from resources.interface.service.item_catalog import item_catalog
+from resources.interface.service.trade_service import SurvivorHealthService
+from survivors.profile_cache import invalidate_profiles
+
+TRADE_COMPLETED = 'completed'
+TRADE_FAILED = 'failed'
+
+
+class BatchTradeService:
+    """
+    Settles many trades between survivors in a single transaction.
+    Every inventory row involved in the batch is locked once, in a
+    deterministic order, into an `InventoryMatrix`. Trades are then
+    validated and applied to the matrix one after another so that later
+    trades see the effect of earlier ones. The net quantity changes are
+    flushed with one bulk update for existing rows and one upsert for new ones.
+    Attributes:
+        trades (list): Trade payloads with the same keys as
+            `TradeForm.cleaned_data` (survivor_a, survivor_b, items_a,
+            items_b).
+    Methods:
+        execute():
+            Settles the batch and returns one result per trade, in order.
+            The whole batch is retried on deadlocks and serialization
+            failures.
+    """
+    def __init__(self, trades: list[dict]) -> None:
+        self.trades = trades
+        self._reset()
+
+    def execute(self) -> list[dict]:
+        return retry_on_conflict(self._execute)
+
+    def _reset(self) -> None:
+        self.matrix: InventoryMatrix | None = None
+        # Net change of every matrix cell over the settled trades.
+        self.net: np.ndarray | None = None
+        self.traders: set[int] = set()
+        self.infected_ids: set[int] = set()
+
+    @atomic
+    def _execute(self) -> list[dict]:
+        self._reset()
+        results: list[dict | None] = [None] * len(self.trades)
+        pending = []
+        for index, trade in enumerate(self.trades):
+            try:
+                SurvivorHealthService(
+                    [trade['survivor_a'], trade['survivor_b']]
+                ).validate_not_infected_from_cache()
+                pending.append((index, self._deltas(trade)))
+            except TradeError as te:
+                results[index] = self._failed(te)
+
+        if pending:
+            self._lock(pending)
+            for index, (outgoing, deltas) in pending:
+                try:
+                    self._settle(outgoing, deltas)
+                except TradeError as te:
+                    results[index] = self._failed(te)
+                else:
+                    results[index] = {'status': TRADE_COMPLETED}
+            self._flush()
+            traders = sorted(self.traders)
+            invalidate_profiles(traders)
+        return results
+
+    @staticmethod
+    def _failed(error: TradeError) -> dict:
+        return {'status': TRADE_FAILED, 'error': str(error)}
+
+    @staticmethod
+    def _deltas(trade: dict) -> tuple[dict, dict]:
+        """
+        Resolves a trade into the quantities each survivor gives away and
+        the net quantity change per (survivor_id, item_id).
+        Survivor A gives `items_b` and survivor B gives `items_a`.
+        """
+        catalog = items_map()
+        survivor_a_id = trade['survivor_a']
+        survivor_b_id = trade['survivor_b']
+        outgoing = defaultdict(int)
+        deltas = defaultdict(int)
+        points = {survivor_a_id: 0, survivor_b_id: 0}
+        for giver_id, receiver_id, items in (
+            (survivor_a_id, survivor_b_id, trade['items_b']),
+            (survivor_b_id, survivor_a_id, trade['items_a']),
+        ):
+            for entry in items:
+                try:
+                    item = catalog[entry['item']]
+                except KeyError as e:
+                    raise TradeError(f'Item {e} does not exist.')
+                quantity = entry['quantity']
+                points[giver_id] += item.point_value * quantity
+                outgoing[(giver_id, item.pk)] += quantity
+                deltas[(giver_id, item.pk)] -= quantity
+                deltas[(receiver_id, item.pk)] += quantity
+
+        if points[survivor_a_id] != points[survivor_b_id]:
+            raise TradeError('Unequal point value.')
+        return outgoing, deltas
+
+    def _lock(self, pending: list) -> None:
+        survivor_ids = set()
+        item_ids = set()
+        for _, (_, deltas) in pending:
+            for survivor_id, item_id in deltas:
+                survivor_ids.add(survivor_id)
+                item_ids.add(item_id)
+
+        survivor_ids = sorted(survivor_ids)
+        item_ids = sorted(item_ids)
+        with timed_lock_wait():
+            self.matrix = load_inventory_matrix(
+                fetch_and_lock_inventory_rows(survivor_ids, item_ids),
+                survivor_ids,
+                [item_catalog.get_by_id(item_id) for item_id in item_ids],
+            )
+        self.net = np.zeros_like(self.matrix.quantities)
+        if infected := list(infected_survivors(survivor_ids)):
+            SurvivorHealthService._update_cache(infected)
+            self.infected_ids = {survivor.pk for survivor in infected}
+
+    def _settle(self, outgoing: dict, deltas: dict) -> None:
+        if any(survivor_id in self.infected_ids for survivor_id, _ in deltas):
+            raise TradeError('Infected survivors cannot trade.')
+
+        cells = self.matrix.cells(outgoing)
+        if (self.matrix.quantities[cells] < list(outgoing.values())).any():
+            raise TradeError('Not enough resource to trade.')
+
+        # Keys are unique within a trade, so every cell is added to once.
+        cells = self.matrix.cells(deltas)
+        values = list(deltas.values())
+        self.matrix.quantities[cells] += values
+        self.net[cells] += values
+        self.traders.update(survivor_id for (survivor_id, _), delta in deltas.items() if delta)
+
+    def _flush(self) -> None:
+        # Cells whose trades cancel out are not written.
+        save_inventory_items(*self.matrix.instances(self.net != 0))
@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import TypeVar
+
+from django.db import DatabaseError, connection
+
+from resources.exceptions import TradeConflictError
+
+T = TypeVar('T')
+
+TRADE_MAX_ATTEMPTS = 4
+# Full jitter: attempt n sleeps a random time up to
+# min(TRADE_RETRY_MAX_DELAY, TRADE_RETRY_BASE_DELAY * 2 ** n) seconds.
+TRADE_RETRY_BASE_DELAY = 0.01
+TRADE_RETRY_MAX_DELAY = 0.2
+
+# Postgres SQLSTATE codes of transactions aborted because of other
+# transactions; rerunning them from the start is safe.
+DEADLOCK_DETECTED = '40P01'
+SERIALIZATION_FAILURE = '40001'
+
+
+class ContentionMetrics:
+    """
+    Process-local counters describing lock contention in the trade engine.
+    Attributes:
+        transactions (int): Trade transactions started, retries included.
+        retries (Counter): Retries per conflict kind.
+        exhausted (Counter): Trades given up per conflict kind.
+        lock_waits (int): Number of timed lock acquisitions.
+        lock_wait_seconds (float): Total time spent acquiring row locks.
+        max_lock_wait_seconds (float): Longest single lock acquisition.
+    Methods:
+        snapshot():
+            Returns the counters as a JSON-serializable dict.
+        reset():
+            Sets every counter back to zero.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.transactions = 0
+            self.retries: Counter = Counter()
+            self.exhausted: Counter = Counter()
+            self.lock_waits = 0
+            self.lock_wait_seconds = 0.0
+            self.max_lock_wait_seconds = 0.0
+
+    def record_transaction(self) -> None:
+        with self._lock:
+            self.transactions += 1
+
+    def record_retry(self, kind: str) -> None:
+        with self._lock:
+            self.retries[kind] += 1
+
+    def record_exhausted(self, kind: str) -> None:
+        with self._lock:
+            self.exhausted[kind] += 1
+
+    def record_lock_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.lock_waits += 1
+            self.lock_wait_seconds += seconds
+            self.max_lock_wait_seconds = max(self.max_lock_wait_seconds, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'transactions': self.transactions,
+                'retries': dict(self.retries),
+                'exhausted': dict(self.exhausted),
+                'lock_waits': self.lock_waits,
+                'lock_wait_seconds': round(self.lock_wait_seconds, 6),
+                'max_lock_wait_seconds': round(self.max_lock_wait_seconds, 6),
+            }
+
+
+contention_metrics = ContentionMetrics()
+
+
+def conflict_kind(error: DatabaseError) -> str | None:
+    """
+    Returns 'deadlock', 'serialization' or 'locked' when `error` aborted a
+    transaction because of concurrent transactions, else None.
+    """
+    sqlstate = getattr(error.__cause__, 'sqlstate', None)
+    if sqlstate == DEADLOCK_DETECTED:
+        return 'deadlock'
+    if sqlstate == SERIALIZATION_FAILURE:
+        return 'serialization'
+    if 'database is locked' in str(error):
+        # SQLite gave up waiting for the write lock (busy timeout).
+        return 'locked'
+    return None
+
+
+def retry_on_conflict(
+    transaction: Callable[[], T],
+    max_attempts: int = TRADE_MAX_ATTEMPTS,
+) -> T:
+    """
+    Runs `transaction`, a function that opens its own atomic block, and
+    reruns it after a short jittered sleep when it fails because of a
+    deadlock or serialization failure. Raises TradeConflictError once
+    `max_attempts` are used up.
+    Inside an outer transaction nothing is retried: the outer transaction
+    is aborted as well and has to be retried by its owner.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        contention_metrics.record_transaction()
+        try:
+            return transaction()
+        except DatabaseError as e:
+            kind = conflict_kind(e)
+            if kind is None or connection.in_atomic_block:
+                raise
+            if attempt >= max_attempts:
+                contention_metrics.record_exhausted(kind)
+                raise TradeConflictError(
+                    f'Trade aborted by concurrent trades ({kind}), try again.'
+                ) from e
+            contention_metrics.record_retry(kind)
+            ceiling = min(TRADE_RETRY_MAX_DELAY, TRADE_RETRY_BASE_DELAY * 2 ** attempt)
+            time.sleep(random.uniform(0, ceiling))
+
+
+@contextmanager
+def timed_lock_wait():
+    """
+    Measures the time spent acquiring row locks in the block.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        contention_metrics.record_lock_wait(time.perf_counter() - started)
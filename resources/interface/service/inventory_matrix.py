@@ -0,0 +1,118 @@
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+from django.db.models import QuerySet
+
+from resources.models import InventoryItem, Item
+
+
+class InventoryMatrix:
+    """
+    Quantities held by a set of survivors, as a dense integer matrix with
+    one row per survivor and one column per item. Point totals and
+    sufficiency checks are computed for all rows at once instead of
+    walking model instances. Cells are addressed by position; `rows` and
+    `columns` map survivor and item ids to positions.
+    Attributes:
+        survivor_ids (np.ndarray): Survivor id of each row (int64).
+        item_ids (np.ndarray): Item id of each column (int64).
+        point_values (np.ndarray): Point value of each column (int64).
+        quantities (np.ndarray): rows x columns quantities (int64); cells
+            without an inventory row hold 0.
+        ids (np.ndarray): rows x columns inventory row ids (int64); 0 where
+            the survivor has no row for the item.
+        rows (dict): {survivor_id: row}.
+        columns (dict): {item_id: column}.
+    Methods:
+        fill(rows):
+            Sets ids and quantities from (id, survivor_id, item_id, quantity) tuples.
+        cells(keys):
+            Index arrays of (survivor_id, item_id) pairs, for fancy indexing.
+        points(quantities):
+            Point value of a quantity vector, or of every row of a matrix.
+        totals():
+            Point value of every survivor's inventory.
+        sufficient(requested):
+            Whether each survivor holds at least the requested quantities.
+        instances(mask):
+            Unsaved inventory rows holding the current quantity of the cells
+            set in a boolean mask, split into (existing, new).
+    """
+    def __init__(
+        self,
+        survivor_ids: Sequence[int],
+        item_ids: Sequence[int],
+        point_values: Sequence[int],
+    ) -> None:
+        self.survivor_ids = np.asarray(survivor_ids, dtype=np.int64)
+        self.item_ids = np.asarray(item_ids, dtype=np.int64)
+        self.point_values = np.asarray(point_values, dtype=np.int64)
+        self.quantities = np.zeros((len(self.survivor_ids), len(self.item_ids)), dtype=np.int64)
+        self.ids = np.zeros_like(self.quantities)
+        self.rows = {survivor_id: row for row, survivor_id in enumerate(self.survivor_ids.tolist())}
+        self.columns = {item_id: column for column, item_id in enumerate(self.item_ids.tolist())}
+
+    def fill(self, rows: Iterable[tuple[int, int, int, int]]) -> None:
+        ids = []
+        keys = []
+        quantities = []
+        for pk, survivor_id, item_id, quantity in rows:
+            ids.append(pk)
+            keys.append((survivor_id, item_id))
+            quantities.append(quantity)
+        if keys:
+            cells = self.cells(keys)
+            self.ids[cells] = ids
+            self.quantities[cells] = quantities
+
+    def cells(self, keys: Iterable[tuple[int, int]]) -> tuple[np.ndarray, np.ndarray]:
+        rows = []
+        columns = []
+        for survivor_id, item_id in keys:
+            rows.append(self.rows[survivor_id])
+            columns.append(self.columns[item_id])
+        return np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)
+
+    def points(self, quantities: np.ndarray) -> np.ndarray:
+        return quantities @ self.point_values
+
+    def totals(self) -> np.ndarray:
+        return self.points(self.quantities)
+
+    def sufficient(self, requested: np.ndarray) -> np.ndarray:
+        return (self.quantities >= requested).all(axis=-1)
+
+    def instances(self, mask: np.ndarray) -> tuple[list[InventoryItem], list[InventoryItem]]:
+        existing = []
+        new = []
+        rows, columns = np.nonzero(mask)
+        for pk, survivor_id, item_id, quantity in zip(
+            self.ids[rows, columns].tolist(),
+            self.survivor_ids[rows].tolist(),
+            self.item_ids[columns].tolist(),
+            self.quantities[rows, columns].tolist(),
+        ):
+            instance = InventoryItem(pk=pk or None, survivor_id=survivor_id,
+                                     item_id=item_id, quantity=quantity)
+            (existing if pk else new).append(instance)
+        return existing, new
+
+
+def load_inventory_matrix(
+    queryset: QuerySet,
+    survivor_ids: Sequence[int],
+    items: Sequence[Item],
+) -> InventoryMatrix:
+    """
+    Builds the matrix of `survivor_ids` x `items` from an inventory
+    queryset such as `fetch_and_lock_inventory_items(...)`. The rows are
+    read with `values_list`, so the row locks are taken as usual but no
+    model instances are created.
+    """
+    matrix = InventoryMatrix(
+        survivor_ids,
+        [item.pk for item in items],
+        [item.point_value for item in items],
+    )
+    matrix.fill(queryset.values_list('id', 'survivor_id', 'item_id', 'quantity'))
+    return matrix
@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from resources.models import Item
+
+ITEM_CATALOG_VERSION_KEY = 'item_catalog_version'
+# How often, in seconds, a worker compares its copy against the shared
+# version stamp. Changes made by the worker itself are seen immediately.
+ITEM_CATALOG_CHECK_INTERVAL = 5.0
+
+
+class ItemCatalog:
+    """
+    Process-local, read-mostly copy of the `Item` table.
+    Items are loaded once per worker and indexed by name and by id so
+    request paths can resolve items without querying the database.
+    Saving or deleting an `Item` drops the local copy right away and
+    calls `invalidate()` once the transaction commits (see
+    `resources.signals`), which bumps a version stamp in the shared
+    cache; other workers notice the new stamp on their next periodic
+    check and reload. Bumping before the commit would let them reload
+    the old rows under the new stamp.
+    Attributes:
+        check_interval (float): Seconds between shared version checks.
+    Methods:
+        load():
+            Loads the catalog now, e.g. before forking workers.
+        get(name):
+            Returns the item with the given name or raises Item.DoesNotExist.
+        get_by_id(item_id):
+            Returns the item with the given id or raises Item.DoesNotExist.
+        resolve(names):
+            Returns {name: item} for the known names among `names`.
+        aget(name), aget_by_id(item_id):
+            Async versions of get() and get_by_id(); they only leave the
+            event loop when the catalog has to be (re)loaded.
+        reset():
+            Drops the local copy; it is reloaded on next use.
+        invalidate():
+            Drops the local copy and publishes a new version stamp.
+    """
+    def __init__(self, check_interval: float = ITEM_CATALOG_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._indexes: tuple[dict[str, Item], dict[int, Item]] | None = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def load(self) -> None:
+        self._load()
+
+    @property
+    def by_name(self) -> dict[str, Item]:
+        return self._load()[0]
+
+    @property
+    def by_id(self) -> dict[int, Item]:
+        return self._load()[1]
+
+    def get(self, name: str) -> Item:
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise Item.DoesNotExist(f'Item {name!r} does not exist.')
+
+    def get_by_id(self, item_id: int) -> Item:
+        try:
+            return self.by_id[item_id]
+        except KeyError:
+            raise Item.DoesNotExist(f'Item {item_id} does not exist.')
+
+    async def aget(self, name: str) -> Item:
+        indexes = self._fresh_indexes()
+        if indexes is None:
+            return await sync_to_async(self.get)(name)
+        try:
+            return indexes[0][name]
+        except KeyError:
+            raise Item.DoesNotExist(f'Item {name!r} does not exist.')
+
+    async def aget_by_id(self, item_id: int) -> Item:
+        indexes = self._fresh_indexes()
+        if indexes is None:
+            return await sync_to_async(self.get_by_id)(item_id)
+        try:
+            return indexes[1][item_id]
+        except KeyError:
+            raise Item.DoesNotExist(f'Item {item_id} does not exist.')
+
+    def resolve(self, names) -> dict[str, Item]:
+        by_name = self.by_name
+        return {name: by_name[name] for name in names if name in by_name}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._indexes = None
+            self._version = None
+
+    def invalidate(self) -> None:
+        self.reset()
+        cache.set(ITEM_CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    def _fresh_indexes(self) -> tuple[dict[str, Item], dict[int, Item]] | None:
+        """
+        The local indexes if they can be used without checking the shared
+        version, else None. Taken once, so a concurrent `reset()` or an
+        expiring interval cannot force a reload on the event loop.
+        """
+        indexes, checked_at = self._indexes, self._checked_at
+        if indexes is not None and time.monotonic() - checked_at < self.check_interval:
+            return indexes
+        return None
+
+    def _load(self) -> tuple[dict[str, Item], dict[int, Item]]:
+        now = time.monotonic()
+        indexes = self._indexes
+        if indexes is not None and now - self._checked_at < self.check_interval:
+            return indexes
+
+        with self._lock:
+            version = cache.get_or_set(
+                ITEM_CATALOG_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            if self._indexes is None or version != self._version:
+                items = list(Item.objects.all())
+                self._indexes = (
+                    {item.name: item for item in items},
+                    {item.pk: item for item in items},
+                )
+                self._version = version
+            self._checked_at = now
+            return self._indexes
+
+
+item_catalog = ItemCatalog()
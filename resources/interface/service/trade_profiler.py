@@ -0,0 +1,211 @@
+import cProfile
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_server.metrics import LATENCY_BUCKETS, QUERY_COUNT_BUCKETS, Histogram, register
+
+TRADE_STAGE_SECONDS = register(Histogram(
+    'zssn_trade_stage_seconds', 'Time spent in each TradeService stage.',
+    LATENCY_BUCKETS, label='stage',
+))
+TRADE_STAGE_QUERIES = register(Histogram(
+    'zssn_trade_stage_queries', 'SQL queries run by each TradeService stage.',
+    QUERY_COUNT_BUCKETS, label='stage',
+))
+PROFILE_GLOB = 'trade-*.json'
+# Only one cProfile profiler can be active per process on Python 3.12+,
+# so concurrent captures are skipped rather than failing the trade.
+_capture_lock = threading.Lock()
+
+
+class TradeProfile:
+    """
+    Instrumentation of one `TradeService.execute` call. Each `stage()`
+    block is timed and its queries are counted; the totals go to the
+    stage histograms. A captured profile also runs the trade under
+    cProfile and, when the trade is slower than TRADE_PROFILE_SLOW_MS,
+    writes the cProfile stats (`.prof`) and a JSON summary with the
+    stage timings and queries to TRADE_PROFILE_DIR. Only one trade per
+    process is captured at a time; others are just timed.
+    Attributes:
+        capture (bool): Whether this trade runs under cProfile.
+        stages (dict): {stage: [seconds, queries]} over all attempts.
+        queries (list): (stage, sql, seconds) per query, when capturing.
+    Methods:
+        stage(name):
+            Context manager timing one stage.
+        finish(error):
+            Records the totals and writes the capture if the trade was slow.
+    """
+    def __init__(self, capture: bool = False) -> None:
+        self.stages: dict[str, list] = {}
+        self.queries: list[tuple[str, str, float]] = []
+        self._stage = None
+        self._started = time.perf_counter()
+        # Installed and removed by identity: the metrics wrapper may be
+        # appended after this one when the trade opens the connection.
+        self._connection = connections[DEFAULT_DB_ALIAS]
+        self._wrapper = self._record_query
+        self._connection.execute_wrappers.append(self._wrapper)
+        self._profiler = None
+        if capture and _capture_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler (e.g. an outer cProfile run) is active.
+                _capture_lock.release()
+            else:
+                self._profiler = profiler
+        self.capture = self._profiler is not None
+
+    @contextmanager
+    def stage(self, name: str):
+        totals = self.stages.setdefault(name, [0.0, 0])
+        previous, self._stage = self._stage, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            totals[0] += time.perf_counter() - started
+            self._stage = previous
+
+    def finish(self, error: BaseException | None = None) -> None:
+        elapsed = time.perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            _capture_lock.release()
+        wrappers = self._connection.execute_wrappers
+        wrappers[:] = [wrapper for wrapper in wrappers if wrapper is not self._wrapper]
+        for name, (seconds, queries) in self.stages.items():
+            TRADE_STAGE_SECONDS.observe(name, seconds)
+            TRADE_STAGE_QUERIES.observe(name, queries)
+        if self._profiler is not None and elapsed * 1000 >= settings.TRADE_PROFILE_SLOW_MS:
+            self._write(elapsed, error)
+
+    def _record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stage = self._stage or 'other'
+            self.stages.setdefault(stage, [0.0, 0])[1] += 1
+            if self.capture:
+                self.queries.append((stage, sql, time.perf_counter() - started))
+
+    def _write(self, elapsed: float, error: BaseException | None) -> None:
+        directory = Path(settings.TRADE_PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f'trade-{time.time_ns()}-{os.getpid()}'
+        self._profiler.dump_stats(directory / f'{name}.prof')
+        (directory / f'{name}.json').write_text(json.dumps({
+            'elapsed_seconds': elapsed,
+            'error': repr(error) if error is not None else None,
+            'stages': {
+                stage: {'seconds': seconds, 'queries': queries}
+                for stage, (seconds, queries) in self.stages.items()
+            },
+            'queries': [
+                {'stage': stage, 'sql': sql, 'seconds': seconds}
+                for stage, sql, seconds in self.queries
+            ],
+        }))
+        rotate_profiles(directory, settings.TRADE_PROFILE_MAX_FILES)
+
+
+class NullTradeProfile:
+    """
+    Stand-in used when profiling is off, so the trade path pays for one
+    method call per stage and nothing else.
+    """
+    _null_stage = nullcontext()
+
+    def stage(self, name: str):
+        return self._null_stage
+
+    def finish(self, error: BaseException | None = None) -> None:
+        pass
+
+
+_null_profile = NullTradeProfile()
+
+
+def start_trade_profile() -> TradeProfile | NullTradeProfile:
+    """
+    Returns the instrumentation for one trade as configured by the
+    TRADE_PROFILE_* settings.
+    """
+    sample_rate = settings.TRADE_PROFILE_SAMPLE_RATE
+    capture = sample_rate > 0 and random.random() < sample_rate
+    if capture or settings.TRADE_PROFILE_STAGES:
+        return TradeProfile(capture=capture)
+    return _null_profile
+
+
+def rotate_profiles(directory: Path, max_files: int) -> None:
+    """
+    Deletes the oldest captures beyond `max_files`.
+    """
+    summaries = sorted(directory.glob(PROFILE_GLOB), key=lambda path: path.name)
+    for summary in summaries[:max(len(summaries) - max_files, 0)]:
+        summary.unlink(missing_ok=True)
+        summary.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def summarize_profiles(directory: Path, top: int = 10) -> dict:
+    """
+    Aggregates the captured trades in `directory`: time and queries per
+    stage and the queries that took the most time in total, grouped by
+    their SQL text (parameters are not part of it).
+    """
+    stages: dict[str, dict] = {}
+    queries: dict[tuple[str, str], dict] = {}
+    summaries = sorted(Path(directory).glob(PROFILE_GLOB))
+    for path in summaries:
+        capture = json.loads(path.read_text())
+        for stage, totals in capture['stages'].items():
+            entry = stages.setdefault(stage, {'seconds': 0.0, 'max_seconds': 0.0, 'queries': 0})
+            entry['seconds'] += totals['seconds']
+            entry['max_seconds'] = max(entry['max_seconds'], totals['seconds'])
+            entry['queries'] += totals['queries']
+        for query in capture['queries']:
+            entry = queries.setdefault(
+                (query['stage'], query['sql']), {'count': 0, 'seconds': 0.0})
+            entry['count'] += 1
+            entry['seconds'] += query['seconds']
+
+    captures = len(summaries)
+    return {
+        'captures': captures,
+        'stages': sorted(
+            (
+                {
+                    'stage': stage,
+                    'mean_seconds': entry['seconds'] / captures,
+                    'max_seconds': entry['max_seconds'],
+                    'mean_queries': entry['queries'] / captures,
+                }
+                for stage, entry in stages.items()
+            ),
+            key=lambda entry: entry['mean_seconds'],
+            reverse=True,
+        ),
+        'queries': sorted(
+            (
+                {'stage': stage, 'sql': sql, **entry}
+                for (stage, sql), entry in queries.items()
+            ),
+            key=lambda entry: entry['seconds'],
+            reverse=True,
+        )[:top],
+        'profiles': [str(path.with_suffix('.prof')) for path in summaries
+                     if path.with_suffix('.prof').exists()],
+    }
@@ -1,4 +1,4 @@
-from collections import defaultdict
+import numpy as np
 from django.db.transaction import atomic
 from django.utils.functional import cached_property
 
@@ -6,13 +6,20 @@ from resources.exceptions import TradeError
 from resources.interface import (
     fetch_and_lock_inventory_items,
     infected_survivors,
-    transfer_items,
+    save_inventory_items,
 )
-from django.core.cache import cache
-
+from resources.interface.service.contention import retry_on_conflict, timed_lock_wait
+from resources.interface.service.inventory_matrix import InventoryMatrix, load_inventory_matrix
+from resources.interface.service.item_catalog import item_catalog
+from resources.interface.service.trade_profiler import (
+    NullTradeProfile,
+    TradeProfile,
+    start_trade_profile,
+)
+from resources.models import Item
+from survivors.infection_index import infection_index
 from survivors.models import Survivor
-
-SURVIVOR_CACHE_KEY = 'survivor_cache_key'
+from survivors.profile_cache import invalidate_profiles
 
 
 class TradeService:
@@ -26,9 +33,20 @@ class TradeService:
         survivor_b_id (int): ID of the second survivor.
         items_a (list): Items to be traded from survivor A.
         items_b (list): Items to be traded from survivor B.
+        survivors (dict | None): Survivors already loaded by the caller, by id.
+        items (dict | None): Traded items already resolved by the caller,
+            by name; otherwise they are resolved through the item catalog.
     Methods:
+        from_cleaned_data(data):
+            Builds the trade from a validated `TradeForm`, reusing the
+            survivors and items it loaded.
         execute():
-            Executes the complete trade transaction in an atomic block.
+            Executes the complete trade transaction in an atomic block,
+            retrying it when it is aborted by a deadlock or serialization
+            failure (see `retry_on_conflict`). Stages are timed when
+            profiling is enabled (see `start_trade_profile`).
+        execute_many(trades):
+            Settles a batch of trades in one transaction, see `BatchTradeService`.
     """
     def __init__(
         self,
@@ -36,55 +54,108 @@ class TradeService:
         survivor_b_id: int,
         items_a: list[dict[str, int]],
         items_b: list[dict[str, int]],
+        survivors: dict[int, Survivor] | None = None,
+        items: dict[str, Item] | None = None,
     ) -> None:
         self.survivor_a_id = survivor_a_id
         self.survivor_b_id = survivor_b_id
         self.items_a = items_a
         self.items_b = items_b
 
-        self.health_service = SurvivorHealthService([survivor_a_id, survivor_b_id])
+        self.health_service = SurvivorHealthService([survivor_a_id, survivor_b_id], survivors)
         self.inventory_service = InventoryService({
             survivor_a_id: items_a,
             survivor_b_id: items_b
-        })
+        }, items)
         self.trade_validator = TradeValidatorService(
             self.inventory_service,
             survivor_a_id, survivor_b_id, items_a, items_b
         )
         self.transfer_service = ItemTransferService(
+            self.inventory_service,
             survivor_a_id, survivor_b_id, items_a, items_b
         )
 
-    @atomic
+    @classmethod
+    def from_cleaned_data(cls, data: dict) -> 'TradeService':
+        return cls(
+            survivor_a_id=data['survivor_a'],
+            survivor_b_id=data['survivor_b'],
+            items_a=data['items_a'],
+            items_b=data['items_b'],
+            survivors={
+                data['survivor_a']: data['survivor_a_obj'],
+                data['survivor_b']: data['survivor_b_obj'],
+            },
+            items=data['items'],
+        )
+
     def execute(self) -> None:
-        self.health_service.validate_not_infected_from_cache()
-        self.trade_validator.validate()
-        self.transfer_service.transfer()
+        profile = start_trade_profile()
+        error = None
+        try:
+            retry_on_conflict(lambda: self._execute(profile))
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            profile.finish(error)
+
+    @atomic
+    def _execute(self, profile: TradeProfile | NullTradeProfile) -> None:
+        # Rows locked and changed by an aborted attempt must be read again.
+        self.inventory_service.reset()
+        with profile.stage('health_cache'):
+            self.health_service.validate_not_infected_from_cache()
+        with profile.stage('lock'):
+            # Locks and reads the traded inventory rows.
+            self.inventory_service.matrix
+        with profile.stage('validate'):
+            self.trade_validator.validate()
+        with profile.stage('transfer'):
+            self.transfer_service.transfer()
         # Check for infection after trade to ensure no survivor is infected
         # during the trade process. If any survivor is infected, rollback
         # the transaction.
-        self.health_service.validate_not_infected_live()
+        with profile.stage('health_live'):
+            self.health_service.validate_not_infected_live()
+        invalidate_profiles([self.survivor_a_id, self.survivor_b_id])
+
+    @staticmethod
+    def execute_many(trades: list[dict]) -> list[dict]:
+        # Imported lazily because the batch service builds on the
+        # services defined in this module.
+        from resources.interface.service.batch_trade_service import BatchTradeService
+        return BatchTradeService(trades).execute()
 
 
 class SurvivorHealthService:
     """
     Handles health state validations for survivors involved in a trade.
     Provides methods to check if survivors are infected either from
-    cache (for performance) or via a live query (for accuracy).
+    the worker-local infection index and the survivors loaded during
+    request validation (for performance) or via a live query (for
+    accuracy).
     Attributes:
         survivor_ids (List[int]): List of survivor IDs to validate.
+        survivors (dict | None): Survivors already loaded, by id.
     Methods:
         validate_not_infected_from_cache():
-            Raises TradeError if any survivor is marked as infected in cache.
+            Raises TradeError if any survivor is marked as infected in the
+            index or in the loaded survivors.
         validate_not_infected_live():
-            Performs live validation; updates cache and raises TradeError if infected.
+            Performs live validation; updates the index and raises TradeError if infected.
     """
-    def __init__(self, survivor_ids: list[int]) -> None:
+    def __init__(self, survivor_ids: list[int], survivors: dict[int, Survivor] | None = None) -> None:
         self.survivor_ids = survivor_ids
+        self.survivors = survivors or {}
 
     def validate_not_infected_from_cache(self) -> None:
+        if infected := infection_index.infected(self.survivor_ids):
+            raise TradeError(f'Survivor {infected[0]} is infected.')
         for survivor_id in self.survivor_ids:
-            if cache.get(f'{SURVIVOR_CACHE_KEY}_{survivor_id}'):
+            survivor = self.survivors.get(survivor_id)
+            if survivor is not None and survivor.is_infected:
                 raise TradeError(f'Survivor {survivor_id} is infected.')
 
     def validate_not_infected_live(self) -> None:
@@ -94,40 +165,62 @@ class SurvivorHealthService:
 
     @staticmethod
     def _update_cache(infected_list: list[Survivor]) -> None:
-        for infected in infected_list:
-            cache_key = f'{SURVIVOR_CACHE_KEY}_{infected.pk}'
-            cache.set(cache_key, infected, timeout=None)
+        infection_index.mark_infected(infected.pk for infected in infected_list)
 
 
 class InventoryService:
     """
     Responsible for fetching and validating inventory items for multiple survivors.
     Provides methods to validate item availability and calculate trade point totals.
+    The locked rows are read into an `InventoryMatrix` of the trading
+    survivors and the traded items, without building model instances.
     Attributes:
         survivor_items_map (dict): Mapping of survivor IDs to items they intend to trade.
+        items (dict | None): Traded items already resolved, by name.
     Properties:
-        inventories (dict): dictionary of inventories per survivor.
+        traded_items (dict): The known traded items, by name.
+        matrix (InventoryMatrix): Locked quantities, survivors x traded items.
     Methods:
-        validate_inventory():
-            Validates if all survivors have enough inventory to perform the trade.
+        reset():
+            Drops the fetched inventories so they are locked and read again.
+        requested(items):
+            Quantities of a trade list per matrix column.
         calculate_points(survivor_id, items):
             Calculates total point value of items a survivor wants to trade.
     """
-    def __init__(self, survivor_items_map: dict) -> None:
+    def __init__(self, survivor_items_map: dict, items: dict[str, Item] | None = None) -> None:
         self.survivor_items_map = survivor_items_map  # {id: items}
+        self.items = items
 
     @cached_property
-    def inventories(self) -> dict:
-        result = defaultdict(dict)
-        survivor_ids = []
-        traded_items = []
-        for survivor_id, items in self.survivor_items_map.items():
-            survivor_ids.append(survivor_id)
-            traded_items.extend([i['item'] for i in items])
-        inventories = fetch_and_lock_inventory_items(survivor_ids, traded_items)
-        for inventory in inventories:
-            result[inventory.survivor.pk][inventory.item.name] = inventory
-        return result
+    def traded_items(self) -> dict[str, Item]:
+        names = {i['item'] for items in self.survivor_items_map.values() for i in items}
+        if self.items is None:
+            return item_catalog.resolve(names)
+        return {name: self.items[name] for name in names if name in self.items}
+
+    @cached_property
+    def matrix(self) -> InventoryMatrix:
+        survivor_ids = list(self.survivor_items_map)
+        traded_items = self.traded_items
+        with timed_lock_wait():
+            return load_inventory_matrix(
+                fetch_and_lock_inventory_items(survivor_ids, list(traded_items), traded_items),
+                survivor_ids,
+                list(traded_items.values()),
+            )
+
+    def reset(self) -> None:
+        self.__dict__.pop('matrix', None)
+
+    def requested(self, items: list[dict[str, int]]) -> np.ndarray:
+        """
+        Raises KeyError with the name of an unknown item.
+        """
+        requested = np.zeros(len(self.matrix.item_ids), dtype=np.int64)
+        for i in items:
+            requested[self.matrix.columns[self.traded_items[i["item"]].pk]] += i["quantity"]
+        return requested
 
     def calculate_points(
         self,
@@ -135,51 +228,66 @@ class InventoryService:
         items: list[dict[str, int]],
     ) -> int:
         try:
-            return sum(
-                self.inventories[survivor_id][i["item"]].item.point_value * i["quantity"]
-                for i in items
-            )
+            requested = self.requested(items)
         except KeyError as e:
             raise TradeError(f"Item {e} not found in survivor {survivor_id}'s inventory.")
+        missing = np.flatnonzero((requested > 0) & (self.matrix.quantities[self.matrix.rows[survivor_id]] == 0))
+        if missing.size:
+            item = item_catalog.get_by_id(int(self.matrix.item_ids[missing[0]]))
+            raise TradeError(f"Item '{item.name}' not found in survivor {survivor_id}'s inventory.")
+        return int(self.matrix.points(requested))
 
 
 class ItemTransferService:
     """
     Facilitates the transfer of items between two survivors.
-    Uses pre-fetched inventory to move items from one survivor to another,
-    delegating to the low-level `transfer_items` interface function.
+    Works on the inventory matrix already locked by the shared
+    `InventoryService`: availability is checked and the debits and
+    credits are applied in memory, then written with one bulk update for
+    existing rows and one upsert for new ones, so the rows are not read again.
     Attributes:
+        inventory_service (InventoryService): Shared inventory service instance.
         survivor_a_id (int): ID of the first survivor.
         survivor_b_id (int): ID of the second survivor.
-        items_a (list): Items being sent by survivor A.
-        items_b (list): Items being sent by survivor B.
+        items_a (list): Items being sent by survivor B to survivor A.
+        items_b (list): Items being sent by survivor A to survivor B.
     Methods:
         transfer():
             Executes the bidirectional item transfer between survivors.
     """
     def __init__(
         self,
+        inventory_service: InventoryService,
         survivor_a_id: int,
         survivor_b_id: int,
         items_a: list[dict[str, int]],
         items_b: list[dict[str, int]],
     ) -> None:
+        self.inventory_service = inventory_service
         self.survivor_a_id = survivor_a_id
         self.survivor_b_id = survivor_b_id
         self.items_a = items_a
         self.items_b = items_b
 
     def transfer(self) -> None:
-        transfer_items(
-            giver_id=self.survivor_a_id,
-            receiver_id=self.survivor_b_id,
-            shopping_list=self.items_b,
-        )
-        transfer_items(
-            giver_id=self.survivor_b_id,
-            receiver_id=self.survivor_a_id,
-            shopping_list=self.items_a,
-        )
+        matrix = self.inventory_service.matrix
+        row_a = matrix.rows[self.survivor_a_id]
+        row_b = matrix.rows[self.survivor_b_id]
+        outgoing = np.zeros_like(matrix.quantities)
+        try:
+            outgoing[row_a] = self.inventory_service.requested(self.items_b)
+            outgoing[row_b] = self.inventory_service.requested(self.items_a)
+        except KeyError:
+            raise TradeError("Not enough resource to trade.")
+        if not matrix.sufficient(outgoing).all():
+            raise TradeError("Not enough resource to trade.")
+
+        deltas = -outgoing
+        deltas[row_a] += outgoing[row_b]
+        deltas[row_b] += outgoing[row_a]
+        matrix.quantities += deltas
+        # The rows are locked, so the new quantities are written by id.
+        save_inventory_items(*matrix.instances(deltas != 0))
 
 
 class TradeValidatorService:
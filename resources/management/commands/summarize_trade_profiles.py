@@ -0,0 +1,46 @@
+import pstats
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resources.interface.service.trade_profiler import summarize_profiles
+
+
+class Command(BaseCommand):
+    help = 'Summarizes the slow trades captured by the trade profiler.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            default=settings.TRADE_PROFILE_DIR,
+            help='Capture directory, TRADE_PROFILE_DIR by default.',
+        )
+        parser.add_argument('--top', type=int, default=10, help='Number of queries and functions shown.')
+
+    def handle(self, *args, **options):
+        directory = Path(options['dir'])
+        if not directory.is_dir():
+            raise CommandError(f'{directory} does not exist.')
+        summary = summarize_profiles(directory, options['top'])
+        if not summary['captures']:
+            raise CommandError(f'No captured trades in {directory}.')
+
+        self.stdout.write(f"{summary['captures']} captured trades\n")
+        self.stdout.write('Stages, slowest first:')
+        for stage in summary['stages']:
+            self.stdout.write(
+                f"  {stage['stage']:<14} mean {stage['mean_seconds'] * 1000:9.3f}ms "
+                f"max {stage['max_seconds'] * 1000:9.3f}ms "
+                f"{stage['mean_queries']:6.2f} queries"
+            )
+        self.stdout.write('\nQueries by total time:')
+        for query in summary['queries']:
+            self.stdout.write(
+                f"  {query['seconds'] * 1000:9.3f}ms {query['count']:>5}x [{query['stage']}] "
+                f"{query['sql']}"
+            )
+        if summary['profiles']:
+            self.stdout.write('\nFunctions by cumulative time:')
+            stats = pstats.Stats(*summary['profiles'], stream=self.stdout)
+            stats.strip_dirs().sort_stats('cumulative').print_stats(options['top'])
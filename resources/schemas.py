@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class TradeEntry:
+    item: str
+    quantity: int
+
+
+@dataclass(slots=True)
+class TradeRequest:
+    survivor_a: int
+    survivor_b: int
+    # Survivor A receives `items_a` from survivor B and gives `items_b`.
+    items_a: list[TradeEntry]
+    items_b: list[TradeEntry]
+
+
+@dataclass(slots=True)
+class TradeBatchRequest:
+    # Every trade is validated on its own, so one invalid trade is
+    # reported in its result instead of failing the batch.
+    trades: list[Any]
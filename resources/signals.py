@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import Item
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_item_catalog(sender, **kwargs) -> None:
+    item_catalog.reset()
+    transaction.on_commit(item_catalog.invalidate)
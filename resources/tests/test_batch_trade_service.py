@@ -0,0 +1,92 @@
+from django.urls import reverse
+import pytest
+from resources.models import InventoryItem, Item
+from resources.interface import TradeService
+
+
+@pytest.mark.django_db
+class TestBatchTradeService:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        self.alice = create_survivor(name="Alice", age=28, gender="F")
+        self.bob = create_survivor(name="Bob", age=35, gender="M", latitude=2.0)
+        self.carol = create_survivor(name="Carol", age=41, gender="F", latitude=4.0)
+        self.medication = Item.objects.get(name="Medication")
+        self.food = Item.objects.get(name="Food")
+        create_inventory_item(survivor=self.alice, item=self.medication, quantity=5)
+        create_inventory_item(survivor=self.bob, item=self.food, quantity=5)
+        create_inventory_item(survivor=self.carol, item=self.food, quantity=2)
+
+    def _trade(self, giver_a, giver_b, items_a, items_b):
+        return {
+            "survivor_a": giver_a.id,
+            "survivor_b": giver_b.id,
+            "items_a": items_a,
+            "items_b": items_b,
+        }
+
+    def test_execute_many_settles_all_trades(self):
+        results = TradeService.execute_many([
+            self._trade(self.alice, self.bob,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+            self._trade(self.carol, self.alice,
+                        [{"item": "Medication", "quantity": 1}],
+                        [{"item": "Food", "quantity": 1}]),
+        ])
+        assert results == [{"status": "completed"}, {"status": "failed",
+                                                     "error": "Unequal point value."}]
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.food).quantity == 2
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.medication).quantity == 2
+        assert InventoryItem.objects.get(survivor=self.bob, item=self.medication).quantity == 3
+        assert InventoryItem.objects.get(survivor=self.bob, item=self.food).quantity == 3
+
+    def test_later_trades_see_earlier_ones(self):
+        results = TradeService.execute_many([
+            self._trade(self.alice, self.bob,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+            self._trade(self.alice, self.bob,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+        ])
+        assert results[0] == {"status": "completed"}
+        assert results[1] == {"status": "failed", "error": "Not enough resource to trade."}
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.medication).quantity == 2
+
+    def test_infected_survivor_fails_only_own_trade(self):
+        self.carol.is_infected = True
+        self.carol.save()
+        results = TradeService.execute_many([
+            self._trade(self.alice, self.carol,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+            self._trade(self.alice, self.bob,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+        ])
+        assert results[0]["status"] == "failed"
+        assert results[1] == {"status": "completed"}
+
+    def test_batch_trade_endpoint(self, client):
+        payload = {"trades": [
+            self._trade(self.alice, self.bob,
+                        [{"item": "Food", "quantity": 2}],
+                        [{"item": "Medication", "quantity": 3}]),
+            self._trade(self.alice, self.alice, [], []),
+        ]}
+        # Ids sent as numeric strings are accepted, as with the single trade.
+        payload["trades"][0]["survivor_b"] = str(self.bob.id)
+
+        response = client.post(
+            reverse("trade-items-batch"),
+            data=payload,
+            content_type="application/json"
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0] == {"status": "completed"}
+        assert results[1]["status"] == "failed"
+        assert "errors" in results[1]
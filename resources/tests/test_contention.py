@@ -0,0 +1,147 @@
+from django.db import OperationalError, connection
+from django.db.transaction import atomic
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+from resources.exceptions import TradeConflictError
+from resources.interface import TradeService, fetch_and_lock_inventory_items
+from resources.interface.service import contention
+from resources.interface.service.contention import (
+    conflict_kind,
+    contention_metrics,
+    retry_on_conflict,
+)
+from resources.models import InventoryItem, Item
+
+
+class FakeCause(Exception):
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+
+
+def conflict(sqlstate="40P01"):
+    error = OperationalError("deadlock detected")
+    error.__cause__ = FakeCause(sqlstate)
+    return error
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(contention.time, "sleep", lambda seconds: None)
+    contention_metrics.reset()
+
+
+class TestRetryOnConflict:
+
+    def test_conflict_kinds(self):
+        assert conflict_kind(conflict("40P01")) == "deadlock"
+        assert conflict_kind(conflict("40001")) == "serialization"
+        assert conflict_kind(OperationalError("database is locked")) == "locked"
+        assert conflict_kind(OperationalError("no such table")) is None
+
+    def test_retries_until_success(self):
+        outcomes = [conflict(), conflict("40001"), "done"]
+
+        def transaction():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert retry_on_conflict(transaction) == "done"
+        metrics = contention_metrics.snapshot()
+        assert metrics["transactions"] == 3
+        assert metrics["retries"] == {"deadlock": 1, "serialization": 1}
+
+    def test_gives_up_after_max_attempts(self):
+        def transaction():
+            raise conflict()
+
+        with pytest.raises(TradeConflictError):
+            retry_on_conflict(transaction, max_attempts=3)
+        assert contention_metrics.snapshot()["exhausted"] == {"deadlock": 1}
+
+    def test_other_errors_are_not_retried(self):
+        def transaction():
+            raise OperationalError("no such table")
+
+        with pytest.raises(OperationalError):
+            retry_on_conflict(transaction)
+        assert contention_metrics.snapshot()["transactions"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTradeRetries:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        self.alice = create_survivor(name="Alice")
+        self.bob = create_survivor(name="Bob")
+        # Transactional tests flush the items seeded by the migrations.
+        self.medication, _ = Item.objects.get_or_create(name="Medication", defaults={"point_value": 2})
+        self.food, _ = Item.objects.get_or_create(name="Food", defaults={"point_value": 3})
+        create_inventory_item(survivor=self.alice, item=self.medication, quantity=5)
+        create_inventory_item(survivor=self.bob, item=self.food, quantity=5)
+
+    def _trade(self):
+        return TradeService(self.alice.id, self.bob.id,
+                            [{"item": "Food", "quantity": 2}],
+                            [{"item": "Medication", "quantity": 3}])
+
+    def test_retried_trade_is_applied_once(self, monkeypatch):
+        from resources.interface.service import trade_service
+        save = trade_service.save_inventory_items
+        failures = [conflict()]
+
+        def flaky_save(updated, created):
+            save(updated, created)
+            if failures:
+                raise failures.pop()
+
+        monkeypatch.setattr(trade_service, "save_inventory_items", flaky_save)
+        self._trade().execute()
+
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.medication).quantity == 2
+        assert InventoryItem.objects.get(survivor=self.bob, item=self.medication).quantity == 3
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.food).quantity == 2
+        metrics = contention_metrics.snapshot()
+        assert metrics["retries"] == {"deadlock": 1}
+        assert metrics["lock_waits"] == 2
+
+    def test_no_retry_inside_outer_transaction(self, monkeypatch):
+        from resources.interface.service import trade_service
+
+        def deadlocked_save(updated, created):
+            raise conflict()
+
+        monkeypatch.setattr(trade_service, "save_inventory_items", deadlocked_save)
+        with pytest.raises(OperationalError), atomic():
+            self._trade().execute()
+        assert contention_metrics.snapshot()["transactions"] == 1
+
+    def test_exhausted_retries_return_409(self, client, monkeypatch):
+        from resources.interface.service import trade_service
+
+        def deadlocked_save(updated, created):
+            raise conflict()
+
+        monkeypatch.setattr(trade_service, "save_inventory_items", deadlocked_save)
+        response = client.patch(reverse("trade-items"), data={
+            "survivor_a": self.alice.id, "survivor_b": self.bob.id,
+            "items_a": [{"item": "Food", "quantity": 2}],
+            "items_b": [{"item": "Medication", "quantity": 3}],
+        }, content_type="application/json")
+        assert response.status_code == 409
+        metrics = client.get(reverse("metrics")).content.decode()
+        assert 'zssn_trade_exhausted_total{kind="deadlock"} 1' in metrics
+
+    def test_locks_are_taken_in_canonical_order(self):
+        with CaptureQueriesContext(connection) as queries, atomic():
+            list(fetch_and_lock_inventory_items([self.bob.id, self.alice.id], ["Food"]))
+        [lock] = [query["sql"] for query in queries if "resources_inventoryitem" in query["sql"]]
+        order_by = ('ORDER BY "resources_inventoryitem"."survivor_id" ASC, '
+                    '"resources_inventoryitem"."item_id" ASC')
+        if connection.features.has_select_for_update:
+            assert lock.endswith(f"{order_by} FOR UPDATE")
+        else:
+            assert lock.endswith(order_by)
@@ -1,6 +1,7 @@
 import pytest
 
 from resources.forms import TradeForm
+from resources.interface.service.item_catalog import item_catalog
 from resources.models import Item
 
 
@@ -21,6 +22,17 @@ class TestTradeFormValidation:
         form = TradeForm(data=data)
         assert form.is_valid()
 
+    def test_numeric_string_ids_are_accepted(self, create_survivor):
+        data = {
+            "survivor_a": str(create_survivor(name="Alice").pk),
+            "survivor_b": str(create_survivor(name="Bob").pk),
+            "items_a": [{"item": "Water", "quantity": 1}],
+            "items_b": [{"item": "Food", "quantity": 1}],
+        }
+        form = TradeForm(data=data)
+        assert form.is_valid()
+        assert form.cleaned_data["survivor_a"] == int(data["survivor_a"])
+
     def test_empty_payload_invalid(self):
         form = TradeForm(data={})
         assert not form.is_valid()
@@ -39,3 +51,43 @@ class TestTradeFormValidation:
         }
         form = TradeForm(data=data)
         assert not form.is_valid()
+
+    def test_survivors_are_loaded_once_and_kept(self, create_survivor, django_assert_num_queries):
+        alice = create_survivor(name="Alice")
+        bob = create_survivor(name="Bob")
+        data = {
+            "survivor_a": alice.pk,
+            "survivor_b": bob.pk,
+            "items_a": [{"item": "Water", "quantity": 1}],
+            "items_b": [{"item": "Food", "quantity": 1}, {"item": "Ammunition", "quantity": 1}],
+        }
+        item_catalog.load()
+        form = TradeForm(data=data)
+        with django_assert_num_queries(1):
+            assert form.is_valid()
+        assert form.cleaned_data["survivor_a_obj"] == alice
+        assert form.cleaned_data["survivor_b_obj"] == bob
+        assert form.cleaned_data["items_b_obj"][1]["item"] == Item.objects.get(name="Ammunition")
+        assert set(form.cleaned_data["items"]) == {"Water", "Food", "Ammunition"}
+
+        with django_assert_num_queries(0):
+            assert TradeForm(data=data, survivors={alice.pk: alice, bob.pk: bob}).is_valid()
+
+    @pytest.mark.parametrize("change, errors", [
+        ({"survivor_b": 999}, {"__all__": ["Survivor B does not exist."]}),
+        ({"items_a": [{"item": "Gold", "quantity": 1}]}, {"__all__": ["Invalid items in items_A: Gold"]}),
+        ({"items_b": [{"item": "Food", "quantity": 0}]},
+         {"__all__": ['Quantity for item "Food" in items_B must be a positive integer.']}),
+        ({"items_b": [{"item": "Food"}]}, {"items_b": ["Missing field: 'items_b[0].quantity'"]}),
+    ])
+    def test_error_messages(self, create_survivor, change, errors):
+        data = {
+            "survivor_a": create_survivor(name="Alice").pk,
+            "survivor_b": create_survivor(name="Bob").pk,
+            "items_a": [{"item": "Water", "quantity": 1}],
+            "items_b": [{"item": "Food", "quantity": 1}],
+            **change,
+        }
+        form = TradeForm(data=data)
+        assert not form.is_valid()
+        assert form.errors == errors
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from resources.interface import TradeService, fetch_and_lock_inventory_items
+from resources.interface.service.inventory_matrix import InventoryMatrix, load_inventory_matrix
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import Item
+
+
+class TestInventoryMatrix:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        # Survivors 7 and 9; items 1 (4 points) and 3 (1 point).
+        self.matrix = InventoryMatrix([7, 9], [1, 3], [4, 1])
+        self.matrix.fill([(10, 7, 1, 2), (11, 7, 3, 5), (12, 9, 3, 1)])
+
+    def test_fill_places_rows_by_id(self):
+        assert self.matrix.quantities.tolist() == [[2, 5], [0, 1]]
+        assert self.matrix.quantities.dtype == np.int64
+        assert self.matrix.ids.tolist() == [[10, 11], [0, 12]]
+
+    def test_points_and_totals_are_vectorized(self):
+        assert self.matrix.totals().tolist() == [13, 1]
+        assert self.matrix.points(np.array([1, 2])) == 6
+
+    def test_sufficient_checks_every_row(self):
+        requested = np.array([[2, 1], [0, 2]])
+        assert self.matrix.sufficient(requested).tolist() == [True, False]
+
+    def test_instances_split_existing_and_new_rows(self):
+        changed = np.zeros_like(self.matrix.quantities, dtype=bool)
+        changed[self.matrix.cells([(7, 3), (9, 1)])] = True
+        existing, new = self.matrix.instances(changed)
+        assert [(i.pk, i.survivor_id, i.item_id, i.quantity) for i in existing] == [(11, 7, 3, 5)]
+        assert [(i.pk, i.survivor_id, i.item_id, i.quantity) for i in new] == [(None, 9, 1, 0)]
+
+
+@pytest.mark.django_db
+class TestLoadInventoryMatrix:
+
+    def test_loads_locked_rows_without_instances(
+            self, create_survivor, create_inventory_item, django_assert_num_queries):
+        alice = create_survivor(name="Alice")
+        bob = create_survivor(name="Bob")
+        water = Item.objects.get(name="Water")
+        food = Item.objects.get(name="Food")
+        create_inventory_item(survivor=alice, item=water, quantity=3)
+        create_inventory_item(survivor=bob, item=food, quantity=2)
+        item_catalog.load()
+
+        queryset = fetch_and_lock_inventory_items([alice.pk, bob.pk], ["Water", "Food"])
+        with django_assert_num_queries(1):
+            matrix = load_inventory_matrix(queryset, [alice.pk, bob.pk], [water, food])
+        assert matrix.quantities.tolist() == [[3, 0], [0, 2]]
+        assert matrix.totals().tolist() == [3 * water.point_value, 2 * food.point_value]
+
+    def test_trade_keeps_matrix_in_step_with_database(self, create_survivor, create_inventory_item):
+        alice = create_survivor(name="Alice")
+        bob = create_survivor(name="Bob")
+        water = Item.objects.get(name="Water")
+        ammunition = Item.objects.get(name="Ammunition")
+        create_inventory_item(survivor=alice, item=water, quantity=3)
+        create_inventory_item(survivor=bob, item=ammunition, quantity=8)
+
+        trade = TradeService(alice.pk, bob.pk,
+                             items_a=[{"item": "Ammunition", "quantity": 4}],
+                             items_b=[{"item": "Water", "quantity": 1}])
+        trade.execute()
+
+        matrix = trade.inventory_service.matrix
+        stored = InventoryMatrix(matrix.survivor_ids, matrix.item_ids, matrix.point_values)
+        stored.fill(
+            fetch_and_lock_inventory_items([alice.pk, bob.pk], ["Water", "Ammunition"])
+            .values_list("id", "survivor_id", "item_id", "quantity")
+        )
+        assert (stored.quantities == matrix.quantities).all()
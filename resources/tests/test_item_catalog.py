@@ -0,0 +1,62 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+import pytest
+from resources.interface.service.item_catalog import (
+    ITEM_CATALOG_VERSION_KEY,
+    ItemCatalog,
+    item_catalog,
+)
+from resources.models import Item
+
+
+@pytest.mark.django_db
+class TestItemCatalog:
+
+    def test_indexes_items_by_name_and_id(self):
+        catalog = ItemCatalog()
+        water = Item.objects.get(name="Water")
+        assert catalog.get("Water") == water
+        assert catalog.get_by_id(water.pk) == water
+        assert catalog.resolve(["Water", "Gold"]) == {"Water": water}
+
+    def test_unknown_item_raises_does_not_exist(self):
+        with pytest.raises(Item.DoesNotExist):
+            ItemCatalog().get("Gold")
+
+    def test_warm_lookups_do_not_query(self, django_assert_num_queries):
+        catalog = ItemCatalog()
+        catalog.get("Water")
+        with django_assert_num_queries(0):
+            catalog.get("Food")
+            catalog.resolve(["Medication", "Ammunition"])
+
+    def test_async_lookups_use_the_loaded_snapshot(self, django_assert_num_queries):
+        catalog = ItemCatalog()
+        water = async_to_sync(catalog.aget)("Water")
+        with django_assert_num_queries(0):
+            assert async_to_sync(catalog.aget_by_id)(water.pk) == water
+            with pytest.raises(Item.DoesNotExist):
+                async_to_sync(catalog.aget)("Gold")
+        catalog.reset()
+        assert async_to_sync(catalog.aget)("Water") == water
+
+    def test_saving_item_invalidates_shared_catalog(self):
+        item_catalog.get("Water")
+        Item.objects.create(name="Fuel", point_value=5)
+        assert item_catalog.get("Fuel").point_value == 5
+
+    def test_shared_version_is_bumped_on_commit(self, django_capture_on_commit_callbacks):
+        item_catalog.get("Water")
+        version = cache.get(ITEM_CATALOG_VERSION_KEY)
+        with django_capture_on_commit_callbacks(execute=True):
+            Item.objects.create(name="Fuel", point_value=5)
+            assert cache.get(ITEM_CATALOG_VERSION_KEY) == version
+        assert cache.get(ITEM_CATALOG_VERSION_KEY) != version
+
+    def test_other_workers_reload_on_version_change(self):
+        worker = ItemCatalog(check_interval=0)
+        worker.get("Water")
+        Item.objects.filter(name="Water").update(point_value=10)
+        assert worker.get("Water").point_value == 4
+        ItemCatalog().invalidate()
+        assert worker.get("Water").point_value == 10
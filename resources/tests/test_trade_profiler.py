@@ -0,0 +1,88 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+from resources.interface import TradeService
+from resources.interface.service.item_catalog import item_catalog
+from resources.interface.service.trade_profiler import (
+    TRADE_STAGE_QUERIES,
+    NullTradeProfile,
+    TradeProfile,
+    start_trade_profile,
+)
+from resources.models import Item
+
+STAGES = ["health_cache", "lock", "validate", "transfer", "health_live"]
+
+
+@pytest.mark.django_db
+class TestTradeProfiler:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        self.alice = create_survivor(name="Alice")
+        self.bob = create_survivor(name="Bob")
+        create_inventory_item(survivor=self.alice, item=Item.objects.get(name="Medication"),
+                              quantity=50)
+        create_inventory_item(survivor=self.bob, item=Item.objects.get(name="Ammunition"),
+                              quantity=50)
+        TRADE_STAGE_QUERIES.reset()
+        item_catalog.load()
+
+    def _trade(self):
+        TradeService(self.alice.id, self.bob.id,
+                     [{"item": "Ammunition", "quantity": 2}],
+                     [{"item": "Medication", "quantity": 1}]).execute()
+
+    def test_disabled_by_default(self):
+        assert isinstance(start_trade_profile(), NullTradeProfile)
+
+    def test_stage_timers_count_queries(self, settings):
+        settings.TRADE_PROFILE_STAGES = True
+        with CaptureQueriesContext(connection) as queries:
+            self._trade()
+        lines = TRADE_STAGE_QUERIES.render()
+        for stage in STAGES:
+            assert f'zssn_trade_stage_queries_count{{stage="{stage}"}} 1' in lines
+        sums = [float(line.rsplit(" ", 1)[1]) for line in lines
+                if line.startswith("zssn_trade_stage_queries_sum")]
+        assert sum(sums) == len(queries)
+
+    def test_query_wrapper_is_removed_by_identity(self):
+        def opened_connection_wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        wrappers = list(connection.execute_wrappers)
+        profile = TradeProfile()
+        # What the metrics recorder does when the trade opens the connection.
+        connection.execute_wrappers.append(opened_connection_wrapper)
+        profile.finish()
+        assert connection.execute_wrappers == [*wrappers, opened_connection_wrapper]
+        connection.execute_wrappers.remove(opened_connection_wrapper)
+
+    def test_overlapping_captures_are_skipped(self, settings, tmp_path):
+        settings.TRADE_PROFILE_DIR = tmp_path
+        first = TradeProfile(capture=True)
+        second = TradeProfile(capture=True)
+        assert first.capture and not second.capture
+        second.finish()
+        first.finish()
+        third = TradeProfile(capture=True)
+        third.finish()
+        assert third.capture
+
+    def test_slow_trades_are_captured_and_rotated(self, settings, tmp_path, capsys):
+        settings.TRADE_PROFILE_SAMPLE_RATE = 1.0
+        settings.TRADE_PROFILE_SLOW_MS = 0
+        settings.TRADE_PROFILE_DIR = tmp_path
+        settings.TRADE_PROFILE_MAX_FILES = 2
+        for _ in range(3):
+            self._trade()
+        assert len(list(tmp_path.glob("trade-*.json"))) == 2
+        assert len(list(tmp_path.glob("trade-*.prof"))) == 2
+
+        call_command("summarize_trade_profiles", "--dir", str(tmp_path), "--top", "3")
+        output = capsys.readouterr().out
+        assert "2 captured trades" in output
+        assert "[lock]" in output
+        assert "Functions by cumulative time" in output
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 import pytest
 from resources.models import InventoryItem, Item
@@ -69,3 +71,39 @@ class TestTradeService:
         )
         assert alice_has_food.quantity == 2
         assert bob_has_water.quantity == 8
+
+    def test_endpoint_reads_survivors_once(self, client, create_inventory_item):
+        create_inventory_item(survivor=self.bob, item=self.item_a, quantity=5)
+        payload = {
+            "survivor_a": self.alice.id,
+            "survivor_b": self.bob.id,
+            "items_a": [{"item": self.item_b.name, "quantity": 2}],
+            "items_b": [{"item": self.item_a.name, "quantity": 3}],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(reverse("trade-items"), data=payload,
+                                    content_type="application/json")
+        assert response.status_code == 200
+        # Validation loads both survivors; the only other read is the
+        # live infection check after the transfer.
+        survivor_reads = [
+            query["sql"] for query in queries
+            if query["sql"].startswith('SELECT') and 'FROM "survivors_survivor"' in query["sql"]
+        ]
+        assert len(survivor_reads) == 2
+
+    def test_transfer_reuses_locked_inventory(self, django_assert_num_queries):
+        trade = TradeService(
+            survivor_a_id=self.alice.id,
+            survivor_b_id=self.bob.id,
+            items_a=[{"item": self.inventory_b.item.name, "quantity": 2}],
+            items_b=[{"item": self.inventory_a.item.name, "quantity": 3}],
+        )
+        trade.trade_validator.validate()
+        # One bulk update for the givers, then an insert of the receivers'
+        # missing rows and one increment of them.
+        with django_assert_num_queries(3):
+            trade.transfer_service.transfer()
+        assert InventoryItem.objects.get(survivor=self.alice, item=self.item_a).quantity == 2
+        assert InventoryItem.objects.get(survivor=self.bob, item=self.item_b).quantity == 3
+        assert InventoryItem.objects.get(survivor=self.bob, item=self.item_a).quantity == 3
@@ -0,0 +1,25 @@
+import pytest
+from resources.interface import save_inventory_items
+from resources.models import InventoryItem, Item
+
+
+@pytest.mark.django_db
+class TestSaveInventoryItems:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        self.bob = create_survivor(name="Bob", age=35, gender="M")
+        self.water = Item.objects.get(name="Water")
+        self.food = Item.objects.get(name="Food")
+        create_inventory_item(survivor=self.bob, item=self.water, quantity=0)
+
+    def test_concurrent_credits_to_an_empty_row_add_up(self):
+        # Both trades skipped the empty row when locking, so each credits
+        # it as a row of its own.
+        for quantity in (2, 3):
+            save_inventory_items([], [
+                InventoryItem(survivor_id=self.bob.id, item_id=self.water.id, quantity=quantity),
+                InventoryItem(survivor_id=self.bob.id, item_id=self.food.id, quantity=quantity),
+            ])
+        bob = dict(InventoryItem.objects.filter(survivor=self.bob).values_list("item_id", "quantity"))
+        assert bob == {self.water.id: 5, self.food.id: 5}
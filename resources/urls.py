@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import trade_items
+from .views import trade_items, trade_items_batch
 
 urlpatterns = [
     path('trade/', trade_items, name='trade-items'),
+    path('trades/batch/', trade_items_batch, name='trade-items-batch'),
 ]
@@ -1,31 +1,86 @@
-import json
+from asgiref.sync import sync_to_async
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.views.decorators.http import require_http_methods
+from django_server.serialization import SchemaError, convert, decode, json_response, loads
 from resources.interface import TradeService
-from resources.exceptions import TradeError
+from resources.exceptions import TradeConflictError, TradeError
 from resources.forms import TradeForm
+from resources.schemas import TradeBatchRequest
+from survivors.models import Survivor
 
 
 @csrf_exempt
 @require_http_methods(['PATCH'])
-def trade_items(request: HttpRequest) -> JsonResponse:
+async def trade_items(request: HttpRequest) -> HttpResponse:
+    try:
+        data = loads(request.body)
+    except ValueError as e:
+        return json_response({"error": f"Invalid JSON: {str(e)}"}, status=400)
+
     try:
-        data = json.loads(request.body)
         form = TradeForm(data)
-        if not form.is_valid():
-            return JsonResponse({"errors": form.errors}, status=400)
-
-        trade = TradeService(
-            survivor_a_id=form.cleaned_data['survivor_a'],
-            survivor_b_id=form.cleaned_data['survivor_b'],
-            items_a=form.cleaned_data['items_a'],
-            items_b=form.cleaned_data['items_b'],
-        )
-        trade.execute()
+        # Validation and the trade transaction use the sync ORM, so they
+        # run in a worker thread while the event loop stays free.
+        if not await sync_to_async(form.is_valid)():
+            return json_response({"errors": form.errors}, status=400)
+
+        # Reuses the survivors and items loaded during validation.
+        trade = TradeService.from_cleaned_data(form.cleaned_data)
+        await sync_to_async(trade.execute)()
     except TradeError as te:
-        return JsonResponse({"error": str(te)}, status=400)
+        return json_response({"error": str(te)}, status=400)
+    except TradeConflictError as tce:
+        return json_response({"error": str(tce)}, status=409)
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+        return json_response({"error": str(e)}, status=500)
     else:
-        return JsonResponse({"message": "Trade completed"}, status=200)
+        return json_response({"message": "Trade completed"}, status=200)
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+async def trade_items_batch(request: HttpRequest) -> HttpResponse:
+    try:
+        data = decode(request.body, TradeBatchRequest)
+    except SchemaError as e:
+        return json_response({"error": str(e)}, status=400)
+    except ValueError as e:
+        return json_response({"error": f"Invalid JSON: {str(e)}"}, status=400)
+
+    try:
+        results = await sync_to_async(_settle_trades)(data.trades)
+    except TradeConflictError as tce:
+        return json_response({"error": str(tce)}, status=409)
+    except Exception as e:
+        return json_response({"error": str(e)}, status=500)
+    else:
+        return json_response({"results": results}, status=200)
+
+
+def _settle_trades(trades: list) -> list[dict]:
+    # The survivors of every trade are loaded with one query.
+    survivor_ids = set()
+    for payload in trades:
+        if isinstance(payload, dict):
+            for key in ('survivor_a', 'survivor_b'):
+                try:
+                    survivor_ids.add(convert(payload.get(key), int))
+                except SchemaError:
+                    pass
+    survivors = Survivor.objects.in_bulk(survivor_ids)
+
+    results = [None] * len(trades)
+    valid_trades = []
+    valid_positions = []
+    for index, payload in enumerate(trades):
+        form = TradeForm(payload, survivors)
+        if not form.is_valid():
+            results[index] = {"status": "failed", "errors": form.errors}
+            continue
+        valid_trades.append(form.cleaned_data)
+        valid_positions.append(index)
+
+    for index, result in zip(valid_positions, TradeService.execute_many(valid_trades)):
+        results[index] = result
+    return results
@@ -0,0 +1,104 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+# Size of a grid cell in degrees (~5.5 km of latitude). Each survivor
+# stores the id of the cell it is in, see `geo_cell`.
+GEO_CELL_DEGREES = 0.05
+GEO_CELL_COLUMNS = round(360 / GEO_CELL_DEGREES)
+GEO_CELL_ROWS = round(180 / GEO_CELL_DEGREES)
+# Above this many rows of cells a plain latitude range is cheaper than
+# OR-ing one cell range per row.
+MAX_CELL_ROWS = 64
+COORDINATES_OUT_OF_RANGE = 'Latitude or longitude out of range'
+
+
+def _row(latitude: float) -> int:
+    return min(int((latitude + 90) // GEO_CELL_DEGREES), GEO_CELL_ROWS - 1)
+
+
+def _column(longitude: float) -> int:
+    return min(int((longitude + 180) // GEO_CELL_DEGREES), GEO_CELL_COLUMNS - 1)
+
+
+def coordinates_in_range(latitude: float, longitude: float) -> bool:
+    """
+    Whether the coordinates are a valid position. Checked before
+    anything stores a position, since `geo_cell` clamps instead of
+    failing.
+    """
+    return -90 <= latitude <= 90 and -180 <= longitude <= 180
+
+
+def geo_cell(latitude: float, longitude: float) -> int:
+    """
+    Returns the id of the grid cell containing the coordinates. Cells are
+    numbered row by row, so the cells of one row form a contiguous range.
+    """
+    return _row(latitude) * GEO_CELL_COLUMNS + _column(longitude)
+
+
+def bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+) -> tuple[tuple[float, float], list[tuple[float, float]]]:
+    """
+    Returns the latitude range and the longitude ranges (split at the
+    antimeridian) that contain every point within `radius_km`.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 90.0 or radius_km >= math.pi * EARTH_RADIUS_KM / 2:
+        return (min_lat, max_lat), [(-180.0, 180.0)]
+
+    delta_lon = delta_lat / math.cos(math.radians(widest))
+    if delta_lon >= 180.0:
+        return (min_lat, max_lat), [(-180.0, 180.0)]
+    min_lon = longitude - delta_lon
+    max_lon = longitude + delta_lon
+    if min_lon < -180.0:
+        return (min_lat, max_lat), [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return (min_lat, max_lat), [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return (min_lat, max_lat), [(min_lon, max_lon)]
+
+
+def cell_ranges(
+    latitude_range: tuple[float, float],
+    longitude_ranges: list[tuple[float, float]],
+) -> list[tuple[int, int]] | None:
+    """
+    Returns the inclusive `geo_cell` ranges covering a bounding box, or
+    None when the box spans too many rows for cell ranges to help.
+    """
+    first_row, last_row = _row(latitude_range[0]), _row(latitude_range[1])
+    if last_row - first_row + 1 > MAX_CELL_ROWS:
+        return None
+    columns = [(_column(low), _column(high)) for low, high in longitude_ranges]
+    return [
+        (row * GEO_CELL_COLUMNS + first, row * GEO_CELL_COLUMNS + last)
+        for row in range(first_row, last_row + 1)
+        for first, last in columns
+    ]
+
+
+def haversine_km(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+) -> np.ndarray:
+    """
+    Great-circle distances in km from one point to arrays of points.
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = np.radians(longitudes - longitude) / 2
+    a = np.sin(half_dlat) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(half_dlon) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
@@ -0,0 +1,88 @@
+import threading
+
+from django.core.cache import cache
+
+SURVIVOR_CACHE_KEY = 'survivor_cache_key'
+
+
+def infection_cache_key(survivor_id: int) -> str:
+    return f'{SURVIVOR_CACHE_KEY}_{survivor_id}'
+
+
+class InfectionBitmap:
+    """
+    Compact bitset of survivor ids, one bit per id.
+    """
+    def __init__(self) -> None:
+        self._bits = bytearray()
+        self._lock = threading.Lock()
+
+    def __contains__(self, survivor_id: int) -> bool:
+        byte, bit = divmod(survivor_id, 8)
+        bits = self._bits
+        return byte < len(bits) and bool(bits[byte] >> bit & 1)
+
+    def __len__(self) -> int:
+        return sum(bin(byte).count('1') for byte in self._bits)
+
+    def add(self, survivor_id: int) -> None:
+        byte, bit = divmod(survivor_id, 8)
+        with self._lock:
+            if byte >= len(self._bits):
+                self._bits.extend(bytes(byte + 1 - len(self._bits)))
+            self._bits[byte] |= 1 << bit
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bits = bytearray()
+
+
+class InfectionIndex:
+    """
+    Worker-local index of infected survivors backed by shared cache flags.
+    Infection is permanent, so a set bit never needs to be revisited:
+    lookups are answered from the in-memory bitmap, and only ids that are
+    not known to be infected are looked up in the shared cache with a
+    single `get_many`. Shared flags are plain booleans rather than
+    pickled `Survivor` instances.
+    Methods:
+        mark_infected(survivor_ids):
+            Sets the local bits and publishes the shared flags.
+        infected(survivor_ids):
+            Returns the ids among `survivor_ids` known to be infected.
+        is_infected(survivor_id):
+            Returns whether a single survivor is known to be infected.
+    """
+    def __init__(self) -> None:
+        self.bitmap = InfectionBitmap()
+
+    def mark_infected(self, survivor_ids) -> None:
+        survivor_ids = list(survivor_ids)
+        for survivor_id in survivor_ids:
+            self.bitmap.add(survivor_id)
+        if survivor_ids:
+            cache.set_many(
+                {infection_cache_key(survivor_id): True for survivor_id in survivor_ids},
+                timeout=None,
+            )
+
+    def infected(self, survivor_ids) -> list[int]:
+        infected = []
+        unknown = {}
+        for survivor_id in survivor_ids:
+            if survivor_id in self.bitmap:
+                infected.append(survivor_id)
+            else:
+                unknown[infection_cache_key(survivor_id)] = survivor_id
+        if unknown:
+            for key, flag in cache.get_many(list(unknown)).items():
+                if flag:
+                    self.bitmap.add(unknown[key])
+                    infected.append(unknown[key])
+        return infected
+
+    def is_infected(self, survivor_id: int) -> bool:
+        return bool(self.infected([survivor_id]))
+
+
+infection_index = InfectionIndex()
@@ -0,0 +1,17 @@
+from .crud.create_survivors import create_survivors
+from .crud.update_survivors import (
+    amove_survivor,
+    move_survivor,
+    move_survivors,
+    record_infection_report,
+    record_infection_reports,
+)
+
+__all__ = [
+    'amove_survivor',
+    'create_survivors',
+    'move_survivor',
+    'move_survivors',
+    'record_infection_report',
+    'record_infection_reports',
+]
@@ -0,0 +1,39 @@
+from django.db.transaction import atomic
+
+from reports.interface.crud.update_statistics import record_registrations
+from resources.models import InventoryItem
+from survivors.geo import geo_cell
+from survivors.models import Survivor
+
+
+def create_survivors(
+    survivors: list[Survivor],
+    inventories: list[list[InventoryItem]],
+    using: str = 'default',
+) -> list[Survivor]:
+    """
+    Inserts a chunk of survivors and their inventories with one
+    `bulk_create` per table. `inventories[i]` holds the unsaved inventory
+    rows of `survivors[i]`. The running statistics are updated in the
+    same transaction.
+    `bulk_create` sends no post_save, so the receivers in
+    survivors.signals do not run. Neither has work here: a new survivor
+    is never infected, and its fresh primary key has no cached profile.
+    """
+    for survivor in survivors:
+        # bulk_create bypasses Survivor.save(), which maintains the grid cell.
+        survivor.geo_cell = geo_cell(survivor.latitude, survivor.longitude)
+    with atomic(using=using):
+        created = Survivor.objects.using(using).bulk_create(survivors)
+        inventory_items = []
+        for survivor, inventory in zip(created, inventories):
+            for inventory_item in inventory:
+                inventory_item.survivor_id = survivor.pk
+                inventory_items.append(inventory_item)
+        InventoryItem.objects.using(using).bulk_create(inventory_items)
+        quantities = {}
+        for inventory_item in inventory_items:
+            quantities[inventory_item.item_id] = (
+                quantities.get(inventory_item.item_id, 0) + inventory_item.quantity)
+        record_registrations(len(created), quantities, using=using)
+    return created
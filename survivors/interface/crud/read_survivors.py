@@ -0,0 +1,76 @@
+from functools import reduce
+from operator import or_
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Prefetch, Q, QuerySet
+
+from django_server.db_router import read_only
+from resources.models import InventoryItem
+from survivors.geo import bounding_box, cell_ranges
+from survivors.models import Survivor
+
+
+def survivors_in_bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+) -> QuerySet[Survivor]:
+    """
+    Survivors inside the bounding box of a circle. Rows are narrowed down
+    through the indexed `geo_cell` column before the coordinates are
+    compared, so only candidates close to the circle are read.
+    """
+    latitude_range, longitude_ranges = bounding_box(latitude, longitude, radius_km)
+    queryset = Survivor.objects.filter(
+        latitude__range=latitude_range,
+    ).filter(reduce(or_, (
+        Q(longitude__range=longitude_range) for longitude_range in longitude_ranges
+    )))
+    if ranges := cell_ranges(latitude_range, longitude_ranges):
+        queryset = queryset.filter(reduce(or_, (
+            Q(geo_cell__range=cell_range) for cell_range in ranges
+        )))
+    return read_only(queryset)
+
+
+def survivor_profile_rows(survivor_id: int) -> QuerySet:
+    """
+    A survivor and their inventory in one query: one row per inventory
+    item (or a single row with NULL item for an empty inventory).
+    Always read from the primary: the profile built from these rows is
+    cached until the survivor's next write, so a lagging replica would
+    keep it stale.
+    """
+    return Survivor.objects.using(DEFAULT_DB_ALIAS).filter(pk=survivor_id).values_list(
+        'pk', 'name', 'age', 'gender', 'latitude', 'longitude', 'is_infected',
+        'inventoryitem__item_id', 'inventoryitem__quantity',
+    )
+
+
+def survivors_after(
+    after_id: int,
+    is_infected: bool | None = None,
+    gender: str | None = None,
+    with_inventory: bool = False,
+) -> QuerySet[Survivor]:
+    """
+    Survivors with an id greater than `after_id`, in id order. Seeking on
+    the primary key instead of using OFFSET keeps every page equally
+    cheap. With `with_inventory` the inventory rows of a page are fetched
+    by one extra query.
+    """
+    queryset = Survivor.objects.filter(pk__gt=after_id).only(
+        'pk', 'name', 'age', 'gender', 'latitude', 'longitude', 'is_infected',
+    ).order_by('pk')
+    if is_infected is not None:
+        # `is_infected=True` is rendered as a bare column on SQLite, which
+        # cannot seek the (is_infected, id) index; IN compares the value.
+        queryset = queryset.filter(is_infected__in=[is_infected])
+    if gender is not None:
+        queryset = queryset.filter(gender=gender)
+    if with_inventory:
+        queryset = queryset.prefetch_related(Prefetch(
+            'inventoryitem_set',
+            queryset=InventoryItem.objects.only('survivor', 'item', 'quantity').order_by('item'),
+        ))
+    return read_only(queryset)
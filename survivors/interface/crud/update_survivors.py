@@ -0,0 +1,165 @@
+from django.db import IntegrityError
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.transaction import atomic, on_commit
+
+from reports.interface.crud.update_statistics import record_infections
+from survivors.geo import COORDINATES_OUT_OF_RANGE, coordinates_in_range, geo_cell
+from survivors.infection_index import infection_index
+from survivors.models import InfectionReport, Survivor
+from survivors.profile_cache import ainvalidate_profiles, invalidate_profiles
+
+INFECTION_REPORT_THRESHOLD = 3
+# SQLite caps the number of query parameters, so very large flushes are
+# split into UPDATEs of this many rows.
+LOCATION_BATCH_SIZE = 2000
+
+
+def record_infection_report(reporter_id: int, reported_id: int) -> bool:
+    """
+    Stores a report and bumps the reported survivor's `report_count`.
+    The survivor is flagged as infected in the same transaction once the
+    count reaches INFECTION_REPORT_THRESHOLD, so concurrent reports can
+    never both miss the threshold.
+    Returns False if the reporter had already reported this survivor.
+    """
+    with atomic():
+        try:
+            with atomic():
+                InfectionReport.objects.create(
+                    reporter_id=reporter_id,
+                    reported_id=reported_id,
+                )
+        except IntegrityError:
+            return False
+
+        Survivor.objects.filter(pk=reported_id).update(
+            report_count=F('report_count') + 1,
+        )
+        # The flip is its own UPDATE so its rowcount tells whether this
+        # report infected the survivor. The UPDATE above holds the row
+        # lock, so exactly one report sees the survivor cross the
+        # threshold, and a survivor that was already infected is never
+        # counted again.
+        if Survivor.objects.filter(
+            pk=reported_id,
+            is_infected=False,
+            report_count__gte=INFECTION_REPORT_THRESHOLD,
+        ).update(is_infected=True):
+            record_infections([reported_id])
+            on_commit(lambda: infection_index.mark_infected([reported_id]))
+            invalidate_profiles([reported_id])
+    return True
+
+
+def record_infection_reports(pairs: list[tuple[int, int]]) -> set[tuple[int, int]]:
+    """
+    Stores many (reporter_id, reported_id) reports at once.
+    Reports are inserted with one `bulk_create`, the affected survivors'
+    `report_count` is recomputed with one UPDATE and everybody who
+    reached INFECTION_REPORT_THRESHOLD is flagged with one more UPDATE.
+    Returns the pairs that were not reported before.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return set()
+
+    reporter_ids = {reporter_id for reporter_id, _ in pairs}
+    reported_ids = {reported_id for _, reported_id in pairs}
+    with atomic():
+        existing = set(InfectionReport.objects.filter(
+            reporter_id__in=reporter_ids,
+            reported_id__in=reported_ids,
+        ).values_list('reporter_id', 'reported_id'))
+        new_pairs = pairs - existing
+        InfectionReport.objects.bulk_create(
+            [
+                InfectionReport(reporter_id=reporter_id, reported_id=reported_id)
+                for reporter_id, reported_id in sorted(new_pairs)
+            ],
+            ignore_conflicts=True,
+        )
+
+        # Recount rather than increment so reports inserted concurrently
+        # by other requests are not counted twice.
+        affected_ids = sorted({reported_id for _, reported_id in new_pairs})
+        report_counts = InfectionReport.objects.filter(
+            reported=OuterRef('pk'),
+        ).order_by().values('reported').annotate(total=Count('pk')).values('total')
+        Survivor.objects.filter(pk__in=affected_ids).update(
+            report_count=Coalesce(Subquery(report_counts), 0),
+        )
+
+        # Locked, so a concurrent batch that flags the same survivor
+        # waits for this one and then no longer finds it healthy.
+        newly_infected = list(Survivor.objects.select_for_update().filter(
+            pk__in=affected_ids,
+            is_infected=False,
+            report_count__gte=INFECTION_REPORT_THRESHOLD,
+        ).order_by('pk').values_list('pk', flat=True))
+        if newly_infected:
+            Survivor.objects.filter(pk__in=newly_infected).update(is_infected=True)
+            record_infections(newly_infected)
+            on_commit(lambda: infection_index.mark_infected(newly_infected))
+            invalidate_profiles(newly_infected)
+    return new_pairs
+
+
+def move_survivor(survivor_id: int, latitude: float, longitude: float) -> bool:
+    """
+    Updates a survivor's coordinates without reading the row first.
+    Returns False if the survivor does not exist. Raises ValueError for
+    coordinates out of range.
+    """
+    if not coordinates_in_range(latitude, longitude):
+        raise ValueError(COORDINATES_OUT_OF_RANGE)
+    updated = Survivor.objects.filter(pk=survivor_id).update(
+        latitude=latitude,
+        longitude=longitude,
+        geo_cell=geo_cell(latitude, longitude),
+    )
+    invalidate_profiles([survivor_id])
+    return bool(updated)
+
+
+async def amove_survivor(survivor_id: int, latitude: float, longitude: float) -> bool:
+    """
+    Async version of `move_survivor`.
+    """
+    if not coordinates_in_range(latitude, longitude):
+        raise ValueError(COORDINATES_OUT_OF_RANGE)
+    updated = await Survivor.objects.filter(pk=survivor_id).aupdate(
+        latitude=latitude,
+        longitude=longitude,
+        geo_cell=geo_cell(latitude, longitude),
+    )
+    await ainvalidate_profiles([survivor_id])
+    return bool(updated)
+
+
+def move_survivors(locations: dict[int, tuple[float, float]]) -> int:
+    """
+    Writes the coordinates of many survivors with one bulk UPDATE that
+    only touches the location columns. Unknown ids are ignored.
+    Raises ValueError, before writing anything, if a position is out of
+    range.
+    """
+    if not locations:
+        return 0
+    if not all(coordinates_in_range(*position) for position in locations.values()):
+        raise ValueError(COORDINATES_OUT_OF_RANGE)
+    updated = Survivor.objects.bulk_update(
+        [
+            Survivor(
+                pk=survivor_id,
+                latitude=latitude,
+                longitude=longitude,
+                geo_cell=geo_cell(latitude, longitude),
+            )
+            for survivor_id, (latitude, longitude) in sorted(locations.items())
+        ],
+        ['latitude', 'longitude', 'geo_cell'],
+        batch_size=LOCATION_BATCH_SIZE,
+    )
+    invalidate_profiles(locations)
+    return updated
@@ -0,0 +1,92 @@
+from collections.abc import AsyncIterator, Iterator
+
+from django_server.serialization import dumps
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import Item
+from survivors.interface.crud.read_survivors import survivors_after
+from survivors.models import Survivor
+
+LISTING_DEFAULT_LIMIT = 100
+LISTING_MAX_LIMIT = 1000
+
+
+def survivor_page(
+    after_id: int = 0,
+    limit: int = LISTING_DEFAULT_LIMIT,
+    is_infected: bool | None = None,
+    gender: str | None = None,
+    with_inventory: bool = False,
+) -> tuple[list[Survivor], int | None]:
+    """
+    Returns up to `limit` survivors after the cursor `after_id` and the
+    cursor of the next page, or None on the last page. One row more than
+    requested is read to tell whether another page exists.
+    """
+    survivors = list(survivors_after(
+        after_id, is_infected=is_infected, gender=gender, with_inventory=with_inventory,
+    )[:limit + 1])
+    if len(survivors) > limit:
+        survivors = survivors[:limit]
+        return survivors, survivors[-1].pk
+    return survivors, None
+
+
+def iter_page_json(
+    survivors: list[Survivor],
+    next_cursor: int | None,
+    with_inventory: bool = False,
+) -> Iterator[bytes]:
+    """
+    Encodes a page one survivor at a time, so a large page is written to
+    the client without building the whole body in memory. The item
+    catalog is resolved when this is called, not when the first chunk is
+    produced.
+    """
+    return _page_chunks(survivors, next_cursor, item_catalog.by_id if with_inventory else None)
+
+
+def aiter_page_json(
+    survivors: list[Survivor],
+    next_cursor: int | None,
+    with_inventory: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    `iter_page_json` as an async iterator. Under ASGI a sync iterator is
+    consumed whole in a worker thread before anything is sent, so the
+    page is only streamed when handed over this way. Call it from the
+    view so the catalog is never loaded on the event loop.
+    """
+    return _async_chunks(iter_page_json(survivors, next_cursor, with_inventory))
+
+
+async def _async_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _page_chunks(
+    survivors: list[Survivor],
+    next_cursor: int | None,
+    items_by_id: dict[int, Item] | None,
+) -> Iterator[bytes]:
+    yield b'{"results": ['
+    for index, survivor in enumerate(survivors):
+        entry = {
+            'id': survivor.pk,
+            'name': survivor.name,
+            'age': survivor.age,
+            'gender': survivor.gender,
+            'latitude': survivor.latitude,
+            'longitude': survivor.longitude,
+            'infected': survivor.is_infected,
+        }
+        if items_by_id is not None:
+            entry['inventory'] = [
+                {
+                    'item': items_by_id[inventory_item.item_id].name,
+                    'quantity': inventory_item.quantity,
+                }
+                for inventory_item in survivor.inventoryitem_set.all()
+            ]
+        yield (b', ' if index else b'') + dumps(entry)
+    yield b'], "next_cursor": ' + dumps(next_cursor) + b'}'
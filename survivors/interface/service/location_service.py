@@ -0,0 +1,92 @@
+import threading
+
+from django.db import connection
+
+from survivors.geo import COORDINATES_OUT_OF_RANGE, coordinates_in_range
+from survivors.interface.crud.update_survivors import move_survivors
+
+# Pings received within this many seconds are written together.
+LOCATION_FLUSH_INTERVAL = 2.0
+# A flush is forced once this many survivors have a pending position.
+LOCATION_FLUSH_MAX_PENDING = 5000
+
+
+class LocationCoalescer:
+    """
+    Buffers location pings and writes them in batches.
+    Only the latest position of each survivor inside a flush window is
+    kept, and every flush is a single bulk UPDATE of the location
+    columns. A timer flushes the window in the background; with a
+    `flush_interval` of 0 every `add()` is written synchronously.
+    Positions of a failed flush are buffered again, unless a newer ping
+    arrived meanwhile, and retried in the next window. Gunicorn workers
+    flush on exit (see gunicorn.conf.py); positions still buffered when
+    a process is killed are lost.
+    Attributes:
+        flush_interval (float): Length of the flush window in seconds.
+        max_pending (int): Pending survivors that force an early flush.
+    Methods:
+        add(pings):
+            Buffers (survivor_id, latitude, longitude) pings in order.
+            Raises ValueError if any position is out of range.
+        flush():
+            Writes every pending position and returns the rows updated.
+    """
+    def __init__(
+        self,
+        flush_interval: float = LOCATION_FLUSH_INTERVAL,
+        max_pending: int = LOCATION_FLUSH_MAX_PENDING,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: dict[int, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def add(self, pings) -> int:
+        pings = list(pings)
+        # Rejected up front: a bad position would fail every retry.
+        if not all(coordinates_in_range(latitude, longitude) for _, latitude, longitude in pings):
+            raise ValueError(COORDINATES_OUT_OF_RANGE)
+        with self._lock:
+            for survivor_id, latitude, longitude in pings:
+                self._pending[survivor_id] = (latitude, longitude)
+            pending = len(self._pending)
+            due = not self.flush_interval or pending >= self.max_pending
+            if not due:
+                self._schedule()
+        if due:
+            self.flush()
+        return pending
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        try:
+            return move_survivors(pending)
+        except Exception:
+            with self._lock:
+                for survivor_id, position in pending.items():
+                    self._pending.setdefault(survivor_id, position)
+                self._schedule()
+            raise
+
+    def _schedule(self) -> None:
+        # Called with the lock held.
+        if self._timer is None and self.flush_interval:
+            self._timer = threading.Timer(self.flush_interval, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        finally:
+            # Timer threads get their own connection; do not leak it.
+            connection.close()
+
+
+location_coalescer = LocationCoalescer()
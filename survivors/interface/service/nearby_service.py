@@ -0,0 +1,65 @@
+import heapq
+
+import numpy as np
+
+from survivors.geo import haversine_km
+from survivors.interface.crud.read_survivors import survivors_in_bounding_box
+
+NEARBY_CHUNK_SIZE = 10000
+NEARBY_DEFAULT_LIMIT = 100
+
+
+def nearby_survivors(
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int = NEARBY_DEFAULT_LIMIT,
+) -> list[dict]:
+    """
+    Returns up to `limit` survivors within `radius_km` of a point, closest
+    first. Candidates come from the indexed bounding-box query and are
+    refined with a vectorized haversine distance, one chunk at a time.
+    """
+    candidates = survivors_in_bounding_box(latitude, longitude, radius_km).values_list(
+        'id', 'name', 'latitude', 'longitude', 'is_infected',
+    ).iterator(chunk_size=NEARBY_CHUNK_SIZE)
+
+    closest = []
+    chunk = []
+    for row in candidates:
+        chunk.append(row)
+        if len(chunk) >= NEARBY_CHUNK_SIZE:
+            closest = _closest(closest, chunk, latitude, longitude, radius_km, limit)
+            chunk = []
+    if chunk:
+        closest = _closest(closest, chunk, latitude, longitude, radius_km, limit)
+
+    return [
+        {
+            'id': survivor_id,
+            'name': name,
+            'latitude': lat,
+            'longitude': lon,
+            'infected': is_infected,
+            'distance_km': round(distance, 3),
+        }
+        for distance, (survivor_id, name, lat, lon, is_infected) in closest
+    ]
+
+
+def _closest(
+    closest: list,
+    chunk: list[tuple],
+    latitude: float,
+    longitude: float,
+    radius_km: float,
+    limit: int,
+) -> list:
+    latitudes = np.fromiter((row[2] for row in chunk), dtype=np.float64, count=len(chunk))
+    longitudes = np.fromiter((row[3] for row in chunk), dtype=np.float64, count=len(chunk))
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    within = np.flatnonzero(distances <= radius_km)
+    if len(within) > limit:
+        within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+    matches = [(float(distances[i]), chunk[i]) for i in within]
+    return heapq.nsmallest(limit, closest + matches, key=lambda match: match[0])
@@ -0,0 +1,65 @@
+import uuid
+
+from django.core.cache import cache
+
+from django_server.serialization import dumps
+from resources.interface.service.item_catalog import item_catalog
+from survivors.interface.crud.read_survivors import survivor_profile_rows
+from survivors.models import Survivor
+from survivors.profile_cache import profile_body_key, profile_version_key
+
+
+def profile_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+async def aprofile(survivor_id: int, if_none_match: str | None) -> tuple[bytes | None, str]:
+    """
+    Returns the serialized profile and its ETag. The body is None when
+    `if_none_match` already matches the current version, which is
+    answered from the cache alone. Raises Survivor.DoesNotExist.
+    """
+    version_key = profile_version_key(survivor_id)
+    body_key = profile_body_key(survivor_id)
+    cached = await cache.aget_many([version_key, body_key])
+    version = cached.get(version_key)
+    if version is None:
+        version = await cache.aget_or_set(version_key, uuid.uuid4().hex, timeout=None)
+    etag = profile_etag(version)
+
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(',')):
+        return None, etag
+
+    entry = cached.get(body_key)
+    if entry is not None and entry[0] == version:
+        return entry[1], etag
+
+    body = await _abuild_profile(survivor_id)
+    await cache.aset(body_key, (version, body), timeout=None)
+    return body, etag
+
+
+async def _abuild_profile(survivor_id: int) -> bytes:
+    profile = None
+    inventory = []
+    async for row in survivor_profile_rows(survivor_id):
+        (pk, name, age, gender, latitude, longitude, is_infected, item_id, quantity) = row
+        if profile is None:
+            profile = {
+                'id': pk,
+                'name': name,
+                'age': age,
+                'gender': gender,
+                'latitude': latitude,
+                'longitude': longitude,
+                'inventory': inventory,
+                'infected': is_infected,
+            }
+        if item_id is not None:
+            inventory.append({
+                'item': (await item_catalog.aget_by_id(item_id)).name,
+                'quantity': quantity,
+            })
+    if profile is None:
+        raise Survivor.DoesNotExist
+    return dumps(profile)
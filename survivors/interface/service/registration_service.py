@@ -0,0 +1,214 @@
+import codecs
+import json
+import time
+from collections.abc import Iterator
+from typing import IO
+
+from django.conf import settings
+
+from django_server.serialization import SchemaError, convert
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import InventoryItem, Item
+from survivors.geo import COORDINATES_OUT_OF_RANGE, coordinates_in_range
+from survivors.interface.crud.create_survivors import create_survivors
+from survivors.models import Survivor
+from survivors.schemas import RegisterSurvivorRequest
+
+REGISTRATION_CHUNK_SIZE = 1000
+READ_SIZE = 64 * 1024
+# Longest single record, in characters, that is buffered while waiting for
+# the rest of it.
+MAX_RECORD_SIZE = 1024 * 1024
+# A value cut off by a read fails to parse at most this close to the end
+# of the buffer (e.g. in the middle of `-Infinity` or a `\uXXXX` escape).
+# Errors further from the end are malformed input, not truncation.
+_TRUNCATION_WINDOW = 16
+# Only the first errors are kept so memory stays bounded on bad input.
+MAX_REPORTED_ERRORS = 100
+
+NAME_MAX_LENGTH = Survivor._meta.get_field('name').max_length
+
+_decoder = json.JSONDecoder()
+_SEPARATORS = ' \t\r\n,'
+
+
+class RegistrationError(Exception):
+    pass
+
+
+def iter_json_records(
+    stream: IO,
+    read_size: int = READ_SIZE,
+    max_record_size: int = MAX_RECORD_SIZE,
+) -> Iterator:
+    """
+    Yields the values of a JSON array or of JSON lines one at a time,
+    reading `stream` incrementally instead of loading the whole payload.
+    Raises JSONDecodeError as soon as a value is malformed or longer than
+    `max_record_size` characters.
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    in_array = None
+    eof = False
+    while True:
+        # Skip separators between values and the array brackets.
+        while position < len(buffer):
+            char = buffer[position]
+            if char in _SEPARATORS:
+                position += 1
+            elif char == '[' and in_array is None:
+                in_array = True
+                position += 1
+            elif char == ']' and in_array:
+                return
+            else:
+                if in_array is None:
+                    in_array = False
+                break
+
+        if position < len(buffer):
+            try:
+                value, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if eof or not _truncated(e, len(buffer)):
+                    raise
+                if len(buffer) - position > max_record_size:
+                    raise json.JSONDecodeError('Record too large', buffer, position)
+            else:
+                # A value that ends exactly at the end of the buffer may be
+                # a truncated number; read on unless the input is done.
+                if end < len(buffer) or eof:
+                    yield value
+                    position = end
+                    continue
+
+        if eof:
+            if in_array:
+                raise json.JSONDecodeError('Unterminated array', buffer, position)
+            return
+
+        chunk = stream.read(read_size)
+        eof = not chunk
+        if isinstance(chunk, bytes):
+            chunk = utf8.decode(chunk, final=eof)
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def _truncated(error: json.JSONDecodeError, length: int) -> bool:
+    """
+    Whether a decode error may come from a value cut off at the end of
+    the buffer. Unterminated strings are reported at their opening quote.
+    """
+    return (
+        error.msg.startswith('Unterminated string')
+        or length - error.pos <= _TRUNCATION_WINDOW
+    )
+
+
+def build_survivor(record: dict) -> tuple[Survivor, list[InventoryItem]]:
+    """
+    Validates one registration record and returns the unsaved survivor
+    and inventory rows. The record is converted with the same schema as
+    a single registration. Raises RegistrationError for invalid records.
+    """
+    try:
+        data = convert(record, RegisterSurvivorRequest)
+    except SchemaError as e:
+        raise RegistrationError(str(e))
+
+    if not data.name or len(data.name) > NAME_MAX_LENGTH:
+        raise RegistrationError(f'Name must be a string of 1 to {NAME_MAX_LENGTH} characters')
+    if data.age < 0:
+        raise RegistrationError('Age must be a non-negative integer')
+    if data.gender not in Survivor.GenderChoices.values:
+        raise RegistrationError('Invalid gender')
+    if not coordinates_in_range(data.latitude, data.longitude):
+        raise RegistrationError(COORDINATES_OUT_OF_RANGE)
+    try:
+        inventory = [
+            InventoryItem(item_id=item_catalog.get(entry.item).pk, quantity=entry.quantity)
+            for entry in data.inventory
+        ]
+    except Item.DoesNotExist:
+        raise RegistrationError('Invalid item in inventory')
+    if any(inventory_item.quantity < 0 for inventory_item in inventory):
+        raise RegistrationError('Quantity must be a non-negative integer')
+    # A survivor holds one row per item; a repeated item would fail the
+    # whole chunk's insert.
+    if len({inventory_item.item_id for inventory_item in inventory}) < len(inventory):
+        raise RegistrationError('Duplicate item in inventory')
+
+    survivor = Survivor(
+        name=data.name,
+        age=data.age,
+        gender=data.gender,
+        latitude=data.latitude,
+        longitude=data.longitude,
+    )
+    return survivor, inventory
+
+
+class BulkRegistrationService:
+    """
+    Registers survivors streamed from a JSON array or JSON lines input.
+    Records are parsed one at a time and inserted in chunks, so memory
+    use depends on the chunk size and not on the size of the input.
+    Attributes:
+        stream (IO): Binary or text stream with the registration records.
+        chunk_size (int): Number of survivors inserted per transaction.
+        using (str): Database alias, the batch connection pool by default.
+    Methods:
+        run():
+            Ingests the stream and returns throughput statistics.
+    """
+    def __init__(
+        self,
+        stream: IO,
+        chunk_size: int = REGISTRATION_CHUNK_SIZE,
+        using: str | None = None,
+    ) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.using = using or settings.BATCH_DATABASE
+        self.created = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def run(self) -> dict:
+        started = time.perf_counter()
+        survivors = []
+        inventories = []
+        for index, record in enumerate(iter_json_records(self.stream)):
+            try:
+                survivor, inventory = build_survivor(record)
+            except RegistrationError as re:
+                self._reject(index, str(re))
+                continue
+            survivors.append(survivor)
+            inventories.append(inventory)
+            if len(survivors) >= self.chunk_size:
+                self._flush(survivors, inventories)
+                survivors, inventories = [], []
+        if survivors:
+            self._flush(survivors, inventories)
+
+        elapsed = time.perf_counter() - started
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'elapsed_seconds': round(elapsed, 3),
+            'survivors_per_second': round(self.created / elapsed, 1) if elapsed else None,
+        }
+
+    def _reject(self, index: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'index': index, 'error': error})
+
+    def _flush(self, survivors: list[Survivor], inventories: list[list]) -> None:
+        create_survivors(survivors, inventories, using=self.using)
+        self.created += len(survivors)
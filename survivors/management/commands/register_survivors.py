@@ -0,0 +1,40 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from survivors.interface.service.registration_service import (
+    REGISTRATION_CHUNK_SIZE,
+    BulkRegistrationService,
+)
+
+
+class Command(BaseCommand):
+    help = 'Registers survivors from a JSON array or JSON lines file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' to read from stdin.")
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REGISTRATION_CHUNK_SIZE,
+            help='Number of survivors inserted per transaction.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            if path == '-':
+                stats = BulkRegistrationService(sys.stdin.buffer, options['chunk_size']).run()
+            else:
+                with open(path, 'rb') as stream:
+                    stats = BulkRegistrationService(stream, options['chunk_size']).run()
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in stats['errors']:
+            self.stderr.write(f"Record {error['index']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {stats['created']} survivors ({stats['failed']} failed) "
+            f"in {stats['elapsed_seconds']}s, "
+            f"{stats['survivors_per_second']} survivors/s"
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def backfill_report_count(apps, schema_editor):
+    Survivor = apps.get_model('survivors', 'Survivor')
+    InfectionReport = apps.get_model('survivors', 'InfectionReport')
+    counts = InfectionReport.objects.filter(
+        reported=OuterRef('pk')
+    ).order_by().values('reported').annotate(total=Count('pk')).values('total')
+    Survivor.objects.filter(reports_received__isnull=False).distinct().update(
+        report_count=Subquery(counts)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survivor',
+            name='report_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_report_count, reverse_code=migrations.RunPython.noop),
+    ]
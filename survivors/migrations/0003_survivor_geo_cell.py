@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:39
+
+from django.db import migrations, models
+
+# A frozen copy of survivors.geo.geo_cell as of this migration, so later
+# changes to the grid do not change what the backfill writes.
+GEO_CELL_DEGREES = 0.05
+GEO_CELL_COLUMNS = 7200
+GEO_CELL_ROWS = 3600
+
+
+def geo_cell(latitude, longitude):
+    row = min(int((latitude + 90) // GEO_CELL_DEGREES), GEO_CELL_ROWS - 1)
+    column = min(int((longitude + 180) // GEO_CELL_DEGREES), GEO_CELL_COLUMNS - 1)
+    return row * GEO_CELL_COLUMNS + column
+
+
+def backfill_geo_cell(apps, schema_editor):
+    Survivor = apps.get_model('survivors', 'Survivor')
+    batch = []
+    for survivor in Survivor.objects.only('latitude', 'longitude').iterator(chunk_size=2000):
+        survivor.geo_cell = geo_cell(survivor.latitude, survivor.longitude)
+        batch.append(survivor)
+        if len(batch) >= 2000:
+            Survivor.objects.bulk_update(batch, ['geo_cell'])
+            batch = []
+    if batch:
+        Survivor.objects.bulk_update(batch, ['geo_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivors', '0002_survivor_report_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survivor',
+            name='geo_cell',
+            field=models.BigIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_geo_cell, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivors', '0003_survivor_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='survivor',
+            index=models.Index(fields=['is_infected', 'id'], name='survivor_infected_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survivor',
+            index=models.Index(fields=['gender', 'id'], name='survivor_gender_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survivor',
+            index=models.Index(fields=['is_infected', 'gender', 'id'], name='survivor_inf_gender_id_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from survivors.geo import geo_cell
+
 
 class Survivor(models.Model):
     class GenderChoices(models.TextChoices):
@@ -15,7 +17,29 @@ class Survivor(models.Model):
     # since it is not a requirement, we will use float for the sake of simplicity
     latitude = models.FloatField()
     longitude = models.FloatField()
+    # Indexed grid cell of (latitude, longitude), see `survivors.geo`. It is
+    # kept in sync by `save()`; bulk writes must set it themselves.
+    geo_cell = models.BigIntegerField(default=0, db_index=True)
     is_infected = models.BooleanField(default=False)
+    # Denormalized number of InfectionReport rows received, maintained with
+    # F() increments so reporting never has to count the reports table.
+    report_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        # Filtered listing pages seek on the id after an equality filter;
+        # these indexes end in the id so such a page reads only its rows.
+        indexes = [
+            models.Index(fields=['is_infected', 'id'], name='survivor_infected_id_idx'),
+            models.Index(fields=['gender', 'id'], name='survivor_gender_id_idx'),
+            models.Index(fields=['is_infected', 'gender', 'id'], name='survivor_inf_gender_id_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = geo_cell(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geo_cell'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f'Name: {self.name}, Is_infected: {self.is_infected}'
@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.db.transaction import on_commit
+
+PROFILE_CACHE_KEY = 'profile'
+PROFILE_VERSION_KEY = 'profile_version'
+
+
+def profile_version_key(survivor_id: int) -> str:
+    return f'{PROFILE_VERSION_KEY}_{survivor_id}'
+
+
+def profile_body_key(survivor_id: int) -> str:
+    return f'{PROFILE_CACHE_KEY}_{survivor_id}'
+
+
+def invalidate_profiles(survivor_ids) -> None:
+    """
+    Drops the cached profiles of these survivors once the current
+    transaction commits. Their next read gets a new version, so clients
+    holding an old ETag receive the fresh profile.
+    """
+    keys = [profile_version_key(survivor_id) for survivor_id in survivor_ids]
+    if keys:
+        on_commit(lambda: cache.delete_many(keys))
+
+
+async def ainvalidate_profiles(survivor_ids) -> None:
+    """
+    Async version of `invalidate_profiles` for writes made outside a
+    transaction.
+    """
+    keys = [profile_version_key(survivor_id) for survivor_id in survivor_ids]
+    if keys:
+        await cache.adelete_many(keys)
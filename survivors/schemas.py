@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class InventoryEntry:
+    item: str
+    quantity: int
+
+
+@dataclass(slots=True)
+class RegisterSurvivorRequest:
+    name: str
+    age: int
+    gender: str
+    latitude: float
+    longitude: float
+    inventory: list[InventoryEntry] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LocationUpdateRequest:
+    latitude: float
+    longitude: float
+
+
+@dataclass(slots=True)
+class LocationPing:
+    survivor_id: int
+    latitude: float
+    longitude: float
+
+
+@dataclass(slots=True)
+class LocationBatchRequest:
+    pings: list[LocationPing]
+
+
+@dataclass(slots=True)
+class InfectionReportRequest:
+    reporter_id: int
+    infected_id: int
+
+
+@dataclass(slots=True)
+class InfectionReportBatchRequest:
+    # Entries are converted one by one, so an invalid entry is reported
+    # in its result instead of failing the whole batch.
+    reports: list[Any]
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from survivors.infection_index import infection_index
+from survivors.models import Survivor
+from survivors.profile_cache import invalidate_profiles
+
+
+@receiver(post_save, sender=Survivor)
+def index_infected_survivor(sender, instance: Survivor, **kwargs) -> None:
+    if instance.is_infected:
+        transaction.on_commit(lambda: infection_index.mark_infected([instance.pk]))
+
+
+@receiver(post_save, sender=Survivor)
+def invalidate_survivor_profile(sender, instance: Survivor, **kwargs) -> None:
+    invalidate_profiles([instance.pk])
@@ -1 +0,0 @@
-# TODO: Add tests for survivors endpoint
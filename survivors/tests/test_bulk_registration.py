@@ -0,0 +1,130 @@
+import io
+import json
+
+from django.core.management import call_command
+from django.urls import reverse
+import pytest
+from resources.models import InventoryItem
+from survivors.interface.service.registration_service import iter_json_records
+from survivors.models import Survivor
+
+
+def _record(name, **kwargs):
+    record = {
+        "name": name,
+        "age": 30,
+        "gender": "F",
+        "latitude": 1.5,
+        "longitude": -2.25,
+        "inventory": [{"item": "Water", "quantity": 2}, {"item": "Food", "quantity": 1}],
+    }
+    record.update(kwargs)
+    return record
+
+
+class TestIterJsonRecords:
+
+    @pytest.mark.parametrize("read_size", [1, 3, 64 * 1024])
+    def test_streams_json_array(self, read_size):
+        records = [_record(f"S{i}", latitude=i + 0.125) for i in range(5)]
+        stream = io.BytesIO(json.dumps(records).encode())
+        assert list(iter_json_records(stream, read_size)) == records
+
+    @pytest.mark.parametrize("read_size", [1, 7])
+    def test_streams_json_lines(self, read_size):
+        records = [_record("Zoë"), _record("Ana", age=41)]
+        payload = "\n".join(json.dumps(r, ensure_ascii=False) for r in records)
+        stream = io.BytesIO(payload.encode())
+        assert list(iter_json_records(stream, read_size)) == records
+
+    def test_truncated_input_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.BytesIO(b'[{"name": "A"}, {"na')))
+
+    @pytest.mark.parametrize("head, tail", [
+        (b'{"a": tru', b'e}'),
+        (b'{"a": -Infin', b'ity}'),
+        (b'{"a": "x\\u00', b'e9"}'),
+        (b'{"a": "long', b' text"}'),
+    ])
+    def test_values_cut_by_a_read_are_completed(self, head, tail):
+        payload = b'{"a": 1}\n' + head
+        records = iter_json_records(io.BytesIO(payload + tail), read_size=len(payload))
+        assert len(list(records)) == 2
+
+    def test_malformed_record_fails_without_reading_on(self):
+        stream = io.BytesIO(b'[{"name": "A"}, {"name" "B"}, ' + b' ' * 10 ** 6 + b'{"name": "C"}]')
+        records = iter_json_records(stream, read_size=64)
+        assert next(records) == {"name": "A"}
+        with pytest.raises(ValueError):
+            next(records)
+        assert stream.tell() < 1024
+
+    def test_oversized_record_raises(self):
+        stream = io.BytesIO(json.dumps([{"name": "x" * 1000}]).encode())
+        with pytest.raises(ValueError, match="Record too large"):
+            list(iter_json_records(stream, read_size=64, max_record_size=256))
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+
+    @pytest.fixture(autouse=True)
+    def batch_on_default(self, settings):
+        # On Postgres the batch pool is another connection, which cannot
+        # see the rows of this test's transaction.
+        settings.BATCH_DATABASE = "default"
+
+    def test_endpoint_registers_valid_records(self, client):
+        records = [_record("Alice"), _record("Bob", gender="X"), _record("Carol"),
+                   _record("D" * 101)]
+        response = client.post(
+            reverse("register-survivors-bulk"),
+            data="\n".join(json.dumps(r) for r in records),
+            content_type="application/x-ndjson",
+        )
+
+        assert response.status_code == 201
+        stats = response.json()
+        assert stats["created"] == 2
+        assert stats["failed"] == 2
+        assert stats["errors"] == [
+            {"index": 1, "error": "Invalid gender"},
+            {"index": 3, "error": "Name must be a string of 1 to 100 characters"},
+        ]
+        assert Survivor.objects.count() == 2
+        assert InventoryItem.objects.filter(survivor__name="Carol").count() == 2
+
+    def test_duplicate_item_rejects_only_its_record(self, client):
+        duplicate = [{"item": "Water", "quantity": 1}, {"item": "Water", "quantity": 2}]
+        records = [_record("Alice"), _record("Bob", inventory=duplicate)]
+        response = client.post(reverse("register-survivors-bulk"), data=records,
+                               content_type="application/json")
+
+        assert response.status_code == 201
+        assert response.json()["errors"] == [{"index": 1, "error": "Duplicate item in inventory"}]
+        assert list(Survivor.objects.values_list("name", flat=True)) == ["Alice"]
+
+    def test_records_are_checked_like_single_registrations(self, client):
+        records = [_record("Alice", age="30"), _record("Bob", latitude="north"), "Carol",
+                   _record("Dave", inventory=[{"item": "Water"}])]
+        response = client.post(reverse("register-survivors-bulk"), data=records,
+                               content_type="application/json")
+
+        assert response.status_code == 201
+        assert response.json()["errors"] == [
+            {"index": 1, "error": "'latitude' must be a number"},
+            {"index": 2, "error": "body must be an object"},
+            {"index": 3, "error": "Missing field: 'inventory[0].quantity'"},
+        ]
+        assert Survivor.objects.get().age == 30
+
+    def test_command_inserts_in_chunks(self, tmp_path):
+        path = tmp_path / "camp.json"
+        path.write_text(json.dumps([_record(f"S{i}") for i in range(10)]))
+        out = io.StringIO()
+        call_command("register_survivors", str(path), chunk_size=4, stdout=out)
+
+        assert "Registered 10 survivors" in out.getvalue()
+        assert Survivor.objects.count() == 10
+        assert InventoryItem.objects.count() == 20
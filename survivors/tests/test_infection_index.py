@@ -0,0 +1,38 @@
+import pytest
+from survivors.infection_index import InfectionBitmap, InfectionIndex, infection_index
+
+
+class TestInfectionBitmap:
+
+    def test_add_and_contains(self):
+        bitmap = InfectionBitmap()
+        bitmap.add(3)
+        bitmap.add(1024)
+        assert 3 in bitmap
+        assert 1024 in bitmap
+        assert 4 not in bitmap
+        assert 10 ** 6 not in bitmap
+        assert len(bitmap) == 2
+
+
+@pytest.mark.django_db
+class TestInfectionIndex:
+
+    def test_saving_infected_survivor_marks_index_on_commit(
+            self, create_survivor, django_capture_on_commit_callbacks):
+        survivor = create_survivor(name="Zed")
+        assert not infection_index.is_infected(survivor.pk)
+        survivor.is_infected = True
+        with django_capture_on_commit_callbacks(execute=True):
+            survivor.save()
+            assert survivor.pk not in infection_index.bitmap
+        assert survivor.pk in infection_index.bitmap
+
+    def test_other_workers_see_shared_flags_with_one_query(self, django_assert_num_queries):
+        infection_index.mark_infected([7, 9])
+        worker = InfectionIndex()
+        with django_assert_num_queries(1):
+            assert sorted(worker.infected([7, 8, 9])) == [7, 9]
+        # Known infections are answered from the local bitmap.
+        with django_assert_num_queries(0):
+            assert worker.infected([7, 9]) == [7, 9]
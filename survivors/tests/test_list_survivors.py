@@ -0,0 +1,85 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.urls import reverse
+import pytest
+from resources.interface.service.item_catalog import item_catalog
+from resources.models import Item
+from survivors.interface.crud.read_survivors import survivors_after
+
+
+@pytest.mark.django_db
+class TestListSurvivors:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item):
+        self.survivors = [
+            create_survivor(name=f"Survivor {i}", gender="F" if i % 2 else "M",
+                            is_infected=i % 3 == 0)
+            for i in range(7)
+        ]
+        water = Item.objects.get(name="Water")
+        food = Item.objects.get(name="Food")
+        for survivor in self.survivors:
+            create_inventory_item(survivor=survivor, item=water, quantity=2)
+            create_inventory_item(survivor=survivor, item=food, quantity=1)
+        item_catalog.load()
+
+    def _get(self, client, **params):
+        response = client.get(reverse("list-survivors"), params)
+        assert response.status_code == 200
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_cursor_walks_all_survivors_once(self, client):
+        seen = []
+        cursor = 0
+        while cursor is not None:
+            page = self._get(client, after=cursor, limit=3)
+            seen += [survivor["id"] for survivor in page["results"]]
+            cursor = page["next_cursor"]
+        assert seen == [survivor.id for survivor in self.survivors]
+
+    def test_filters(self, client):
+        page = self._get(client, is_infected="false", gender="F")
+        expected = [s.id for s in self.survivors if not s.is_infected and s.gender == "F"]
+        assert [survivor["id"] for survivor in page["results"]] == expected
+        assert page["next_cursor"] is None
+
+    def test_inventory_is_prefetched_per_page(self, client, django_assert_num_queries):
+        # One query for the page and one for all of its inventory rows.
+        with django_assert_num_queries(2):
+            page = self._get(client, inventory="true", limit=5)
+        assert len(page["results"]) == 5
+        assert page["results"][0]["inventory"] == [
+            {"item": "Water", "quantity": 2}, {"item": "Food", "quantity": 1},
+        ]
+
+    def test_page_is_streamed_asynchronously_under_asgi(self):
+        async def fetch():
+            response = await AsyncClient().get(reverse("list-survivors"),
+                                               {"inventory": "true", "limit": 5})
+            assert response.is_async
+            return b"".join([chunk async for chunk in response.streaming_content])
+        page = json.loads(async_to_sync(fetch)())
+        assert [survivor["id"] for survivor in page["results"]] == [s.id for s in self.survivors[:5]]
+        assert page["results"][0]["inventory"] == [
+            {"item": "Water", "quantity": 2}, {"item": "Food", "quantity": 1},
+        ]
+
+    @pytest.mark.skipif(connection.vendor != "sqlite", reason="planner output is backend specific")
+    @pytest.mark.parametrize("filters, index", [
+        ({"is_infected": True}, "survivor_infected_id_idx"),
+        ({"gender": "F"}, "survivor_gender_id_idx"),
+        ({"is_infected": False, "gender": "F"}, "survivor_inf_gender_id_idx"),
+    ])
+    def test_filtered_pages_seek_a_composite_index(self, filters, index):
+        plan = survivors_after(0, **filters)[:10].explain()
+        assert f"USING INDEX {index}" in plan
+
+    @pytest.mark.parametrize("params", [{"limit": 0}, {"after": "x"}, {"gender": "Z"},
+                                        {"is_infected": "maybe"}])
+    def test_invalid_parameters(self, client, params):
+        response = client.get(reverse("list-survivors"), params)
+        assert response.status_code == 400
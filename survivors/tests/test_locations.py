@@ -0,0 +1,95 @@
+from django.urls import reverse
+import pytest
+from survivors.geo import geo_cell
+from survivors.interface import move_survivor
+from survivors.interface.service import location_service
+from survivors.interface.service.location_service import LocationCoalescer, location_coalescer
+from survivors.models import Survivor
+
+
+@pytest.mark.django_db
+class TestLocationUpdates:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor):
+        self.alice = create_survivor(name="Alice")
+        self.bob = create_survivor(name="Bob")
+
+    def test_single_ping_skips_read(self, client, django_assert_num_queries):
+        # One UPDATE plus dropping the cached profile, no SELECT.
+        with django_assert_num_queries(2):
+            response = client.patch(
+                reverse("update-location", args=[self.alice.id]),
+                data={"latitude": 12.5, "longitude": 7.25},
+                content_type="application/json",
+            )
+        assert response.status_code == 200
+        alice = Survivor.objects.get(pk=self.alice.pk)
+        assert (alice.latitude, alice.longitude) == (12.5, 7.25)
+        assert alice.name == "Alice"
+
+    def test_single_ping_unknown_survivor_returns_404(self, client):
+        response = client.patch(
+            reverse("update-location", args=[999]),
+            data={"latitude": 1, "longitude": 1},
+            content_type="application/json",
+        )
+        assert response.status_code == 404
+
+    def test_out_of_range_coordinates_are_rejected(self, client):
+        response = client.patch(
+            reverse("update-location", args=[self.alice.id]),
+            data={"latitude": 500, "longitude": 1000},
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": "Latitude or longitude out of range"}
+        response = client.post(
+            reverse("update-locations"),
+            data={"pings": [{"survivor_id": self.alice.id, "latitude": 1, "longitude": 1},
+                            {"survivor_id": self.bob.id, "latitude": -91, "longitude": 1}]},
+            content_type="application/json",
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": "pings[1]: Latitude or longitude out of range"}
+        with pytest.raises(ValueError):
+            move_survivor(self.alice.id, 0, 181)
+        assert Survivor.objects.get(pk=self.alice.pk).geo_cell == self.alice.geo_cell
+
+    def test_failed_flush_is_requeued(self, monkeypatch):
+        move_survivors = location_service.move_survivors
+
+        def unavailable(locations):
+            raise ConnectionError("database unavailable")
+
+        coalescer = LocationCoalescer(flush_interval=0)
+        monkeypatch.setattr(location_service, "move_survivors", unavailable)
+        with pytest.raises(ConnectionError):
+            coalescer.add([(self.alice.id, 3.0, 4.0)])
+        monkeypatch.setattr(location_service, "move_survivors", move_survivors)
+        assert coalescer.flush() == 1
+        assert Survivor.objects.get(pk=self.alice.pk).latitude == 3.0
+
+    def test_coalescer_keeps_latest_position_and_flushes_once(self, django_assert_num_queries):
+        coalescer = LocationCoalescer(flush_interval=60)
+        coalescer.add([(self.alice.id, 1.0, 1.0), (self.bob.id, 2.0, 2.0)])
+        coalescer.add([(self.alice.id, 3.0, 4.0)])
+        with django_assert_num_queries(1):
+            assert coalescer.flush() == 2
+        alice = Survivor.objects.get(pk=self.alice.pk)
+        assert (alice.latitude, alice.longitude, alice.geo_cell) == (3.0, 4.0, geo_cell(3.0, 4.0))
+        assert Survivor.objects.get(pk=self.bob.pk).latitude == 2.0
+
+    def test_batch_endpoint_accepts_pings(self, client, monkeypatch):
+        monkeypatch.setattr(location_coalescer, "flush_interval", 0)
+        response = client.post(
+            reverse("update-locations"),
+            data={"pings": [
+                {"survivor_id": self.alice.id, "latitude": 5.0, "longitude": 6.0},
+                {"survivor_id": self.alice.id, "latitude": 7.0, "longitude": 8.0},
+            ]},
+            content_type="application/json",
+        )
+        assert response.status_code == 202
+        assert response.json()["accepted"] == 2
+        assert Survivor.objects.get(pk=self.alice.pk).latitude == 7.0
@@ -0,0 +1,61 @@
+from django.urls import reverse
+import numpy as np
+import pytest
+from survivors.geo import (
+    COORDINATES_OUT_OF_RANGE,
+    bounding_box,
+    cell_ranges,
+    geo_cell,
+    haversine_km,
+)
+from survivors.models import Survivor
+
+
+class TestGeo:
+
+    def test_haversine_matches_known_distance(self):
+        # Berlin -> Paris is roughly 878 km.
+        distance = haversine_km(52.52, 13.405, np.array([48.8566]), np.array([2.3522]))
+        assert distance[0] == pytest.approx(878, abs=2)
+
+    @pytest.mark.parametrize("latitude,longitude", [(52.5, 13.4), (-33.9, 179.99), (0.0, -180.0)])
+    def test_cell_ranges_cover_nearby_points(self, latitude, longitude):
+        latitude_range, longitude_ranges = bounding_box(latitude, longitude, 20)
+        ranges = cell_ranges(latitude_range, longitude_ranges)
+        for d_lat, d_lon in [(0.1, 0.1), (-0.1, -0.1), (0.15, -0.15)]:
+            lon = (longitude + d_lon + 180) % 360 - 180
+            cell = geo_cell(latitude + d_lat, lon)
+            assert any(low <= cell <= high for low, high in ranges)
+
+
+@pytest.mark.django_db
+class TestNearbySurvivors:
+
+    def test_returns_survivors_within_radius_closest_first(self, client, create_survivor):
+        create_survivor(name="Far", latitude=48.8566, longitude=2.3522)
+        create_survivor(name="Near", latitude=52.53, longitude=13.41)
+        create_survivor(name="Here", latitude=52.52, longitude=13.405)
+
+        response = client.get(reverse("nearby-survivors"),
+                              {"lat": 52.52, "lon": 13.405, "radius": 50})
+
+        assert response.status_code == 200
+        assert [s["name"] for s in response.json()["results"]] == ["Here", "Near"]
+
+    def test_location_update_moves_survivor_to_new_cell(self, client, create_survivor):
+        survivor = create_survivor(name="Walker", latitude=10.0, longitude=10.0)
+        client.patch(
+            reverse("update-location", args=[survivor.id]),
+            data={"latitude": -20.0, "longitude": 30.0},
+            content_type="application/json",
+        )
+        assert Survivor.objects.get(pk=survivor.pk).geo_cell == geo_cell(-20.0, 30.0)
+
+    def test_missing_parameter_returns_400(self, client):
+        response = client.get(reverse("nearby-survivors"), {"lat": 1, "lon": 1})
+        assert response.status_code == 400
+
+    def test_out_of_range_coordinates_return_400(self, client):
+        response = client.get(reverse("nearby-survivors"), {"lat": 91, "lon": 1, "radius": 5})
+        assert response.status_code == 400
+        assert response.json() == {"error": COORDINATES_OUT_OF_RANGE}
@@ -0,0 +1,97 @@
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+from resources.models import Item
+from survivors.models import Survivor
+
+
+@pytest.mark.django_db
+class TestRegisterAndProfile:
+
+    payload = {
+        "name": "Alice",
+        "age": 30,
+        "gender": "F",
+        "latitude": 52.52,
+        "longitude": 13.405,
+        "inventory": [{"item": "Water", "quantity": 2}, {"item": "Food", "quantity": 5}],
+    }
+
+    def test_register_then_profile(self, client):
+        response = client.post(reverse("register-survivor"), data=self.payload,
+                               content_type="application/json")
+        assert response.status_code == 201
+        survivor_id = response.json()["id"]
+
+        response = client.get(reverse("profile", args=[survivor_id]))
+        assert response.status_code == 200
+        profile = response.json()
+        assert profile["name"] == "Alice"
+        assert sorted(profile["inventory"], key=lambda i: i["item"]) == [
+            {"item": "Food", "quantity": 5},
+            {"item": "Water", "quantity": 2},
+        ]
+
+    def test_invalid_item_does_not_create_survivor(self, client):
+        payload = dict(self.payload, inventory=[{"item": "Gold", "quantity": 1}])
+        response = client.post(reverse("register-survivor"), data=payload,
+                               content_type="application/json")
+        assert response.status_code == 400
+        assert not Survivor.objects.exists()
+
+    def test_out_of_range_position_is_rejected(self, client):
+        payload = dict(self.payload, latitude=91)
+        response = client.post(reverse("register-survivor"), data=payload,
+                               content_type="application/json")
+        assert response.status_code == 400
+        assert not Survivor.objects.exists()
+
+    def test_views_run_natively_under_asgi(self):
+        async def register():
+            return await AsyncClient().post(reverse("register-survivor"), data=self.payload,
+                                            content_type="application/json")
+        assert async_to_sync(register)().status_code == 201
+
+    def test_profile_not_found(self, client):
+        assert client.get(reverse("profile", args=[999])).status_code == 404
+
+
+@pytest.mark.django_db
+class TestProfileCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor, create_inventory_item, django_capture_on_commit_callbacks):
+        self.alice = create_survivor(name="Alice")
+        create_inventory_item(survivor=self.alice, item=Item.objects.get(name="Water"), quantity=3)
+        self.capture = django_capture_on_commit_callbacks
+
+    def _get(self, client, **headers):
+        return client.get(reverse("profile", args=[self.alice.id]), headers=headers)
+
+    def test_etag_revalidation_only_reads_cache(self, client):
+        etag = self._get(client)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(client, if_none_match=etag)
+        assert response.status_code == 304
+        assert all("zombie_cache_table" in q["sql"] for q in queries.captured_queries)
+
+    def test_miss_builds_profile_in_one_query(self, client):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get(client)
+        assert response.json()["inventory"] == [{"item": "Water", "quantity": 3}]
+        assert len([q for q in queries.captured_queries
+                    if "survivors_survivor" in q["sql"]]) == 1
+
+    def test_location_update_invalidates_profile(self, client):
+        etag = self._get(client)["ETag"]
+        with self.capture(execute=True):
+            client.patch(reverse("update-location", args=[self.alice.id]),
+                         data={"latitude": 9.0, "longitude": 9.0},
+                         content_type="application/json")
+        response = self._get(client, if_none_match=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.json()["latitude"] == 9.0
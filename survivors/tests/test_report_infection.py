@@ -0,0 +1,96 @@
+from django.urls import reverse
+import pytest
+from survivors.infection_index import infection_index
+from survivors.models import InfectionReport, Survivor
+
+
+@pytest.mark.django_db
+class TestReportInfection:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, create_survivor):
+        self.reporters = [create_survivor(name=f"Reporter {i}") for i in range(3)]
+        self.suspect = create_survivor(name="Suspect")
+
+    def _report(self, client, reporter, reported):
+        return client.post(
+            reverse("report-infection"),
+            data={"reporter_id": reporter.id, "infected_id": reported.id},
+            content_type="application/json",
+        )
+
+    def test_third_report_infects_survivor(self, client, django_capture_on_commit_callbacks):
+        for reporter in self.reporters[:2]:
+            assert self._report(client, reporter, self.suspect).status_code == 201
+        self.suspect.refresh_from_db()
+        assert self.suspect.report_count == 2
+        assert not self.suspect.is_infected
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self._report(client, self.reporters[2], self.suspect)
+        assert response.status_code == 201
+        self.suspect.refresh_from_db()
+        assert self.suspect.report_count == 3
+        assert self.suspect.is_infected
+        assert infection_index.is_infected(self.suspect.pk)
+
+    def test_duplicate_report_is_not_counted(self, client):
+        self._report(client, self.reporters[0], self.suspect)
+        response = self._report(client, self.reporters[0], self.suspect)
+        assert response.json()["message"] == "You have already reported this survivor"
+        assert Survivor.objects.get(pk=self.suspect.pk).report_count == 1
+        assert InfectionReport.objects.count() == 1
+
+    def test_infected_reporter_is_rejected(self, client):
+        Survivor.objects.filter(pk=self.reporters[0].pk).update(is_infected=True)
+        response = self._report(client, self.reporters[0], self.suspect)
+        assert response.status_code == 403
+
+    def test_unknown_survivor_returns_404(self, client):
+        response = client.post(
+            reverse("report-infection"),
+            data={"reporter_id": self.reporters[0].id, "infected_id": 999},
+            content_type="application/json",
+        )
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestReportInfectionBatch:
+
+    def test_batch_reports_statuses_and_infection(
+            self, client, create_survivor, django_capture_on_commit_callbacks):
+        reporters = [create_survivor(name=f"Reporter {i}") for i in range(3)]
+        suspect = create_survivor(name="Suspect")
+        zombie = create_survivor(name="Zombie", is_infected=True)
+        InfectionReport.objects.create(reporter=reporters[0], reported=suspect)
+        Survivor.objects.filter(pk=suspect.pk).update(report_count=1)
+
+        pairs = [
+            (reporters[0].id, suspect.id),
+            (reporters[1].id, suspect.id),
+            (reporters[2].id, suspect.id),
+            (reporters[2].id, suspect.id),
+            (reporters[1].id, reporters[1].id),
+            (zombie.id, suspect.id),
+            (reporters[1].id, 999),
+        ]
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                reverse("report-infection-batch"),
+                data={"reports": [
+                    {"reporter_id": reporter_id, "infected_id": infected_id}
+                    for reporter_id, infected_id in pairs
+                ]},
+                content_type="application/json",
+            )
+
+        assert response.status_code == 200
+        assert [r["status"] for r in response.json()["results"]] == [
+            "duplicate", "submitted", "submitted", "duplicate",
+            "self_report", "reporter_infected", "not_found",
+        ]
+        suspect.refresh_from_db()
+        assert suspect.report_count == 3
+        assert suspect.is_infected
+        assert infection_index.is_infected(suspect.pk)
@@ -1,9 +1,24 @@
 from django.urls import path
-from .views import report_infection, register_survivor, update_location, profile
+from .views import (
+    list_survivors,
+    nearby,
+    profile,
+    register_survivor,
+    register_survivors_bulk,
+    report_infection,
+    report_infection_batch,
+    update_location,
+    update_locations,
+)
 
 urlpatterns = [
+    path('', list_survivors, name='list-survivors'),
     path('register/', register_survivor, name='register-survivor'),
+    path('register/bulk/', register_survivors_bulk, name='register-survivors-bulk'),
     path('<int:survivor_id>/location/', update_location, name='update-location'),
+    path('locations/', update_locations, name='update-locations'),
     path('report/', report_infection, name='report-infection'),
+    path('report/batch/', report_infection_batch, name='report-infection-batch'),
     path('<int:survivor_id>/profile/', profile, name='profile'),
+    path('nearby/', nearby, name='nearby-survivors'),
 ]
@@ -1,15 +1,47 @@
-import json
+from json import JSONDecodeError
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpRequest, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
 from django.views.decorators.http import require_POST, require_http_methods
 
-from survivors.models import InfectionReport, Survivor
+from django_server.db_router import replica_view
+from django_server.serialization import SchemaError, convert, decode, json_response
+from survivors.geo import COORDINATES_OUT_OF_RANGE, coordinates_in_range
+from survivors.interface import (
+    amove_survivor,
+    create_survivors,
+    record_infection_report,
+    record_infection_reports,
+)
+from survivors.interface.service.listing_service import (
+    LISTING_DEFAULT_LIMIT,
+    LISTING_MAX_LIMIT,
+    aiter_page_json,
+    iter_page_json,
+    survivor_page,
+)
+from survivors.interface.service.location_service import location_coalescer
+from survivors.interface.service.nearby_service import NEARBY_DEFAULT_LIMIT, nearby_survivors
+from survivors.interface.service.profile_service import aprofile
+from survivors.interface.service.registration_service import BulkRegistrationService
+from survivors.models import Survivor
+from survivors.schemas import (
+    InfectionReportBatchRequest,
+    InfectionReportRequest,
+    LocationBatchRequest,
+    LocationUpdateRequest,
+    RegisterSurvivorRequest,
+)
 from resources.models import InventoryItem, Item
+from resources.interface.service.item_catalog import item_catalog
 
-# TODO: Validate request data. If using fastapi, this can be done with
-#  Pydantic models. I am skipping this for now but it is important to
-#  validate the data before using it.
-#  I would also move all the db queries to a crud interface like its done for
+# TODO: I would also move all the db queries to a crud interface like its done for
 #  the trade_items view. This is a good practice to separate the business logic
 #  from the database logic. I am skipping this for now but it is important to
 #  separate the concerns. This applies to all the views.
@@ -17,121 +49,295 @@ from resources.models import InventoryItem, Item
 
 @csrf_exempt
 @require_POST
-def register_survivor(request: HttpRequest) -> JsonResponse:
-    try:
-        data = json.loads(request.body)
-        survivor = Survivor.objects.create(
-            name=data['name'],
-            age=data['age'],
-            gender=data['gender'],
-            latitude=data['latitude'],
-            longitude=data['longitude']
-        )
-        inventory = data.get('inventory', [])
+async def register_survivor(request: HttpRequest) -> HttpResponse:
+    try:
+        data = decode(request.body, RegisterSurvivorRequest)
+    except SchemaError as e:
+        return json_response({'error': str(e)}, status=400)
+    except ValueError as e:
+        return json_response({'error': f'Invalid JSON: {str(e)}'}, status=400)
+    if not coordinates_in_range(data.latitude, data.longitude):
+        return json_response({'error': COORDINATES_OUT_OF_RANGE}, status=400)
+
+    try:
         inventory_items = []
-        for entry in inventory:
-            item = Item.objects.get(name=entry['item'])
+        for entry in data.inventory:
+            item = await item_catalog.aget(entry.item)
             inventory_items.append(InventoryItem(
-                survivor=survivor,
                 item=item,
-                quantity=entry['quantity']
+                quantity=entry.quantity
             ))
-        InventoryItem.objects.bulk_create(inventory_items)
-        return JsonResponse({'message': 'Survivor registered', 'id': survivor.pk}, status=201)
-    except KeyError as e:
-        return JsonResponse({'error': f'Missing field: {str(e)}'}, status=400)
+        survivor = Survivor(
+            name=data.name,
+            age=data.age,
+            gender=data.gender,
+            latitude=data.latitude,
+            longitude=data.longitude
+        )
+        # Inserts the survivor, the inventory and the statistics update in
+        # one transaction, which needs a sync thread.
+        [survivor] = await sync_to_async(create_survivors)([survivor], [inventory_items])
+        return json_response({'message': 'Survivor registered', 'id': survivor.pk}, status=201)
     except Item.DoesNotExist:
-        return JsonResponse({'error': 'Invalid item in inventory'}, status=400)
+        return json_response({'error': 'Invalid item in inventory'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return json_response({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_POST
+def register_survivors_bulk(request: HttpRequest) -> HttpResponse:
+    """
+    Registers survivors from a JSON array or JSON lines body. The body is
+    read as a stream so large camps do not have to fit in memory.
+    """
+    try:
+        stats = BulkRegistrationService(request).run()
+    except (JSONDecodeError, UnicodeDecodeError) as e:
+        return json_response({'error': f'Invalid JSON: {str(e)}'}, status=400)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+    return json_response(stats, status=201)
 
 
 @csrf_exempt
 @require_http_methods(['PATCH'])
-def update_location(request: HttpRequest, survivor_id: int) -> JsonResponse:
-    try:
-        data = json.loads(request.body)
-        survivor = Survivor.objects.get(id=survivor_id)
-        survivor.latitude = data['latitude']
-        survivor.longitude = data['longitude']
-        survivor.save()
-        return JsonResponse({'message': 'Location updated'}, status=200)
+async def update_location(request: HttpRequest, survivor_id: int) -> HttpResponse:
+    try:
+        data = decode(request.body, LocationUpdateRequest)
+    except SchemaError as e:
+        return json_response({'error': str(e)}, status=400)
+    except ValueError as e:
+        return json_response({'error': f'Invalid JSON: {str(e)}'}, status=400)
+    if not coordinates_in_range(data.latitude, data.longitude):
+        return json_response({'error': COORDINATES_OUT_OF_RANGE}, status=400)
+
+    try:
+        if not await amove_survivor(survivor_id, data.latitude, data.longitude):
+            raise Survivor.DoesNotExist
+        return json_response({'message': 'Location updated'}, status=200)
     except Survivor.DoesNotExist:
-        return JsonResponse({'error': 'Survivor not found'}, status=404)
-    except KeyError as e:
-        return JsonResponse({'error': f'Missing field: {str(e)}'}, status=400)
+        return json_response({'error': 'Survivor not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return json_response({'error': str(e)}, status=500)
 
 
 @csrf_exempt
 @require_POST
-def report_infection(request: HttpRequest) -> JsonResponse:
+def update_locations(request: HttpRequest) -> HttpResponse:
+    """
+    Accepts a batch of location pings. Pings are coalesced per survivor
+    and written asynchronously, so unknown survivor ids are not reported.
+    """
     try:
-        data = json.loads(request.body)
-        reporter_id = data.get("reporter_id")
-        infected_id = data.get("infected_id")
+        data = decode(request.body, LocationBatchRequest)
+    except SchemaError as e:
+        return json_response({'error': str(e)}, status=400)
+    except ValueError as e:
+        return json_response({'error': f'Invalid JSON: {str(e)}'}, status=400)
+    for index, ping in enumerate(data.pings):
+        if not coordinates_in_range(ping.latitude, ping.longitude):
+            return json_response({'error': f'pings[{index}]: {COORDINATES_OUT_OF_RANGE}'}, status=400)
 
-        if not reporter_id:
-            return JsonResponse({"error": "Missing 'reporter_id'"}, status=400)
+    try:
+        pings = [(ping.survivor_id, ping.latitude, ping.longitude) for ping in data.pings]
+        location_coalescer.add(pings)
+        return json_response({'message': 'Locations accepted', 'accepted': len(pings)}, status=202)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@csrf_exempt
+@require_POST
+async def report_infection(request: HttpRequest) -> HttpResponse:
+    try:
+        data = decode(request.body, InfectionReportRequest)
+    except SchemaError as e:
+        return json_response({"error": str(e)}, status=400)
+    except ValueError as e:
+        return json_response({"error": f"Invalid JSON: {str(e)}"}, status=400)
+
+    try:
+        reporter_id = data.reporter_id
+        infected_id = data.infected_id
 
         if reporter_id == infected_id:
-            return JsonResponse({"error": "You cannot report yourself"}, status=400)
+            return json_response({"error": "You cannot report yourself"}, status=400)
 
-        reporter = Survivor.objects.get(id=reporter_id)
-        reported = Survivor.objects.get(id=infected_id)
+        survivors = await Survivor.objects.only('is_infected').ain_bulk([reporter_id, infected_id])
+        if reporter_id not in survivors or infected_id not in survivors:
+            raise Survivor.DoesNotExist
 
         # Prevent infected survivors from reporting others
-        if reporter.is_infected:
-            return JsonResponse({"error": "Infected survivors cannot report others"}, status=403)
+        if survivors[reporter_id].is_infected:
+            return json_response({"error": "Infected survivors cannot report others"}, status=403)
 
         # Create the infection report (only once per reporter → reported)
-        report, created = InfectionReport.objects.get_or_create(
-            reporter=reporter,
-            reported=reported
-        )
+        # The report runs in a transaction, which needs a sync thread.
+        if not await sync_to_async(record_infection_report)(reporter_id, infected_id):
+            return json_response({"message": "You have already reported this survivor"}, status=200)
+        return json_response({"message": "Report submitted"}, status=201)
+    except Survivor.DoesNotExist:
+        return json_response({"error": "Survivor not found"}, status=404)
+    except Exception as e:
+        return json_response({"error": str(e)}, status=500)
 
-        if not created:
-            return JsonResponse({"message": "You have already reported this survivor"}, status=200)
 
-        report_count = InfectionReport.objects.filter(reported=reported).count()
-        if report_count >= 3:
-            reported.is_infected = True
-            reported.save()
-        return JsonResponse({"message": "Report submitted"}, status=201)
-    except Survivor.DoesNotExist:
-        return JsonResponse({"error": "Survivor not found"}, status=404)
+@csrf_exempt
+@require_POST
+def report_infection_batch(request: HttpRequest) -> HttpResponse:
+    try:
+        data = decode(request.body, InfectionReportBatchRequest)
+    except SchemaError as e:
+        return json_response({"error": str(e)}, status=400)
+    except ValueError as e:
+        return json_response({"error": f"Invalid JSON: {str(e)}"}, status=400)
+
+    try:
+        # None marks an entry that is not a valid report; its result
+        # echoes whatever ids it has.
+        reports = []
+        for entry in data.reports:
+            try:
+                reports.append(convert(entry, InfectionReportRequest))
+            except SchemaError:
+                reports.append(None)
+
+        survivor_ids = {
+            survivor_id for report in reports if report is not None
+            for survivor_id in (report.reporter_id, report.infected_id)
+        }
+        survivors = Survivor.objects.only('is_infected').in_bulk(survivor_ids)
+
+        results = []
+        accepted = []
+        for entry, report in zip(data.reports, reports):
+            if report is None:
+                entry = entry if isinstance(entry, dict) else {}
+                results.append({
+                    "reporter_id": entry.get("reporter_id"),
+                    "infected_id": entry.get("infected_id"),
+                    "status": "invalid",
+                })
+                continue
+            reporter_id, infected_id = report.reporter_id, report.infected_id
+            result = {"reporter_id": reporter_id, "infected_id": infected_id}
+            results.append(result)
+            if reporter_id == infected_id:
+                result["status"] = "self_report"
+            elif reporter_id not in survivors or infected_id not in survivors:
+                result["status"] = "not_found"
+            elif survivors[reporter_id].is_infected:
+                result["status"] = "reporter_infected"
+            else:
+                accepted.append(result)
+
+        new_pairs = record_infection_reports(
+            [(result["reporter_id"], result["infected_id"]) for result in accepted]
+        )
+        for result in accepted:
+            pair = (result["reporter_id"], result["infected_id"])
+            if pair in new_pairs:
+                result["status"] = "submitted"
+                new_pairs.discard(pair)
+            else:
+                result["status"] = "duplicate"
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+        return json_response({"error": str(e)}, status=500)
+    else:
+        return json_response({"results": results}, status=200)
 
 
 @csrf_exempt
 @require_http_methods(['GET'])
-def profile(request: HttpRequest, survivor_id: int) -> JsonResponse:
-    try:
-        survivor = Survivor.objects.get(id=survivor_id)
-        inventory_items = InventoryItem.objects.filter(
-            survivor=survivor).select_related('item')
-        inventory = [
-            {
-                "item": item.item.name,
-                "quantity": item.quantity
-            }
-            for item in inventory_items
-        ]
+async def profile(request: HttpRequest, survivor_id: int) -> HttpResponse:
+    try:
+        body, etag = await aprofile(survivor_id, request.headers.get('If-None-Match'))
     except Survivor.DoesNotExist:
-        return JsonResponse({"error": "Survivor not found"}, status=404)
+        return json_response({"error": "Survivor not found"}, status=404)
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
+        return json_response({"error": str(e)}, status=500)
+
+    if body is None:
+        response = HttpResponseNotModified()
     else:
-        response = {
-            'id': survivor.pk,
-            'name': survivor.name,
-            'age': survivor.age,
-            'gender': survivor.gender,
-            'latitude': survivor.latitude,
-            'longitude': survivor.longitude,
-            'inventory': inventory,
-            'infected': survivor.is_infected,
-        }
-        return JsonResponse(response, status=200)
+        response = HttpResponse(body, content_type='application/json', status=200)
+    response['ETag'] = etag
+    # Clients must revalidate, which is cheap thanks to the ETag.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@csrf_exempt
+@require_http_methods(['GET'])
+@replica_view
+def nearby(request: HttpRequest) -> HttpResponse:
+    try:
+        latitude = float(request.GET['lat'])
+        longitude = float(request.GET['lon'])
+        radius_km = float(request.GET['radius'])
+        limit = int(request.GET.get('limit', NEARBY_DEFAULT_LIMIT))
+    except KeyError as e:
+        return json_response({"error": f"Missing parameter: {str(e)}"}, status=400)
+    except ValueError:
+        return json_response({"error": "Invalid parameter"}, status=400)
+
+    if not coordinates_in_range(latitude, longitude):
+        return json_response({"error": COORDINATES_OUT_OF_RANGE}, status=400)
+    if radius_km < 0 or limit < 1:
+        return json_response({"error": "'radius' and 'limit' must be positive"}, status=400)
+
+    try:
+        survivors = nearby_survivors(latitude, longitude, radius_km, limit)
+    except Exception as e:
+        return json_response({"error": str(e)}, status=500)
+    return json_response({"count": len(survivors), "results": survivors}, status=200)
+
+
+def _parse_flag(value: str | None) -> bool | None:
+    if value is None:
+        return None
+    if value.lower() in ('true', '1'):
+        return True
+    if value.lower() in ('false', '0'):
+        return False
+    raise ValueError(value)
+
+
+@csrf_exempt
+@require_http_methods(['GET'])
+@replica_view
+def list_survivors(request: HttpRequest) -> HttpResponse:
+    """
+    Lists survivors in id order, one page at a time. Pass the returned
+    `next_cursor` as `after` to get the next page.
+    """
+    try:
+        after_id = int(request.GET.get('after', 0))
+        limit = int(request.GET.get('limit', LISTING_DEFAULT_LIMIT))
+        is_infected = _parse_flag(request.GET.get('is_infected'))
+        with_inventory = bool(_parse_flag(request.GET.get('inventory')))
+    except ValueError:
+        return json_response({"error": "Invalid parameter"}, status=400)
+
+    gender = request.GET.get('gender')
+    if gender is not None and gender not in Survivor.GenderChoices.values:
+        return json_response({"error": "Invalid gender"}, status=400)
+    if not 1 <= limit <= LISTING_MAX_LIMIT:
+        return json_response({"error": f"'limit' must be between 1 and {LISTING_MAX_LIMIT}"}, status=400)
+
+    try:
+        # The page is read here, inside the replica block; only the
+        # encoding is streamed.
+        survivors, next_cursor = survivor_page(
+            after_id, limit, is_infected=is_infected, gender=gender,
+            with_inventory=with_inventory,
+        )
+    except Exception as e:
+        return json_response({"error": str(e)}, status=500)
+    # ASGI servers only stream async iterators; WSGI needs a sync one.
+    encode = aiter_page_json if isinstance(request, ASGIRequest) else iter_page_json
+    return StreamingHttpResponse(
+        encode(survivors, next_cursor, with_inventory=with_inventory),
+        content_type='application/json',
+    )